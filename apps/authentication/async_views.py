@@ -0,0 +1,135 @@
+from django.contrib.auth import aauthenticate, alogin, alogout
+from django.http import HttpResponse, JsonResponse
+from django.middleware.csrf import get_token
+from rest_framework import status, permissions
+from django.core.exceptions import ValidationError as DjangoValidationError
+from core.async_views import AsyncAPIView
+from core.throttling import SlidingWindowRateThrottle
+from .serializers import (
+    SignupStartSerializer, SignupVerifySerializer, SignupCompleteSerializer,
+    LoginSerializer, UserSerializer
+)
+from .services import AuthService
+from .views import (
+    complete_signup_error, invalid_credentials_error, me_data, resend_code_error, signup_started_data,
+    signup_verified_data, start_signup_error, validated_data, verify_code_error
+)
+
+class SignupResendCodeView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [SlidingWindowRateThrottle]
+    throttle_scope = "auth"
+
+    async def post(self, request):
+        try:
+            await AuthService.aresend_code(request.data.get("signupToken") or "")
+        except DjangoValidationError as e:
+            data, status_code = resend_code_error(e)
+            return JsonResponse(data, status=status_code)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+class SignupStartView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [SlidingWindowRateThrottle]
+    throttle_scope = "auth"
+
+    async def post(self, request):
+        data = validated_data(SignupStartSerializer, request.data)
+
+        try:
+            attempt = await AuthService.astart_signup(email=data["email"], password=data["password"])
+        except DjangoValidationError as e:
+            body, status_code = start_signup_error(e)
+            return JsonResponse(body, status=status_code)
+
+        return JsonResponse(signup_started_data(attempt), status=status.HTTP_201_CREATED)
+
+class SignupVerifyView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [SlidingWindowRateThrottle]
+    throttle_scope = "auth"
+
+    async def post(self, request):
+        data = validated_data(SignupVerifySerializer, request.data)
+
+        try:
+            attempt = await AuthService.averify_code(signup_token=data["signup_token"], code=data["code"])
+        except DjangoValidationError as e:
+            body, status_code = verify_code_error(e)
+            return JsonResponse(body, status=status_code)
+
+        return JsonResponse(signup_verified_data(attempt), status=status.HTTP_200_OK)
+
+class SignupCompleteView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [SlidingWindowRateThrottle]
+    throttle_scope = "auth"
+
+    async def post(self, request):
+        data = validated_data(SignupCompleteSerializer, request.data)
+
+        try:
+            user = await AuthService.acomplete_signup(
+                signup_token=data["signup_token"],
+                full_name=data["full_name"],
+                birth_date=data["birth_date"]
+            )
+        except DjangoValidationError as e:
+            body, status_code = complete_signup_error(e)
+            return JsonResponse(body, status=status_code)
+
+        await alogin(request, user)
+        return JsonResponse(UserSerializer(user).data, status=status.HTTP_201_CREATED)
+
+class LoginView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [SlidingWindowRateThrottle]
+    throttle_scope = "auth"
+
+    async def post(self, request):
+        data = validated_data(LoginSerializer, request.data)
+
+        user = await aauthenticate(request, email=data["email"], password=data["password"])
+        if not user:
+            body, status_code = invalid_credentials_error()
+            return JsonResponse(body, status=status_code)
+
+        await alogin(request, user)
+        return JsonResponse(UserSerializer(user).data, status=status.HTTP_200_OK)
+
+class MeView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    read_from_replica = True
+
+    async def get(self, request):
+        get_token(request)  # ensure_csrf_cookie
+        return JsonResponse(me_data(request.user), safe=False, status=status.HTTP_200_OK)
+
+class AccountView(AsyncAPIView):
+    async def delete(self, request):
+        await AuthService.adelete_account(request.user)
+        await alogout(request)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+class LogoutView(AsyncAPIView):
+    async def post(self, request):
+        await alogout(request)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+class ForgotPasswordView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [SlidingWindowRateThrottle]
+    throttle_scope = "auth"
+
+    async def post(self, request):
+        # Implementation omitted as per blueprint (send mock email)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+class ResetPasswordView(AsyncAPIView):
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [SlidingWindowRateThrottle]
+    throttle_scope = "auth"
+
+    async def post(self, request):
+        # Implementation omitted as per blueprint
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
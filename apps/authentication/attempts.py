@@ -0,0 +1,174 @@
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import SignupAttempt
+
+class BaseAttemptStore:
+    """
+    Storage for pending signups. Stores hand out SignupAttempt instances so the
+    service layer and views work the same regardless of the backend.
+    """
+
+    def save(self, attempt: SignupAttempt) -> SignupAttempt:
+        """Persists the attempt, replacing any pending attempt for the same email."""
+        raise NotImplementedError
+
+    def get_by_token(self, signup_token: str) -> Optional[SignupAttempt]:
+        raise NotImplementedError
+
+    def get_by_email(self, email: str) -> Optional[SignupAttempt]:
+        raise NotImplementedError
+
+    def get_for_update(self, signup_token: str) -> Optional[SignupAttempt]:
+        """Like get_by_token, but locks the attempt for the current transaction where supported."""
+        return self.get_by_token(signup_token)
+
+    def delete(self, attempt: SignupAttempt) -> bool:
+        """Removes the attempt. Returns False if it was already gone."""
+        raise NotImplementedError
+
+    def purge_expired(self, batch_size: int) -> int:
+        """Deletes up to batch_size expired attempts. Returns the number deleted."""
+        raise NotImplementedError
+
+    async def asave(self, attempt: SignupAttempt) -> SignupAttempt:
+        return await sync_to_async(self.save)(attempt)
+
+    async def aget_by_token(self, signup_token: str) -> Optional[SignupAttempt]:
+        return await sync_to_async(self.get_by_token)(signup_token)
+
+class DatabaseAttemptStore(BaseAttemptStore):
+    """Keeps attempts as SignupAttempt rows."""
+
+    UPSERT_FIELDS = ["encrypted_password", "verification_code", "signup_token", "expires_at", "created_at"]
+
+    def save(self, attempt: SignupAttempt) -> SignupAttempt:
+        # Single INSERT ... ON CONFLICT (email) DO UPDATE, so concurrent starts
+        # for the same email cannot collide on the unique index.
+        SignupAttempt.objects.bulk_create(
+            [attempt],
+            update_conflicts=True,
+            unique_fields=["email"],
+            update_fields=self.UPSERT_FIELDS,
+        )
+        return attempt
+
+    async def asave(self, attempt: SignupAttempt) -> SignupAttempt:
+        await SignupAttempt.objects.abulk_create(
+            [attempt],
+            update_conflicts=True,
+            unique_fields=["email"],
+            update_fields=self.UPSERT_FIELDS,
+        )
+        return attempt
+
+    def get_by_token(self, signup_token: str) -> Optional[SignupAttempt]:
+        return SignupAttempt.objects.filter(signup_token=signup_token).first()
+
+    async def aget_by_token(self, signup_token: str) -> Optional[SignupAttempt]:
+        return await SignupAttempt.objects.filter(signup_token=signup_token).afirst()
+
+    def get_by_email(self, email: str) -> Optional[SignupAttempt]:
+        return SignupAttempt.objects.filter(email=email).first()
+
+    def get_for_update(self, signup_token: str) -> Optional[SignupAttempt]:
+        return SignupAttempt.objects.select_for_update().filter(signup_token=signup_token).first()
+
+    def delete(self, attempt: SignupAttempt) -> bool:
+        deleted, _ = SignupAttempt.objects.filter(signup_token=attempt.signup_token).delete()
+        return deleted > 0
+
+    def purge_expired(self, batch_size: int) -> int:
+        # Each batch is its own short transaction. Rows locked by an in-flight
+        # signup request are skipped rather than waited on (PostgreSQL).
+        with transaction.atomic():
+            expired_ids = list(
+                SignupAttempt.objects
+                .filter(expires_at__lt=timezone.now())
+                .order_by("expires_at")
+                .select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not expired_ids:
+                return 0
+            deleted, _ = SignupAttempt.objects.filter(pk__in=expired_ids).delete()
+        return deleted
+
+class CacheAttemptStore(BaseAttemptStore):
+    """
+    Keeps attempts in the Django cache with native TTL expiry, so signups
+    generate no insert/delete churn on the database. Entries outlive
+    expires_at by EXPIRED_GRACE so clients still get CODE_EXPIRED rather than
+    INVALID_TOKEN right after expiry. Requires a cache shared by all workers.
+    """
+
+    EXPIRED_GRACE = timedelta(minutes=5)
+    FIELDS = ("email", "encrypted_password", "verification_code", "signup_token", "expires_at", "created_at")
+
+    @property
+    def cache(self):
+        return caches[settings.SIGNUP_ATTEMPT_CACHE]
+
+    def _token_key(self, signup_token: str) -> str:
+        return f"signup:token:{signup_token}"
+
+    def _email_key(self, email: str) -> str:
+        return f"signup:email:{email.lower()}"
+
+    def save(self, attempt: SignupAttempt) -> SignupAttempt:
+        if attempt.created_at is None:
+            attempt.created_at = timezone.now()
+        timeout = max(int((attempt.expires_at + self.EXPIRED_GRACE - timezone.now()).total_seconds()), 1)
+
+        previous_token = self.cache.get(self._email_key(attempt.email))
+        if previous_token and previous_token != attempt.signup_token:
+            self.cache.delete(self._token_key(previous_token))
+
+        self.cache.set_many({
+            self._token_key(attempt.signup_token): {field: getattr(attempt, field) for field in self.FIELDS},
+            self._email_key(attempt.email): attempt.signup_token,
+        }, timeout)
+        return attempt
+
+    def get_by_token(self, signup_token: str) -> Optional[SignupAttempt]:
+        data = self.cache.get(self._token_key(signup_token))
+        if data is None:
+            return None
+        return SignupAttempt(**data)
+
+    async def aget_by_token(self, signup_token: str) -> Optional[SignupAttempt]:
+        data = await self.cache.aget(self._token_key(signup_token))
+        if data is None:
+            return None
+        return SignupAttempt(**data)
+
+    def get_by_email(self, email: str) -> Optional[SignupAttempt]:
+        signup_token = self.cache.get(self._email_key(email))
+        if signup_token is None:
+            return None
+        return self.get_by_token(signup_token)
+
+    def delete(self, attempt: SignupAttempt) -> bool:
+        deleted = self.cache.delete(self._token_key(attempt.signup_token))
+        email_key = self._email_key(attempt.email)
+        if self.cache.get(email_key) == attempt.signup_token:
+            self.cache.delete(email_key)
+        return deleted
+
+    def purge_expired(self, batch_size: int) -> int:
+        # Cache entries expire on their own
+        return 0
+
+@lru_cache(maxsize=None)
+def _load_store(path: str) -> BaseAttemptStore:
+    return import_string(path)()
+
+def get_attempt_store() -> BaseAttemptStore:
+    """Returns the store configured by settings.SIGNUP_ATTEMPT_STORE."""
+    return _load_store(settings.SIGNUP_ATTEMPT_STORE)
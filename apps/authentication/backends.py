@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from . import hashing
+
+def user_cache_key(user_id) -> str:
+    """Cache key holding the User snapshot used by session authentication."""
+    return f"auth:user:{user_id}"
+
+def invalidate_cached_user(user_id) -> None:
+    """Drops the cached User snapshot so the next request reloads it."""
+    cache.delete(user_cache_key(user_id))
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that serves get_user() from a cached User snapshot.
+    AuthenticationMiddleware calls get_user() on every authenticated request,
+    so warm requests resolve request.user without touching the database.
+    Off when USER_CACHE_TIMEOUT is 0, the default without a shared cache.
+    """
+
+    def get_user(self, user_id):
+        if not settings.USER_CACHE_TIMEOUT:
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = self._get_primary_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+    async def aget_user(self, user_id):
+        if not settings.USER_CACHE_TIMEOUT:
+            return await super().aget_user(user_id)
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await self._aget_primary_user(user_id)
+            if user is not None:
+                await cache.aset(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+    # A snapshot misses right after a write invalidated it, which is exactly
+    # when a lagging replica is stale, so snapshots always come from the primary.
+
+    def _get_primary_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.db_manager(DEFAULT_DB_ALIAS).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def _aget_primary_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = await UserModel._default_manager.db_manager(DEFAULT_DB_ALIAS).aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway to hide whether the user exists (#20760),
+            # on the hashing pool rather than the event loop.
+            await hashing.amake_password(password)
+        else:
+            if await user.acheck_password(password) and self.user_can_authenticate(user):
+                return user
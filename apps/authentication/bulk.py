@@ -0,0 +1,229 @@
+import csv
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+import django
+from django.contrib.auth import hashers
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_date, parse_datetime
+from apps.onboarding.models import OnboardingProgress
+from .models import User
+
+FORMATS = ("csv", "jsonl")
+EXPORT_FIELDS = [
+    "email", "full_name", "birth_date", "onboarding_complete", "date_joined", "intent", "goals", "password_hash"
+]
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+# Batches retried when a concurrent signup takes one of their emails mid-import.
+CONFLICT_RETRIES = 3
+
+class RowError(ValueError):
+    pass
+
+@dataclass
+class ImportRow:
+    line: int
+    email: str
+    full_name: str
+    birth_date: Optional[date]
+    onboarding_complete: bool
+    date_joined: Optional[object]
+    intent: str
+    goals: list
+    password: Optional[str]
+    password_hash: Optional[str]
+
+def format_for(path: str, explicit: Optional[str] = None) -> str:
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "ndjson":
+        return "jsonl"
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot infer the format of {path!r}; pass --format.")
+    return extension
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, dict]]:
+    """Yields (line number, record) one at a time so input size never bounds memory."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line, text in enumerate(stream, start=1):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError:
+            record = None
+        yield line, record if isinstance(record, dict) else {"_invalid": text}
+
+def parse_record(line: int, record: dict) -> ImportRow:
+    if "_invalid" in record:
+        raise RowError("not a JSON object")
+
+    email = User.objects.normalize_email((record.get("email") or "").strip())
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise RowError(f"invalid email {email!r}")
+
+    birth_date = record.get("birth_date") or None
+    if birth_date is not None:
+        birth_date = parse_date(str(birth_date))
+        if birth_date is None:
+            raise RowError("invalid birth_date")
+
+    date_joined = record.get("date_joined") or None
+    if date_joined is not None:
+        date_joined = parse_datetime(str(date_joined))
+        if date_joined is None:
+            raise RowError("invalid date_joined")
+
+    goals = record.get("goals") or []
+    if isinstance(goals, str):
+        try:
+            goals = json.loads(goals)
+        except ValueError:
+            raise RowError("goals must be a JSON list")
+    if not isinstance(goals, list):
+        raise RowError("goals must be a JSON list")
+
+    password_hash = record.get("password_hash") or None
+    if password_hash is not None:
+        try:
+            hashers.identify_hasher(password_hash)
+        except ValueError:
+            raise RowError("password_hash is not a recognised hash")
+
+    onboarding_complete = record.get("onboarding_complete")
+    if not isinstance(onboarding_complete, bool):
+        onboarding_complete = str(onboarding_complete or "").strip().lower() in TRUE_VALUES
+
+    return ImportRow(
+        line=line,
+        email=email,
+        full_name=(record.get("full_name") or "").strip(),
+        birth_date=birth_date,
+        onboarding_complete=onboarding_complete,
+        date_joined=date_joined,
+        intent=(record.get("intent") or "").strip(),
+        goals=goals,
+        password=record.get("password") or None,
+        password_hash=password_hash
+    )
+
+def _init_worker():
+    django.setup()
+
+def hashing_executor(workers: int) -> Optional[Executor]:
+    """Process pool for hashing plain passwords; 0 workers hashes inline."""
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+def hash_passwords(passwords: List[Optional[str]], executor: Optional[Executor]) -> List[str]:
+    # One hash costs tens of milliseconds, so per-item dispatch overhead is noise.
+    if executor is None:
+        return [hashers.make_password(password) for password in passwords]
+    return list(executor.map(hashers.make_password, passwords))
+
+def import_batch(rows: List[ImportRow], executor: Optional[Executor]) -> Tuple[int, int]:
+    """Creates users and their onboarding rows. Returns (created, skipped).
+
+    Emails that already exist, or repeat earlier in the batch, are skipped so
+    re-running an import is harmless. Hashing happens before the transaction
+    opens so the write locks are held only for the inserts. An email that a
+    signup registers between the existence check and the insert rolls the
+    batch back, which is then retried without it.
+    """
+    unique = {}
+    for row in rows:
+        unique.setdefault(row.email, row)
+    total, rows = len(rows), list(unique.values())
+
+    plain = [row for row in rows if row.password_hash is None]
+    for row, encoded in zip(plain, hash_passwords([row.password for row in plain], executor)):
+        row.password_hash = encoded
+
+    for attempt in range(CONFLICT_RETRIES):
+        try:
+            created = _insert_new(rows)
+        except IntegrityError:
+            if attempt == CONFLICT_RETRIES - 1:
+                raise
+        else:
+            return created, total - created
+
+def _existing_emails(emails: List[str]) -> set:
+    return set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+
+def _insert_new(rows: List[ImportRow]) -> int:
+    with transaction.atomic():
+        existing = _existing_emails([row.email for row in rows])
+        fresh = [row for row in rows if row.email not in existing]
+        users = []
+        for row in fresh:
+            user = User(
+                email=row.email,
+                full_name=row.full_name,
+                birth_date=row.birth_date,
+                onboarding_complete=row.onboarding_complete,
+                password=row.password_hash
+            )
+            if row.date_joined is not None:
+                user.date_joined = row.date_joined
+            users.append(user)
+        User.objects.bulk_create(users)
+        OnboardingProgress.objects.bulk_create(
+            OnboardingProgress(user=user, intent=row.intent, goals=row.goals) for user, row in zip(users, fresh)
+        )
+    return len(users)
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def export_rows(chunk_size: int, include_hashes: bool) -> Iterator[dict]:
+    """Streams users in primary key order with a server-side cursor where the backend supports one."""
+    queryset = User.objects.order_by("pk").values(
+        "email", "full_name", "birth_date", "onboarding_complete", "date_joined", "password",
+        "onboarding_progress__intent", "onboarding_progress__goals"
+    )
+    for user in queryset.iterator(chunk_size=chunk_size):
+        row = {
+            "email": user["email"],
+            "full_name": user["full_name"],
+            "birth_date": user["birth_date"].isoformat() if user["birth_date"] else None,
+            "onboarding_complete": user["onboarding_complete"],
+            "date_joined": user["date_joined"].isoformat(),
+            "intent": user["onboarding_progress__intent"] or "",
+            "goals": user["onboarding_progress__goals"] or []
+        }
+        if include_hashes:
+            row["password_hash"] = user["password"]
+        yield row
+
+def write_records(stream: IO[str], fmt: str, rows: Iterable[dict], include_hashes: bool) -> int:
+    count = 0
+    if fmt == "csv":
+        fields = EXPORT_FIELDS if include_hashes else EXPORT_FIELDS[:-1]
+        writer = csv.DictWriter(stream, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "birth_date": row["birth_date"] or "", "goals": json.dumps(row["goals"])})
+            count += 1
+        return count
+    for row in rows:
+        stream.write(json.dumps(row) + "\n")
+        count += 1
+    return count
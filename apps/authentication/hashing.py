@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.exceptions import APIException
+from core import timing
+
+class HashingPoolBusy(APIException):
+    status_code = 503
+    default_detail = "Too many concurrent sign-in requests. Please retry shortly."
+    default_code = "SERVICE_BUSY"
+    wait = 1  # Surfaced as a Retry-After header by DRF's exception handler
+
+class HashingPool:
+    """
+    Runs password hashing on a dedicated, bounded thread pool.
+
+    Argon2 and PBKDF2 release the GIL while hashing, so threads give real
+    parallelism. At most max_workers + max_queue hashes may be in flight;
+    further callers fail fast with HashingPoolBusy instead of queueing.
+    A pool with max_workers=0 hashes inline on the calling thread.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        if max_workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue) if max_workers > 0 else None
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Schedules fn on the pool, raising HashingPoolBusy if no slot is free."""
+        if self._executor is None:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args):
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn: Callable, *args):
+        """Awaits fn on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+_pool: Optional[HashingPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> HashingPool:
+    """Returns the process-wide hashing pool, creating it from settings on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = settings.PASSWORD_HASHING_POOL
+                _pool = HashingPool(config["MAX_WORKERS"], config["MAX_QUEUE"])
+    return _pool
+
+@receiver(setting_changed)
+def reset_pool(*, setting, **kwargs):
+    global _pool
+    if setting == "PASSWORD_HASHING_POOL" and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+def make_password(password: Optional[str]) -> str:
+    """Hashes a password on the hashing pool."""
+    if password is None:
+        # Unusable passwords are random strings, not hashes; no need to offload
+        return hashers.make_password(None)
+    with timing.span("hash"):
+        return get_pool().run(hashers.make_password, password)
+
+def check_password(password: Optional[str], encoded: str, setter: Optional[Callable] = None) -> bool:
+    """
+    Verifies a password on the hashing pool. The setter (used to upgrade
+    outdated hashes) runs on the calling thread so it keeps its DB connection.
+    """
+    with timing.span("hash"):
+        is_correct, must_update = get_pool().run(hashers.verify_password, password, encoded)
+    if setter and is_correct and must_update:
+        setter(password)
+    return is_correct
+
+async def amake_password(password: Optional[str]) -> str:
+    """See make_password()."""
+    if password is None:
+        return hashers.make_password(None)
+    with timing.span("hash"):
+        return await get_pool().arun(hashers.make_password, password)
+
+async def acheck_password(password: Optional[str], encoded: str, setter: Optional[Callable] = None) -> bool:
+    """See check_password(). The setter is awaited."""
+    with timing.span("hash"):
+        is_correct, must_update = await get_pool().arun(hashers.verify_password, password, encoded)
+    if setter and is_correct and must_update:
+        await setter(password)
+    return is_correct
@@ -0,0 +1,35 @@
+from apps.chat.jobs import PURGE_CONVERSATION
+from apps.chat.models import Conversation
+from apps.jobs.queue import enqueue, register
+from .models import User
+
+DELETE_ACCOUNT = "auth.delete_account"
+# Seconds between checks whether an account's conversations are purged yet
+DELETE_ACCOUNT_RECHECK = 30
+# Checks before giving up (two hours). A purge job that ran out of attempts
+# would otherwise keep the account job re-queueing itself forever.
+DELETE_ACCOUNT_MAX_RECHECKS = 240
+
+class PurgeIncomplete(RuntimeError):
+    pass
+
+@register(DELETE_ACCOUNT)
+def delete_account(payloads):
+    """
+    Deletes deactivated accounts once the purge jobs queued by
+    AuthService.delete_account have removed all their conversations, so the
+    final cascade from the user row has no messages left to delete. Raises
+    PurgeIncomplete, failing the job, when the purges do not finish in time.
+    """
+    for payload in payloads:
+        remaining = Conversation.all_objects.filter(user_id=payload["user_id"]).count()
+        if not remaining:
+            User.objects.filter(pk=payload["user_id"], is_active=False).delete()
+            continue
+        rechecks = payload.get("rechecks", 0) + 1
+        if rechecks > DELETE_ACCOUNT_MAX_RECHECKS:
+            raise PurgeIncomplete(
+                f"User {payload['user_id']} still has {remaining} conversations after {DELETE_ACCOUNT_MAX_RECHECKS} "
+                f"checks; see the failed {PURGE_CONVERSATION} jobs"
+            )
+        enqueue(DELETE_ACCOUNT, {**payload, "rechecks": rechecks}, delay=DELETE_ACCOUNT_RECHECK)
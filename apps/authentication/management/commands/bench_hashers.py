@@ -0,0 +1,65 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand, CommandError
+from apps.authentication.hashers import ConfigurableArgon2PasswordHasher
+
+DEFAULT_ARGON2 = ["2,19456,1", "3,12288,1", "1,65536,1"]
+
+class Command(BaseCommand):
+    help = "Benchmarks password verification throughput (logins/sec per core) for several hasher settings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="Verifications per thread per setting.")
+        parser.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="Concurrent verifiers.")
+        parser.add_argument(
+            "--argon2", action="append", metavar="T,M,P",
+            help="Argon2 time_cost,memory_cost(KiB),parallelism. Repeatable. The configured setting is always included."
+        )
+        parser.add_argument("--pbkdf2", action="append", type=int, metavar="ITERATIONS", help="PBKDF2 iteration count. Repeatable.")
+
+    def handle(self, *args, **options):
+        cores = os.cpu_count() or 1
+        threads = options["threads"]
+        iterations = options["iterations"]
+
+        cases = [("argon2 (configured)", self._argon2(settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM))]
+        for spec in options["argon2"] or DEFAULT_ARGON2:
+            try:
+                t, m, p = (int(part) for part in spec.split(","))
+            except ValueError:
+                raise CommandError(f"Invalid --argon2 value {spec!r}; expected T,M,P")
+            cases.append((f"argon2 t={t} m={m} p={p}", self._argon2(t, m, p)))
+        for pbkdf2_iterations in options["pbkdf2"] or [PBKDF2PasswordHasher.iterations]:
+            hasher = type("BenchPBKDF2Hasher", (PBKDF2PasswordHasher,), {"iterations": pbkdf2_iterations})()
+            cases.append((f"pbkdf2 i={pbkdf2_iterations}", hasher))
+
+        self.stdout.write(f"cores={cores} threads={threads} iterations/thread={iterations}")
+        self.stdout.write(f"{'hasher':<28}{'latency ms':>12}{'logins/s':>12}{'logins/s/core':>16}")
+        for label, hasher in cases:
+            latency, throughput = self._measure(hasher, threads, iterations)
+            self.stdout.write(f"{label:<28}{latency * 1000:>12.1f}{throughput:>12.1f}{throughput / cores:>16.1f}")
+
+    def _argon2(self, time_cost, memory_cost, parallelism):
+        attrs = {"time_cost": time_cost, "memory_cost": memory_cost, "parallelism": parallelism}
+        return type("BenchArgon2Hasher", (ConfigurableArgon2PasswordHasher,), attrs)()
+
+    def _measure(self, hasher, threads, iterations):
+        encoded = hasher.encode("correct horse battery staple", hasher.salt())
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            hasher.verify("correct horse battery staple", encoded)
+        latency = (time.perf_counter() - start) / iterations
+
+        def worker(_):
+            for _ in range(iterations):
+                hasher.verify("correct horse battery staple", encoded)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(worker, range(threads)))
+        throughput = threads * iterations / (time.perf_counter() - start)
+        return latency, throughput
@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.authentication import bulk
+
+class Command(BaseCommand):
+    help = "Streams every user, with onboarding answers, to CSV or JSONL in the format import_users reads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="-", help="Output file, or - for stdout.")
+        parser.add_argument("--format", choices=bulk.FORMATS, help="Output format. Inferred from --output, JSONL for stdout.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched from the database per round trip.")
+        parser.add_argument(
+            "--include-hashes", action="store_true",
+            help="Include password hashes so the export can be imported elsewhere with working logins."
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        try:
+            fmt = options["format"] or ("jsonl" if output == "-" else bulk.format_for(output))
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        include_hashes = options["include_hashes"]
+        rows = bulk.export_rows(options["chunk_size"], include_hashes)
+        start = time.perf_counter()
+        if output == "-":
+            count = bulk.write_records(self.stdout, fmt, rows, include_hashes)
+        else:
+            with open(output, "w", newline="", encoding="utf-8") as stream:
+                count = bulk.write_records(stream, fmt, rows, include_hashes)
+        elapsed = time.perf_counter() - start
+        self.stderr.write(f"Exported {count} users in {elapsed:.1f}s.")
@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+import time
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from apps.authentication import bulk
+
+class Command(BaseCommand):
+    help = (
+        "Streams users from a CSV or JSONL file into the database in batches. Rows carry either a plain "
+        "password (hashed in a process pool) or a ready password_hash; existing emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - for stdin (requires --format).")
+        parser.add_argument("--format", choices=bulk.FORMATS, help="Input format. Inferred from the file extension by default.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows hashed and inserted per transaction.")
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Processes hashing plain passwords. 0 hashes in this process."
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File recording how many input rows are committed. An interrupted import resumes after them."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1")
+        if path == "-" and not options["format"]:
+            raise CommandError("Reading from stdin requires --format.")
+        try:
+            fmt = bulk.format_for(path, options["format"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        checkpoint = options["checkpoint"]
+        done = self._load_checkpoint(checkpoint, path)
+
+        created = skipped = invalid = 0
+        start = time.perf_counter()
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        executor = bulk.hashing_executor(options["workers"])
+        try:
+            records = islice(bulk.read_records(stream, fmt), done, None)
+            for batch in bulk.batched(records, batch_size):
+                rows = []
+                for line, record in batch:
+                    try:
+                        rows.append(bulk.parse_record(line, record))
+                    except bulk.RowError as exc:
+                        invalid += 1
+                        self.stderr.write(f"line {line}: {exc}")
+                batch_created, batch_skipped = bulk.import_batch(rows, executor)
+                created += batch_created
+                skipped += batch_skipped
+                done += len(batch)
+                self._save_checkpoint(checkpoint, path, done)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Imported {created} users ({skipped} existing or duplicate, {invalid} invalid) "
+            f"in {elapsed:.1f}s; {done} rows processed."
+        )
+
+    def _load_checkpoint(self, checkpoint, path):
+        if not checkpoint or not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint, encoding="utf-8") as handle:
+            state = json.load(handle)
+        if state.get("path") != os.path.abspath(path):
+            raise CommandError(f"Checkpoint {checkpoint} belongs to {state.get('path')}, not {path}.")
+        return state["rows"]
+
+    def _save_checkpoint(self, checkpoint, path, rows):
+        if not checkpoint:
+            return
+        # Write then rename so a crash mid-write never leaves a truncated checkpoint.
+        partial = f"{checkpoint}.tmp"
+        with open(partial, "w", encoding="utf-8") as handle:
+            json.dump({"path": os.path.abspath(path), "rows": rows}, handle)
+        os.replace(partial, checkpoint)
@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.authentication.services import AuthService
+
+class Command(BaseCommand):
+    help = "Deletes expired signup attempts in bounded batches. Use --interval to keep running as a periodic job."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows deleted per transaction.")
+        parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches.")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop a sweep after this many batches.")
+        parser.add_argument("--interval", type=float, default=None, help="Repeat the sweep every N seconds until interrupted.")
+
+    def handle(self, *args, **options):
+        while True:
+            self._sweep(options)
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def _sweep(self, options):
+        start = time.perf_counter()
+        deleted, batches = AuthService.purge_expired_attempts(
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            pause=options["pause"],
+        )
+        elapsed = time.perf_counter() - start
+        rate = deleted / elapsed if elapsed else 0.0
+        self.stdout.write(f"Deleted {deleted} expired signup attempts in {batches} batches ({elapsed:.2f}s, {rate:.0f} rows/s)")
@@ -0,0 +1,41 @@
+import time
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from apps.authentication import outbox
+
+class Command(BaseCommand):
+    help = (
+        "Drains the verification email outbox in batches over one reused mail connection "
+        "until interrupted (or until the outbox is empty with --once)."
+    )
+
+    def add_arguments(self, parser):
+        config = settings.VERIFICATION_EMAIL
+        parser.add_argument("--batch-size", type=int, default=config["BATCH_SIZE"], help="Emails claimed per batch.")
+        parser.add_argument("--poll-interval", type=float, default=config["POLL_INTERVAL"], help="Seconds to wait when the outbox is empty.")
+        parser.add_argument("--once", action="store_true", help="Exit once no email is ready instead of polling.")
+
+    def handle(self, *args, **options):
+        mail_connection = get_connection(fail_silently=False)
+        sent_total = failed_total = 0
+        try:
+            while True:
+                sent, failed = outbox.send_batch(options["batch_size"], mail_connection)
+                sent_total += sent
+                failed_total += failed
+                if sent or failed:
+                    continue
+                # Idle: don't hold the SMTP connection open, and clear out rows
+                # that no longer matter for delivery or the cooldown.
+                mail_connection.close()
+                outbox.purge_stale(options["batch_size"])
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            # Unfinished claims reappear after their lease
+            pass
+        finally:
+            mail_connection.close()
+        self.stdout.write(f"Sent {sent_total} verification emails ({failed_total} failed, queued for retry)")
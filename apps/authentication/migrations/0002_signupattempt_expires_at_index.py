@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="signupattempt",
+            name="expires_at",
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
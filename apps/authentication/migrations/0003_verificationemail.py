@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0002_signupattempt_expires_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VerificationEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("email", models.EmailField(max_length=254, unique=True)),
+                ("verification_code", models.CharField(max_length=6)),
+                ("queued_at", models.DateTimeField()),
+                ("run_at", models.DateTimeField()),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("claim_token", models.CharField(blank=True, max_length=32)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("sent_at__isnull", True)),
+                        fields=["run_at"],
+                        name="verification_email_ready_idx",
+                    ),
+                    models.Index(
+                        fields=["queued_at"], name="verification_email_queued_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
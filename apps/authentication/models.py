@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
+from . import hashing
 
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -38,13 +40,64 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    def set_password(self, raw_password):
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """Verifies the password on the bounded hashing pool."""
+
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return hashing.check_password(raw_password, self.password, setter)
+
+    async def acheck_password(self, raw_password):
+        """See check_password(). Awaits the hashing pool instead of hashing on the event loop."""
+
+        async def setter(raw_password):
+            self.password = await hashing.amake_password(raw_password)
+            self._password = None
+            await self.asave(update_fields=["password"])
+
+        return await hashing.acheck_password(raw_password, self.password, setter)
+
 class SignupAttempt(models.Model):
     email = models.EmailField(unique=True)
     encrypted_password = models.CharField(max_length=255)
     verification_code = models.CharField(max_length=6)
     signup_token = models.CharField(max_length=255, unique=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.email
+
+class VerificationEmail(models.Model):
+    """
+    Outbox for signup verification codes, one row per address. Requests only
+    write here; `manage.py send_verification_emails` delivers the rows. A
+    delivered row is kept so queued_at can enforce the resend cooldown.
+    """
+    email = models.EmailField(unique=True)
+    verification_code = models.CharField(max_length=6)
+    queued_at = models.DateTimeField()
+    # When the sender next picks the row up: pushed out by the lease while
+    # sending and by the backoff after a failed attempt.
+    run_at = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    claim_token = models.CharField(max_length=32, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["run_at"], condition=Q(sent_at__isnull=True), name="verification_email_ready_idx"),
+            models.Index(fields=["queued_at"], name="verification_email_queued_idx"),
+        ]
+
+    def __str__(self):
+        return self.email
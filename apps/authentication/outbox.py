@@ -0,0 +1,151 @@
+"""
+Transactional outbox for verification emails.
+
+Signup requests only upsert a VerificationEmail row, in the same transaction
+as the attempt it belongs to; the SMTP round trip happens later in
+`manage.py send_verification_emails`, which drains ready rows in batches over
+one reused connection. Delivery is at-least-once.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection
+from django.utils import timezone
+from apps.jobs import queue
+from .models import VerificationEmail
+
+logger = logging.getLogger(__name__)
+
+# How long a verification code is accepted; also how long an unsent row is worth delivering.
+CODE_TTL = timedelta(minutes=15)
+
+SUBJECT = "Your verification code"
+BODY = "Your verification code is {code}. It expires in {minutes} minutes."
+
+def cooldown() -> timedelta:
+    return timedelta(seconds=settings.VERIFICATION_EMAIL["COOLDOWN"])
+
+def queue_code(email: str, code: str, now: Optional[datetime] = None) -> bool:
+    """
+    Queues `code` for delivery to `email`. Returns False, writing nothing, when
+    a code was queued for the address within the cooldown.
+
+    The cooldown check is the WHERE clause of the upsert itself, so it costs no
+    extra query and two concurrent resends cannot both pass it.
+    """
+    now = now or timezone.now()
+    table = connection.ops.quote_name(VerificationEmail._meta.db_table)
+    queued_at = connection.ops.adapt_datetimefield_value(now)
+    cutoff = connection.ops.adapt_datetimefield_value(now - cooldown())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (email, verification_code, queued_at, run_at, attempts, claim_token, sent_at, last_error)
+            VALUES (%s, %s, %s, %s, 0, '', NULL, '')
+            ON CONFLICT (email) DO UPDATE SET
+                verification_code = excluded.verification_code,
+                queued_at = excluded.queued_at,
+                run_at = excluded.run_at,
+                attempts = 0,
+                claim_token = '',
+                sent_at = NULL,
+                last_error = ''
+            WHERE {table}.queued_at <= %s
+            """,
+            [email, code, queued_at, queued_at, cutoff],
+        )
+        return cursor.rowcount == 1
+
+def last_queued(email: str) -> Optional[VerificationEmail]:
+    return VerificationEmail.objects.filter(email=email).first()
+
+def claim(batch_size: int, now: Optional[datetime] = None) -> List[VerificationEmail]:
+    """Claims up to batch_size ready rows and hides them from other senders for the lease period."""
+    now = now or timezone.now()
+    config = settings.VERIFICATION_EMAIL
+    ready = VerificationEmail.objects.filter(
+        sent_at__isnull=True,
+        run_at__lte=now,
+        attempts__lt=config["MAX_ATTEMPTS"],
+        queued_at__gt=now - CODE_TTL,
+    ).order_by("run_at")
+    return queue.claim_rows(ready, batch_size, config["LEASE"], now)
+
+def retry_delay(attempts: int) -> float:
+    return queue.backoff(attempts, settings.VERIFICATION_EMAIL)
+
+def build_message(row: VerificationEmail) -> EmailMessage:
+    return EmailMessage(
+        subject=SUBJECT,
+        body=BODY.format(code=row.verification_code, minutes=int(CODE_TTL.total_seconds() // 60)),
+        to=[row.email],
+    )
+
+def reschedule(rows: List[VerificationEmail], now: Optional[datetime] = None) -> None:
+    """Schedules a retry for each failed row with backoff; rows out of attempts stay unsent until purged."""
+    now = now or timezone.now()
+    for row in rows:
+        # The claim token guards against a resend that requeued the row mid-send
+        VerificationEmail.objects.filter(id=row.id, claim_token=row.claim_token).update(
+            run_at=now + timedelta(seconds=retry_delay(row.attempts)), last_error=row.last_error
+        )
+
+def deliver(rows: List[VerificationEmail], mail_connection) -> Tuple[int, int]:
+    """
+    Sends each row over the already open `mail_connection`. A failed message
+    drops and reopens the connection so one bad address or a dropped socket
+    only fails that message. Returns (sent, failed).
+    """
+    sent, failed = [], []
+    for row in rows:
+        try:
+            if not mail_connection.send_messages([build_message(row)]):
+                raise RuntimeError("message not sent")
+        except Exception as exc:
+            logger.warning("Verification email to %s failed: %s", row.email, exc)
+            row.last_error = f"{type(exc).__name__}: {exc}"
+            failed.append(row)
+            mail_connection.close()
+            try:
+                mail_connection.open()
+            except Exception:
+                logger.exception("Could not reopen the mail connection")
+        else:
+            sent.append(row)
+
+    if sent:
+        VerificationEmail.objects.filter(id__in=[row.id for row in sent], claim_token=sent[0].claim_token).update(
+            sent_at=timezone.now(), last_error=""
+        )
+    reschedule(failed)
+    return len(sent), len(failed)
+
+def send_batch(batch_size: int, mail_connection) -> Tuple[int, int]:
+    """
+    Claims and delivers one batch. Returns (sent, failed); (0, 0) when idle.
+    The connection is opened on demand and left open for the next batch.
+    """
+    rows = claim(batch_size)
+    if not rows:
+        return 0, 0
+    try:
+        mail_connection.open()
+    except Exception as exc:
+        logger.warning("Could not open the mail connection: %s", exc)
+        for row in rows:
+            row.last_error = f"{type(exc).__name__}: {exc}"
+        reschedule(rows)
+        return 0, len(rows)
+    return deliver(rows, mail_connection)
+
+def purge_stale(batch_size: int, now: Optional[datetime] = None) -> int:
+    """Deletes rows past both the cooldown and the code lifetime; they no longer affect anything."""
+    now = now or timezone.now()
+    cutoff = now - max(CODE_TTL, cooldown())
+    ids = list(VerificationEmail.objects.filter(queued_at__lt=cutoff).values_list("id", flat=True)[:batch_size])
+    if not ids:
+        return 0
+    deleted, _ = VerificationEmail.objects.filter(id__in=ids, queued_at__lt=cutoff).delete()
+    return deleted
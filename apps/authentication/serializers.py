@@ -1,25 +1,26 @@
 from rest_framework import serializers
+from core.timing import TimedSerializerMixin
 from django.contrib.auth.password_validation import validate_password
 from .models import User, SignupAttempt
 
-class SignupStartSerializer(serializers.Serializer):
+class SignupStartSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True, validators=[validate_password])
 
-class SignupVerifySerializer(serializers.Serializer):
+class SignupVerifySerializer(TimedSerializerMixin, serializers.Serializer):
     signupToken = serializers.CharField(source="signup_token")
     code = serializers.CharField()
 
-class SignupCompleteSerializer(serializers.Serializer):
+class SignupCompleteSerializer(TimedSerializerMixin, serializers.Serializer):
     signupToken = serializers.CharField(source="signup_token")
     fullName = serializers.CharField(source="full_name")
     birthDate = serializers.DateField(source="birth_date")
 
-class LoginSerializer(serializers.Serializer):
+class LoginSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     userId = serializers.SerializerMethodField()
     name = serializers.CharField(source="full_name")
     onboardingComplete = serializers.BooleanField(source="onboarding_complete")
@@ -31,9 +32,9 @@ class UserSerializer(serializers.ModelSerializer):
     def get_userId(self, obj):
         return f"usr_{obj.id}"
 
-class PasswordResetSerializer(serializers.Serializer):
+class PasswordResetSerializer(TimedSerializerMixin, serializers.Serializer):
     token = serializers.CharField()
     password = serializers.CharField(write_only=True, validators=[validate_password])
 
-class ForgotPasswordSerializer(serializers.Serializer):
+class ForgotPasswordSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.EmailField()
@@ -1,54 +1,118 @@
 import secrets
 import string
-from datetime import timedelta, date
-from typing import Optional
+import time
+from datetime import date
+from typing import Optional, Tuple
+from asgiref.sync import sync_to_async
 from django.utils import timezone
-from django.contrib.auth.hashers import make_password
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from apps.chat.services import ChatService
+from apps.jobs.queue import enqueue
+from . import outbox
+from .attempts import get_attempt_store
+from .hashing import amake_password, make_password
+from .jobs import DELETE_ACCOUNT
 from .models import SignupAttempt, User
 
 def generate_signup_token() -> str:
     """Generates a secure signup token."""
     return "st_" + secrets.token_urlsafe(16)
 
+def generate_verification_code() -> str:
+    """Generates a six digit verification code."""
+    return "".join(secrets.choice(string.digits) for _ in range(6))
+
 class AuthService:
     """Service layer for authentication logic."""
 
     @staticmethod
     def start_signup(email: str, password: str) -> SignupAttempt:
         """
-        Starts the signup process by creating a SignupAttempt.
-        Raises ValidationError if email already exists.
+        Starts the signup process by creating a SignupAttempt and queueing its
+        verification email. Raises ValidationError if email already exists.
         """
         if User.objects.filter(email=email).exists():
             raise ValidationError("EMAIL_ALREADY_EXISTS")
 
-        # Invalidate old attempts for this email
-        SignupAttempt.objects.filter(email=email).delete()
+        return AuthService._save_attempt(AuthService._new_attempt(email, make_password(password)), restart=True)
+
+    @staticmethod
+    async def astart_signup(email: str, password: str) -> SignupAttempt:
+        """Async variant of start_signup(); hashing is awaited on the hashing pool."""
+        if await User.objects.filter(email=email).aexists():
+            raise ValidationError("EMAIL_ALREADY_EXISTS")
+
+        encrypted_password = await amake_password(password)
+        attempt = AuthService._new_attempt(email, encrypted_password)
+        return await sync_to_async(AuthService._save_attempt)(attempt, restart=True)
+
+    @staticmethod
+    def resend_code(signup_token: str) -> SignupAttempt:
+        """
+        Replaces the attempt's code with a fresh one and queues it for delivery.
+        Raises ValidationError if the token is invalid or expired, or if a code
+        was queued for the address within the resend cooldown.
+        """
+        attempt = get_attempt_store().get_by_token(signup_token)
+        if attempt is None or attempt.expires_at < timezone.now():
+            raise ValidationError("SIGNUP_TOKEN_EXPIRED")
 
-        signup_token = generate_signup_token()
-        verification_code = "123456" # Mock code as requested
-        expires_at = timezone.now() + timedelta(minutes=15)
+        attempt.verification_code = generate_verification_code()
+        attempt.expires_at = timezone.now() + outbox.CODE_TTL
+        return AuthService._save_attempt(attempt, restart=False)
 
-        signup_attempt = SignupAttempt.objects.create(
+    @staticmethod
+    async def aresend_code(signup_token: str) -> SignupAttempt:
+        """Async variant of resend_code(); the outbox write runs in one sync_to_async hop."""
+        return await sync_to_async(AuthService.resend_code)(signup_token)
+
+    @staticmethod
+    def _save_attempt(attempt: SignupAttempt, restart: bool) -> SignupAttempt:
+        # The attempt and its outbox row commit together, so a code is never
+        # mailed for an attempt that was rolled back, or the other way round.
+        now = timezone.now()
+        with transaction.atomic():
+            queued_at = now
+            if not outbox.queue_code(attempt.email, attempt.verification_code, now):
+                queued = outbox.last_queued(attempt.email)
+                if not restart:
+                    wait = (queued.queued_at + outbox.cooldown() - now).total_seconds()
+                    raise ValidationError("RESEND_COOLDOWN", params={"wait": max(wait, 1)})
+                # A repeated start within the cooldown keeps the code already on its way
+                attempt.verification_code = queued.verification_code
+                queued_at = queued.queued_at
+            # Not stored: signup responses report when the next resend is allowed
+            attempt.resend_available_at = queued_at + outbox.cooldown()
+            # Upserts: replaces any older attempt for this email
+            return get_attempt_store().save(attempt)
+
+    @staticmethod
+    def _new_attempt(email: str, encrypted_password: str) -> SignupAttempt:
+        return SignupAttempt(
             email=email,
-            encrypted_password=make_password(password),
-            verification_code=verification_code,
-            signup_token=signup_token,
-            expires_at=expires_at
+            encrypted_password=encrypted_password,
+            verification_code=generate_verification_code(),
+            signup_token=generate_signup_token(),
+            expires_at=timezone.now() + outbox.CODE_TTL
         )
 
-        return signup_attempt
-
     @staticmethod
     def verify_code(signup_token: str, code: str) -> SignupAttempt:
         """
         Verifies the signup code against the token.
         Raises ValidationError if token is invalid, expired or code is wrong.
         """
-        try:
-            attempt = SignupAttempt.objects.get(signup_token=signup_token)
-        except SignupAttempt.DoesNotExist:
+        return AuthService._check_code(get_attempt_store().get_by_token(signup_token), code)
+
+    @staticmethod
+    async def averify_code(signup_token: str, code: str) -> SignupAttempt:
+        """Async variant of verify_code()."""
+        return AuthService._check_code(await get_attempt_store().aget_by_token(signup_token), code)
+
+    @staticmethod
+    def _check_code(attempt: Optional[SignupAttempt], code: str) -> SignupAttempt:
+        if attempt is None:
             raise ValidationError("INVALID_TOKEN")
 
         if attempt.expires_at < timezone.now():
@@ -65,31 +129,85 @@ class AuthService:
         Completes the signup process by creating a User from a SignupAttempt.
         Raises ValidationError if token is expired or user is underage.
         """
+        store = get_attempt_store()
         try:
-            attempt = SignupAttempt.objects.get(signup_token=signup_token)
-        except SignupAttempt.DoesNotExist:
+            with transaction.atomic():
+                # Lock the attempt so a concurrent double-submit waits here
+                attempt = store.get_for_update(signup_token)
+                if attempt is None:
+                    raise ValidationError("SIGNUP_TOKEN_EXPIRED")
+
+                if attempt.expires_at < timezone.now():
+                    raise ValidationError("SIGNUP_TOKEN_EXPIRED")
+
+                # Age check
+                today = timezone.now().date()
+                age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+                if age < 18:
+                    raise ValidationError("UNDERAGE")
+
+                # Create user with the final password hash in a single INSERT
+                user = User(
+                    email=User.objects.normalize_email(attempt.email),
+                    password=attempt.encrypted_password,
+                    full_name=full_name,
+                    birth_date=birth_date
+                )
+                user.save(force_insert=True)
+
+                # Delete attempt; if another request already consumed it, roll back
+                if not store.delete(attempt):
+                    raise ValidationError("SIGNUP_TOKEN_EXPIRED")
+        except IntegrityError:
+            # The email was registered by a concurrent completion of the same attempt
             raise ValidationError("SIGNUP_TOKEN_EXPIRED")
 
-        if attempt.expires_at < timezone.now():
-            raise ValidationError("SIGNUP_TOKEN_EXPIRED")
+        return user
 
-        # Age check
-        today = timezone.now().date()
-        age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-        if age < 18:
-            raise ValidationError("UNDERAGE")
-
-        # Create user
-        user = User.objects.create_user(
-            email=attempt.email,
-            password=None,
-            full_name=full_name,
-            birth_date=birth_date
-        )
-        user.password = attempt.encrypted_password
-        user.save()
+    @staticmethod
+    async def acomplete_signup(signup_token: str, full_name: str, birth_date: date) -> User:
+        """
+        Async variant of complete_signup(). Django has no async transactions,
+        so the atomic completion runs in a single sync_to_async hop.
+        """
+        return await sync_to_async(AuthService.complete_signup)(signup_token, full_name, birth_date)
 
-        # Delete attempt
-        attempt.delete()
+    @staticmethod
+    def delete_account(user: User) -> None:
+        """
+        Deactivates the user at once and deletes the account in the background.
+        Conversations are soft-deleted and purged in batches by their own jobs;
+        the user row goes once none are left (see jobs.delete_account).
+        """
+        with transaction.atomic():
+            user.is_active = False
+            # save() rather than update() so the session-auth snapshot is invalidated
+            user.save(update_fields=["is_active"])
+            ChatService.delete_user_conversations(user.pk)
+            enqueue(DELETE_ACCOUNT, {"user_id": user.pk})
 
-        return user
+    @staticmethod
+    async def adelete_account(user: User) -> None:
+        """Async variant of delete_account(); the transaction runs in one sync_to_async hop."""
+        await sync_to_async(AuthService.delete_account)(user)
+
+    @staticmethod
+    def purge_expired_attempts(batch_size: int = 1000, max_batches: Optional[int] = None, pause: float = 0.0) -> Tuple[int, int]:
+        """
+        Deletes expired signup attempts in bounded batches, pausing between
+        batches so signup writes are never blocked for long.
+        Returns (rows deleted, batches run).
+        """
+        store = get_attempt_store()
+        deleted_total = batches = 0
+        while max_batches is None or batches < max_batches:
+            deleted = store.purge_expired(batch_size)
+            if not deleted:
+                break
+            deleted_total += deleted
+            batches += 1
+            if deleted < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+        return deleted_total, batches
@@ -0,0 +1,26 @@
+from django.db.models import ProtectedError
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from apps.chat.models import Conversation
+from .backends import invalidate_cached_user
+from .models import User
+
+@receiver(post_save, sender=User, dispatch_uid="authentication.invalidate_user_on_save")
+@receiver(post_delete, sender=User, dispatch_uid="authentication.invalidate_user_on_delete")
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    """Keeps the session-auth User cache consistent with the database."""
+    invalidate_cached_user(instance.pk)
+
+@receiver(pre_delete, sender=User, dispatch_uid="authentication.require_purged_conversations")
+def require_purged_conversations(sender, instance, **kwargs):
+    """
+    Refuses to delete a user who still has conversations: the cascade would
+    delete every message in one statement. Delete accounts with
+    AuthService.delete_account, which purges them in batches first.
+    """
+    conversations = Conversation.all_objects.filter(user_id=instance.pk)
+    if conversations.exists():
+        raise ProtectedError(
+            f"Delete user {instance.pk} with AuthService.delete_account; their conversations must be purged first.",
+            set(conversations[:10]),
+        )
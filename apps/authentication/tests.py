@@ -1,10 +1,47 @@
-from django.test import TestCase
-from rest_framework.test import APIClient
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework import status
-from django.core.cache import cache
-from .models import User, SignupAttempt
+import json
+import multiprocessing
+import re
+import smtplib
+import shutil
+import tempfile
+import threading
+from unittest import mock
+from io import StringIO
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.core.cache import cache, caches
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, transaction
+from django.db.models import F, ProtectedError
+from apps.chat.models import Conversation, Message
+from apps.chat.services import ChatService
+from apps.jobs import queue
+from apps.jobs.models import Job
+from apps.onboarding.models import OnboardingProgress
+from .models import User, SignupAttempt, VerificationEmail
+from . import outbox
+from . import bulk, hashing
+from .backends import user_cache_key
+from .jobs import DELETE_ACCOUNT, DELETE_ACCOUNT_MAX_RECHECKS
+from .attempts import get_attempt_store
+from .services import AuthService
+from core.checks import check_shared_caches
+from core.middleware import ReplicaRoutingMiddleware, ServerTimingMiddleware
+from core.throttling import SlidingWindowRateThrottle
 from django.utils import timezone
-from datetime import date
+from datetime import date, timedelta
+
+def delivered_code(email):
+    """Runs the outbox sender and reads the code from the last message sent to email."""
+    call_command("send_verification_emails", once=True, stdout=StringIO())
+    message = [message for message in mail.outbox if message.to == [email]][-1]
+    return re.search(r"\b(\d{6})\b", message.body).group(1)
 
 class AuthTests(TestCase):
     def setUp(self):
@@ -24,7 +61,7 @@ class AuthTests(TestCase):
         # 2. Verify Code
         response = self.client.post("/api/v1/auth/signup/verify-code", {
             "signupToken": signup_token,
-            "code": "123456"
+            "code": delivered_code("test@example.com")
         })
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data["emailVerified"])
@@ -108,3 +145,890 @@ class AuthTests(TestCase):
 
         user.refresh_from_db()
         self.assertTrue(user.onboarding_complete)
+
+@override_settings(SIGNUP_ATTEMPT_STORE="apps.authentication.attempts.CacheAttemptStore")
+class CacheAttemptStoreAuthTests(AuthTests):
+    """Runs the auth flows against the cache-backed signup attempt store."""
+
+    def test_signup_keeps_attempt_out_of_database(self):
+        response = self.client.post("/api/v1/auth/signup/start", {
+            "email": "cached@example.com",
+            "password": "StrongPassword123!"
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SignupAttempt.objects.exists())
+
+        attempt = get_attempt_store().get_by_email("cached@example.com")
+        self.assertEqual(attempt.signup_token, response.data["signupToken"])
+
+    def test_restart_replaces_previous_token(self):
+        first = self.client.post("/api/v1/auth/signup/start", {
+            "email": "restart@example.com",
+            "password": "StrongPassword123!"
+        }).data["signupToken"]
+        second = self.client.post("/api/v1/auth/signup/start", {
+            "email": "restart@example.com",
+            "password": "StrongPassword123!"
+        }).data["signupToken"]
+
+        store = get_attempt_store()
+        self.assertIsNone(store.get_by_token(first))
+        self.assertEqual(store.get_by_email("restart@example.com").signup_token, second)
+
+ATTEMPT_CACHE_DIR = tempfile.mkdtemp(prefix="navid-attempts-")
+
+@override_settings(
+    SIGNUP_ATTEMPT_CACHE="attempts",
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "attempts": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": ATTEMPT_CACHE_DIR},
+    },
+)
+class FileCacheAttemptStoreAuthTests(CacheAttemptStoreAuthTests):
+    """Same flows with a file-based cache standing in for a shared cache server."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(ATTEMPT_CACHE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        super().setUp()
+        caches["attempts"].clear()
+
+@override_settings(USER_CACHE_TIMEOUT=300)
+class MeCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.user = User.objects.create_user(email="me@example.com", password="password123", full_name="Me User")
+
+    def _login(self):
+        response = self.client.post("/api/v1/auth/login", {
+            "email": "me@example.com",
+            "password": "password123"
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _assert_warm_me_runs_no_queries(self):
+        self._login()
+        # First request after login loads the user snapshot into the cache
+        self.client.get("/api/v1/auth/me")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/auth/me")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "me@example.com")
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache")
+    def test_me_warm_with_cache_sessions(self):
+        self._assert_warm_me_runs_no_queries()
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_me_warm_with_cached_db_sessions(self):
+        self._assert_warm_me_runs_no_queries()
+
+    def test_onboarding_complete_keeps_fields_the_snapshot_missed(self):
+        self._login()
+        self.client.get("/api/v1/auth/me")
+        # Written where the invalidation does not reach this worker's snapshot
+        User.objects.filter(pk=self.user.pk).update(full_name="Renamed", password="argon2$newer-hash")
+
+        response = self.client.post("/api/v1/onboarding/complete", {"intent": "learn", "goals": []}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.onboarding_complete)
+        self.assertEqual(self.user.full_name, "Renamed")
+        self.assertEqual(self.user.password, "argon2$newer-hash")
+
+    @override_settings(USER_CACHE_TIMEOUT=0)
+    def test_snapshot_off_reads_the_user_every_request(self):
+        self._login()
+        self.client.get("/api/v1/auth/me")
+        User.objects.filter(pk=self.user.pk).update(full_name="Renamed")
+
+        response = self.client.get("/api/v1/auth/me")
+
+        self.assertEqual(response.data["name"], "Renamed")
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache")
+    def test_user_save_invalidates_snapshot(self):
+        self._login()
+        self.client.get("/api/v1/auth/me")
+
+        self.user.refresh_from_db()
+        self.user.full_name = "Renamed User"
+        self.user.save()
+
+        response = self.client.get("/api/v1/auth/me")
+        self.assertEqual(response.data["name"], "Renamed User")
+
+class SharedCacheCheckTests(SimpleTestCase):
+    LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    SHARED = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://localhost"}}
+
+    def _ids(self):
+        return [error.id for error in check_shared_caches(None)]
+
+    @override_settings(REQUIRE_SHARED_CACHE=True, CACHES=LOCMEM, USER_CACHE_TIMEOUT=300,
+                       SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_process_local_cache_fails_in_prod(self):
+        self.assertEqual(self._ids(), ["core.E001", "core.E002", "core.E003"])
+
+    @override_settings(REQUIRE_SHARED_CACHE=False, CACHES=LOCMEM, USER_CACHE_TIMEOUT=300,
+                       SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_not_enforced_outside_prod(self):
+        self.assertEqual(self._ids(), [])
+
+    @override_settings(REQUIRE_SHARED_CACHE=True, CACHES=LOCMEM, USER_CACHE_TIMEOUT=0,
+                       SESSION_ENGINE="django.contrib.sessions.backends.db")
+    def test_only_the_throttle_cache_needs_sharing_with_db_sessions(self):
+        self.assertEqual(self._ids(), ["core.E003"])
+
+    @override_settings(REQUIRE_SHARED_CACHE=True, CACHES=SHARED, USER_CACHE_TIMEOUT=300,
+                       SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_shared_cache_passes(self):
+        self.assertEqual(self._ids(), [])
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class MeReplicaTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="me@example.com", password="password123", full_name="Primary Name")
+        # Stand-in replica that is behind the primary
+        self.user.save(using="replica", force_insert=True)
+        User.objects.using("replica").filter(pk=self.user.pk).update(full_name="Replica Name")
+
+    def test_me_reads_from_the_replica(self):
+        client = APIClient()
+        client.force_login(self.user)
+
+        self.assertEqual(client.get("/api/v1/auth/me").data["name"], "Replica Name")
+
+    @override_settings(ROOT_URLCONF="config.async_urls")
+    async def test_async_me_reads_from_the_replica(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+
+        response = await client.get("/api/v1/auth/me")
+
+        self.assertEqual(response.json()["name"], "Replica Name")
+
+    @override_settings(USER_CACHE_TIMEOUT=300)
+    def test_user_snapshot_is_loaded_from_the_primary(self):
+        client = APIClient()
+        client.force_login(self.user)
+
+        self.assertEqual(client.get("/api/v1/auth/me").data["name"], "Primary Name")
+        self.assertEqual(cache.get(user_cache_key(self.user.pk)).full_name, "Primary Name")
+
+    @override_settings(USER_CACHE_TIMEOUT=300, ROOT_URLCONF="config.async_urls")
+    async def test_async_user_snapshot_is_loaded_from_the_primary(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+
+        response = await client.get("/api/v1/auth/me")
+
+        self.assertEqual(response.json()["name"], "Primary Name")
+
+    def test_me_right_after_login_reads_from_the_primary(self):
+        client = APIClient()
+        response = client.post("/api/v1/auth/login", {"email": "me@example.com", "password": "password123"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(client.get("/api/v1/auth/me").data["name"], "Primary Name")
+
+class HashingPoolTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def _saturate(self, pool):
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=pool.run, args=(block,))
+        thread.start()
+        started.wait(5)
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+
+    def test_pool_rejects_past_queue_limit(self):
+        pool = hashing.HashingPool(max_workers=1, max_queue=0)
+        self.addCleanup(pool.shutdown)
+        self._saturate(pool)
+
+        with self.assertRaises(hashing.HashingPoolBusy):
+            pool.run(lambda: None)
+
+    @override_settings(PASSWORD_HASHING_POOL={"MAX_WORKERS": 1, "MAX_QUEUE": 0})
+    def test_login_returns_503_when_pool_saturated(self):
+        User.objects.create_user(email="busy@example.com", password="password123", full_name="Busy User")
+        self._saturate(hashing.get_pool())
+
+        response = self.client.post("/api/v1/auth/login", {
+            "email": "busy@example.com",
+            "password": "password123"
+        })
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["code"], "SERVICE_BUSY")
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_password_hashed_with_argon2(self):
+        user = User.objects.create_user(email="argon@example.com", password="password123", full_name="Argon User")
+        self.assertTrue(user.password.startswith("argon2$"))
+        self.assertTrue(user.check_password("password123"))
+
+class PurgeSignupAttemptsTests(TestCase):
+    def _attempt(self, index, expires_at):
+        return SignupAttempt.objects.create(
+            email=f"sweep{index}@example.com",
+            encrypted_password="!",
+            verification_code="123456",
+            signup_token=f"st_sweep{index}",
+            expires_at=expires_at
+        )
+
+    def test_purges_expired_attempts_in_batches(self):
+        past = timezone.now() - timedelta(minutes=1)
+        for index in range(5):
+            self._attempt(index, past)
+        live = self._attempt(99, timezone.now() + timedelta(minutes=15))
+
+        out = StringIO()
+        call_command("purge_signup_attempts", batch_size=2, pause=0, stdout=out)
+
+        self.assertIn("Deleted 5 expired signup attempts in 3 batches", out.getvalue())
+        self.assertEqual(list(SignupAttempt.objects.values_list("pk", flat=True)), [live.pk])
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BulkUserCommandTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="navid-bulk-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def _file(self, name, content):
+        path = f"{self.directory}/{name}"
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        return path
+
+    def _import(self, path, **options):
+        out, err = StringIO(), StringIO()
+        call_command("import_users", path, workers=0, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_csv_with_onboarding(self):
+        User.objects.create_user(email="taken@example.com", password="x", full_name="Taken")
+        prehashed = hashing.make_password("prehashed-pass")
+        path = self._file("users.csv", (
+            "email,full_name,birth_date,password,password_hash,intent,goals\n"
+            "ada@example.com,Ada,1990-02-01,ada-pass,,learn,\"[\"\"focus\"\"]\"\n"
+            f"bob@example.com,Bob,,,{prehashed},,\n"
+            "taken@example.com,Taken Again,,x,,,\n"
+            "not-an-email,Nobody,,x,,,\n"
+        ))
+
+        out, err = self._import(path, batch_size=2)
+
+        self.assertIn("Imported 2 users (1 existing or duplicate, 1 invalid)", out)
+        self.assertIn("line 5: invalid email", err)
+        ada = User.objects.get(email="ada@example.com")
+        self.assertTrue(ada.check_password("ada-pass"))
+        self.assertEqual(ada.birth_date, date(1990, 2, 1))
+        self.assertEqual(ada.onboarding_progress.intent, "learn")
+        self.assertEqual(ada.onboarding_progress.goals, ["focus"])
+        self.assertTrue(User.objects.get(email="bob@example.com").check_password("prehashed-pass"))
+        self.assertEqual(User.objects.get(email="taken@example.com").full_name, "Taken")
+
+    def test_retries_a_batch_when_a_signup_races_it(self):
+        User.objects.create_user(email="racer@example.com", password="x", full_name="Racer")
+        path = self._file("users.jsonl", (
+            '{"email": "racer@example.com", "password": "import-pass"}\n'
+            '{"email": "calm@example.com", "password": "import-pass"}\n'
+        ))
+        # The first check runs before the signup commits, so it misses the racer
+        stale_then_fresh = [set(), bulk._existing_emails]
+
+        def existing_emails(emails):
+            check = stale_then_fresh.pop(0)
+            return check(emails) if callable(check) else check
+
+        with mock.patch.object(bulk, "_existing_emails", side_effect=existing_emails):
+            out, _ = self._import(path)
+
+        self.assertEqual(stale_then_fresh, [])
+        self.assertIn("Imported 1 users (1 existing or duplicate, 0 invalid)", out)
+        self.assertEqual(User.objects.get(email="racer@example.com").full_name, "Racer")
+        self.assertTrue(OnboardingProgress.objects.filter(user__email="calm@example.com").exists())
+
+    def test_resumes_from_checkpoint(self):
+        path = self._file("users.jsonl", "".join(
+            f'{{"email": "user{index}@example.com", "full_name": "User {index}", "password": "pw{index}"}}\n'
+            for index in range(5)
+        ))
+        checkpoint = f"{self.directory}/users.checkpoint"
+        with open(checkpoint, "w", encoding="utf-8") as handle:
+            json.dump({"path": path, "rows": 3}, handle)
+
+        out, _ = self._import(path, checkpoint=checkpoint, batch_size=1)
+
+        self.assertIn("Imported 2 users", out)
+        self.assertEqual(sorted(User.objects.values_list("email", flat=True)), ["user3@example.com", "user4@example.com"])
+        with open(checkpoint, encoding="utf-8") as handle:
+            self.assertEqual(json.load(handle)["rows"], 5)
+
+    def test_hashes_in_worker_processes(self):
+        path = self._file("users.jsonl", '{"email": "pool@example.com", "password": "pool-pass"}\n')
+
+        call_command("import_users", path, workers=2, stdout=StringIO(), stderr=StringIO())
+
+        self.assertTrue(User.objects.get(email="pool@example.com").check_password("pool-pass"))
+
+    def test_export_round_trip(self):
+        user = User.objects.create_user(
+            email="export@example.com", password="export-pass", full_name="Export", birth_date=date(1985, 5, 5)
+        )
+        user.onboarding_progress = OnboardingProgress.objects.create(user=user, intent="write", goals=["daily"])
+        for fmt in ("csv", "jsonl"):
+            with self.subTest(fmt=fmt):
+                path = f"{self.directory}/export.{fmt}"
+                call_command("export_users", output=path, include_hashes=True, chunk_size=1, stderr=StringIO())
+                User.objects.all().delete()
+
+                self._import(path)
+
+                imported = User.objects.get(email="export@example.com")
+                self.assertTrue(imported.check_password("export-pass"))
+                self.assertEqual(imported.birth_date, date(1985, 5, 5))
+                self.assertEqual(imported.date_joined, user.date_joined)
+                self.assertEqual(imported.onboarding_progress.goals, ["daily"])
+
+    def test_export_omits_hashes_by_default(self):
+        User.objects.create_user(email="plain@example.com", password="x", full_name="Plain")
+        out = StringIO()
+
+        call_command("export_users", stdout=out, stderr=StringIO())
+
+        row = json.loads(out.getvalue())
+        self.assertEqual(row["email"], "plain@example.com")
+        self.assertNotIn("password_hash", row)
+
+def create_pending_attempt(email="complete@example.com", signup_token="st_complete"):
+    return SignupAttempt.objects.create(
+        email=email,
+        encrypted_password="argon2$already-hashed",
+        verification_code="123456",
+        signup_token=signup_token,
+        expires_at=timezone.now() + timedelta(minutes=15)
+    )
+
+class AccountDeletionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="leaving@example.com", password="password123", full_name="Leaving")
+        self.conversation = Conversation.objects.create(user=self.user)
+        for i in range(3):
+            ChatService.add_message(self.conversation.pk, "user", f"message {i}")
+
+    def _run_ready_jobs(self):
+        while Job.objects.filter(status=Job.Status.PENDING, run_at__lte=timezone.now()).exists():
+            queue.run_once()
+
+    def test_delete_account_purges_then_deletes_the_user(self):
+        client = APIClient()
+        client.force_login(self.user)
+
+        response = client.delete("/api/v1/auth/account")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(client.get("/api/v1/auth/me").data)
+        self._run_ready_jobs()
+        self.assertFalse(Message.objects.exists())
+        # The account job checked before the purge finished and comes back later
+        Job.objects.update(run_at=timezone.now())
+        self._run_ready_jobs()
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(ROOT_URLCONF="config.async_urls")
+    async def test_async_delete_account(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+
+        response = await client.delete("/api/v1/auth/account")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse((await User.objects.aget(pk=self.user.pk)).is_active)
+        self.assertEqual(await Job.objects.filter(kind=DELETE_ACCOUNT).acount(), 1)
+
+    def test_deleting_a_user_with_conversations_directly_is_refused(self):
+        with self.assertRaises(ProtectedError), transaction.atomic():
+            self.user.delete()
+
+        self.assertEqual(Message.objects.count(), 3)
+
+    def test_account_job_gives_up_when_the_purge_never_finishes(self):
+        self.user.is_active = False
+        self.user.save()
+        queue.enqueue(DELETE_ACCOUNT, {"user_id": self.user.pk, "rechecks": DELETE_ACCOUNT_MAX_RECHECKS})
+
+        queue.run_once()
+
+        job = Job.objects.get()
+        self.assertEqual(job.kind, DELETE_ACCOUNT)
+        self.assertTrue(job.last_error.startswith("PurgeIncomplete"))
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+class CompleteSignupTests(TestCase):
+    def test_completion_statements(self):
+        create_pending_attempt()
+
+        # SAVEPOINT, SELECT ... FOR UPDATE, INSERT user, DELETE attempt, RELEASE SAVEPOINT
+        with self.assertNumQueries(5):
+            user = AuthService.complete_signup("st_complete", "Complete User", date(1990, 1, 1))
+
+        self.assertEqual(user.password, "argon2$already-hashed")
+        self.assertFalse(SignupAttempt.objects.exists())
+
+    def test_underage_keeps_attempt(self):
+        create_pending_attempt()
+
+        with self.assertRaises(DjangoValidationError):
+            AuthService.complete_signup("st_complete", "Young User", date.today() - timedelta(days=365))
+
+        self.assertTrue(SignupAttempt.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+class CompleteSignupConcurrencyTests(TransactionTestCase):
+    def test_double_submit_creates_one_user(self):
+        create_pending_attempt()
+        barrier = threading.Barrier(4)
+        results = []
+
+        def submit():
+            barrier.wait()
+            try:
+                AuthService.complete_signup("st_complete", "Complete User", date(1990, 1, 1))
+                results.append("CREATED")
+            except DjangoValidationError as e:
+                results.append(e.message)
+            except Exception as e:
+                results.append(repr(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), ["CREATED"] + ["SIGNUP_TOKEN_EXPIRED"] * 3)
+        self.assertEqual(User.objects.filter(email="complete@example.com").count(), 1)
+        self.assertFalse(SignupAttempt.objects.exists())
+
+class StartSignupTests(TestCase):
+    def test_start_statements(self):
+        # EXISTS check on User, then SAVEPOINT, outbox upsert, attempt upsert, RELEASE SAVEPOINT
+        with self.assertNumQueries(5):
+            attempt = AuthService.start_signup("start@example.com", "StrongPassword123!")
+
+        self.assertEqual(VerificationEmail.objects.get().verification_code, attempt.verification_code)
+        self.assertEqual(mail.outbox, [])
+
+    def test_restart_upserts_attempt(self):
+        first = AuthService.start_signup("upsert@example.com", "StrongPassword123!")
+
+        # Within the cooldown the outbox upsert writes nothing, so the code already queued is read back
+        with self.assertNumQueries(6):
+            attempt = AuthService.start_signup("upsert@example.com", "StrongPassword123!")
+
+        stored = SignupAttempt.objects.get(email="upsert@example.com")
+        self.assertEqual(stored.signup_token, attempt.signup_token)
+        self.assertEqual(stored.verification_code, first.verification_code)
+        self.assertEqual(VerificationEmail.objects.count(), 1)
+
+class CountingEmailBackend(locmem.EmailBackend):
+    """locmem backend that counts connections and refuses mail to bounce@ addresses."""
+    opened = 0
+
+    def open(self):
+        if getattr(self, "is_open", False):
+            return False
+        self.is_open = True
+        CountingEmailBackend.opened += 1
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, messages):
+        if any(address.startswith("bounce@") for message in messages for address in message.to):
+            raise smtplib.SMTPRecipientsRefused({})
+        return super().send_messages(messages)
+
+@override_settings(EMAIL_BACKEND="apps.authentication.tests.CountingEmailBackend")
+class VerificationEmailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        CountingEmailBackend.opened = 0
+
+    def _start(self, email):
+        response = self.client.post("/api/v1/auth/signup/start", {"email": email, "password": "StrongPassword123!"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.json()["signupToken"]
+
+    def _age_outbox(self, seconds):
+        VerificationEmail.objects.update(queued_at=F("queued_at") - timedelta(seconds=seconds))
+
+    def test_code_is_sent_by_the_worker(self):
+        signup_token = self._start("mailed@example.com")
+        self.assertEqual(mail.outbox, [])
+
+        code = delivered_code("mailed@example.com")
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(SignupAttempt.objects.get().verification_code, code)
+        self.assertIsNotNone(VerificationEmail.objects.get().sent_at)
+        response = self.client.post("/api/v1/auth/signup/verify-code", {"signupToken": signup_token, "code": code})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @mock.patch("apps.authentication.services.generate_verification_code", side_effect=["111111", "222222", "333333"])
+    def test_resend_respects_cooldown(self, generate_code):
+        signup_token = self._start("resend@example.com")
+        first_code = delivered_code("resend@example.com")
+
+        response = self.client.post("/api/v1/auth/signup/resend-code", {"signupToken": signup_token})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.json()["code"], "RATE_LIMITED")
+        self.assertLessEqual(int(response["Retry-After"]), settings.VERIFICATION_EMAIL["COOLDOWN"])
+
+        self._age_outbox(settings.VERIFICATION_EMAIL["COOLDOWN"])
+        response = self.client.post("/api/v1/auth/signup/resend-code", {"signupToken": signup_token})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        second_code = delivered_code("resend@example.com")
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertNotEqual(second_code, first_code)
+        response = self.client.post("/api/v1/auth/signup/verify-code", {"signupToken": signup_token, "code": first_code})
+        self.assertEqual(response.json()["code"], "INVALID_CODE")
+        response = self.client.post("/api/v1/auth/signup/verify-code", {"signupToken": signup_token, "code": second_code})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_restart_reports_the_cooldown_of_the_queued_code(self):
+        first = self.client.post("/api/v1/auth/signup/start", {"email": "again@example.com", "password": "StrongPassword123!"})
+        self._age_outbox(settings.VERIFICATION_EMAIL["COOLDOWN"] // 2)
+
+        second = self.client.post("/api/v1/auth/signup/start", {"email": "again@example.com", "password": "StrongPassword123!"})
+
+        queued_at = VerificationEmail.objects.get().queued_at
+        expected = (queued_at + outbox.cooldown()).isoformat().replace("+00:00", "Z")
+        self.assertEqual(second.json()["verification"]["resendAvailableAt"], expected)
+        self.assertLess(expected, first.json()["verification"]["resendAvailableAt"])
+
+    def test_resend_with_unknown_token(self):
+        response = self.client.post("/api/v1/auth/signup/resend-code", {"signupToken": "st_missing"})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertFalse(VerificationEmail.objects.exists())
+
+    def test_worker_reuses_one_connection_across_batches(self):
+        for index in range(5):
+            outbox.queue_code(f"batch{index}@example.com", "123456")
+
+        out = StringIO()
+        call_command("send_verification_emails", once=True, batch_size=2, stdout=out)
+
+        self.assertIn("Sent 5 verification emails", out.getvalue())
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(CountingEmailBackend.opened, 1)
+
+    def test_failed_delivery_is_retried(self):
+        outbox.queue_code("bounce@example.com", "111111")
+        outbox.queue_code("fine@example.com", "222222")
+
+        with self.assertLogs("apps.authentication.outbox", "WARNING"):
+            call_command("send_verification_emails", once=True, stdout=StringIO())
+
+        self.assertEqual([message.to for message in mail.outbox], [["fine@example.com"]])
+        bounced = VerificationEmail.objects.get(email="bounce@example.com")
+        self.assertIsNone(bounced.sent_at)
+        self.assertEqual(bounced.attempts, 1)
+        self.assertIn("SMTPRecipientsRefused", bounced.last_error)
+        self.assertGreater(bounced.run_at, timezone.now())
+
+        # Once the backoff has passed the row is claimed again
+        VerificationEmail.objects.filter(pk=bounced.pk).update(run_at=timezone.now())
+        self.assertEqual([row.email for row in outbox.claim(10)], ["bounce@example.com"])
+
+    def test_stale_rows_are_purged(self):
+        outbox.queue_code("old@example.com", "123456")
+        outbox.queue_code("new@example.com", "123456")
+        VerificationEmail.objects.filter(email="old@example.com").update(
+            queued_at=timezone.now() - outbox.CODE_TTL - timedelta(minutes=1)
+        )
+
+        call_command("send_verification_emails", once=True, stdout=StringIO())
+
+        self.assertEqual(list(VerificationEmail.objects.values_list("email", flat=True)), ["new@example.com"])
+        self.assertEqual([message.to for message in mail.outbox], [["new@example.com"]])
+
+class StartSignupConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_parallel_starts_leave_one_attempt(self):
+        # Stays under the "auth" throttle rate for a single client IP
+        workers = 8
+        barrier = threading.Barrier(workers)
+        statuses, tokens = [], []
+
+        def start():
+            client = APIClient()
+            barrier.wait()
+            try:
+                response = client.post("/api/v1/auth/signup/start", {
+                    "email": "stress@example.com",
+                    "password": "StrongPassword123!"
+                })
+                statuses.append(response.status_code)
+                if response.status_code == status.HTTP_201_CREATED:
+                    tokens.append(response.data["signupToken"])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=start) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(statuses, [status.HTTP_201_CREATED] * workers)
+        attempts = SignupAttempt.objects.filter(email="stress@example.com")
+        self.assertEqual(attempts.count(), 1)
+        self.assertIn(attempts.get().signup_token, tokens)
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(email="timing@example.com", password="password123", full_name="Timing User")
+
+    def _login(self, client):
+        return client.post("/api/v1/auth/login", {
+            "email": "timing@example.com",
+            "password": "password123"
+        })
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_login_reports_timings(self):
+        with self.assertLogs("core.timing", level="INFO") as logs:
+            response = self._login(APIClient())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = {part.split(";")[0] for part in response["Server-Timing"].split(", ")}
+        self.assertTrue({"db", "hash", "serializer", "view", "total"} <= metrics)
+        self.assertIn('"path": "/api/v1/auth/login"', logs.output[0])
+        self.assertIn('"queries": ', logs.output[0])
+
+    def test_disabled_by_default(self):
+        response = self._login(APIClient())
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_ENABLED=True, ROOT_URLCONF="config.async_urls")
+    async def test_async_chain_reports_timings(self):
+        client = AsyncClient()
+        with self.assertLogs("core.timing", level="INFO"):
+            response = await client.post(
+                "/api/v1/auth/login", {"email": "timing@example.com", "password": "password123"},
+                content_type="application/json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = {part.split(";")[0]: part for part in response["Server-Timing"].split(", ")}
+        self.assertTrue({"db", "hash", "view", "total"} <= set(metrics))
+        # The ORM runs in sync_to_async worker threads, on their own connections
+        duration, queries = re.fullmatch(r'db;dur=([\d.]+);desc="(\d+) queries"', metrics["db"]).groups()
+        self.assertGreater(int(queries), 0)
+        self.assertGreater(float(duration), 0)
+
+    @override_settings(SERVER_TIMING_ENABLED=True, DATABASE_REPLICAS=["replica"])
+    def test_middleware_runs_natively_in_async_chains(self):
+        async def get_response(request):
+            return None
+
+        for middleware_class in (ServerTimingMiddleware, ReplicaRoutingMiddleware):
+            with self.subTest(middleware=middleware_class.__name__):
+                middleware = middleware_class(get_response)
+                self.assertTrue(iscoroutinefunction(middleware))
+                self.assertTrue(iscoroutinefunction(middleware.process_view))
+                self.assertFalse(iscoroutinefunction(middleware_class(lambda request: None)))
+
+@override_settings(ROOT_URLCONF="config.async_urls")
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    async def _post(self, client, path, data=None):
+        return await client.post(path, data or {}, content_type="application/json")
+
+    async def test_signup_flow(self):
+        client = AsyncClient()
+        response = await self._post(client, "/api/v1/auth/signup/start", {
+            "email": "async@example.com",
+            "password": "StrongPassword123!"
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        signup_token = response.json()["signupToken"]
+
+        code = await sync_to_async(delivered_code)("async@example.com")
+        wrong_code = str((int(code) + 1) % 1000000).zfill(6)
+        response = await self._post(client, "/api/v1/auth/signup/verify-code", {"signupToken": signup_token, "code": wrong_code})
+        self.assertEqual(response.json()["code"], "INVALID_CODE")
+        response = await self._post(client, "/api/v1/auth/signup/verify-code", {"signupToken": signup_token, "code": code})
+        self.assertTrue(response.json()["emailVerified"])
+
+        response = await self._post(client, "/api/v1/auth/signup/complete-profile", {
+            "signupToken": signup_token,
+            "fullName": "Async User",
+            "birthDate": "1990-01-01"
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["name"], "Async User")
+
+        response = await client.get("/api/v1/auth/me")
+        self.assertEqual(response.json()["email"], "async@example.com")
+        self.assertIn("csrftoken", response.cookies)
+
+        response = await self._post(client, "/api/v1/onboarding/progress", {"intent": "work"})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        response = await client.patch("/api/v1/onboarding/progress", {"intent": "work"}, content_type="application/json")
+        self.assertEqual(response.json(), {"intent": "work", "goals": [], "onboardingComplete": False})
+        response = await self._post(client, "/api/v1/onboarding/complete", {"intent": "work", "goals": ["code"]})
+        self.assertTrue(response.json()["onboardingComplete"])
+
+        response = await self._post(client, "/api/v1/auth/logout")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = await client.get("/api/v1/auth/me")
+        self.assertIsNone(response.json())
+
+    async def test_login_and_errors(self):
+        await User.objects.acreate(email="alogin@example.com", password=await hashing.amake_password("password123"), full_name="Async Login")
+        client = AsyncClient()
+
+        response = await self._post(client, "/api/v1/auth/login", {"email": "alogin@example.com", "password": "wrong"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()["code"], "INVALID_CREDENTIALS")
+
+        response = await self._post(client, "/api/v1/auth/login", {"email": "not-an-email", "password": "x"})
+        self.assertEqual(response.json()["code"], "VALIDATION_ERROR")
+        self.assertIn("email", response.json()["details"])
+
+        response = await self._post(client, "/api/v1/auth/login", {"email": "alogin@example.com", "password": "password123"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_authenticated_post_requires_csrf(self):
+        await User.objects.acreate(email="acsrf@example.com", password=await hashing.amake_password("password123"), full_name="Async CSRF")
+        client = AsyncClient(enforce_csrf_checks=True)
+        await self._post(client, "/api/v1/auth/login", {"email": "acsrf@example.com", "password": "password123"})
+
+        response = await self._post(client, "/api/v1/auth/logout")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("CSRF", response.json()["message"])
+
+    async def test_anonymous_onboarding_rejected(self):
+        response = await AsyncClient().patch("/api/v1/onboarding/progress", {}, content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json()["code"], "NOT_AUTHENTICATED")
+
+class FixedClockThrottle(SlidingWindowRateThrottle):
+    # Start of a window, so the previous window carries its full weight
+    timer = staticmethod(lambda: 6_000_000.0)
+
+class ThrottledView:
+    throttle_scope = "auth"
+
+def hammer_throttle(attempts):
+    """Runs in a forked worker process; returns how many hits were allowed."""
+    factory = APIRequestFactory()
+    allowed = 0
+    for attempt in range(attempts):
+        request = factory.post("/", REMOTE_ADDR="10.0.0.1")
+        request.data = {}
+        allowed += FixedClockThrottle().allow_request(request, ThrottledView())
+    return allowed
+
+THROTTLE_CACHE_DIR = tempfile.mkdtemp(prefix="navid-throttle-")
+
+@override_settings(
+    THROTTLE_CACHE="throttle",
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "throttle": {"BACKEND": "core.cache.LockingFileBasedCache", "LOCATION": THROTTLE_CACHE_DIR},
+    },
+)
+class SlidingWindowThrottleTests(SimpleTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(THROTTLE_CACHE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        caches["throttle"].clear()
+        self.factory = APIRequestFactory()
+
+    def _request(self, ip, email=None):
+        request = self.factory.post("/", REMOTE_ADDR=ip)
+        request.data = {"email": email} if email else {}
+        return request
+
+    def test_limit_holds_across_processes(self):
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            allowed = sum(pool.map(hammer_throttle, [8] * 4))
+        self.assertEqual(allowed, 10)
+
+    def test_limits_target_email_across_ips(self):
+        results = [
+            FixedClockThrottle().allow_request(self._request(f"10.0.1.{i}", "Victim@Example.com"), ThrottledView())
+            for i in range(11)
+        ]
+        self.assertEqual(results, [True] * 10 + [False])
+
+    def test_previous_window_weighs_in(self):
+        throttle_class = type("HalfWindowThrottle", (SlidingWindowRateThrottle,), {
+            "timer": staticmethod(lambda: 6_000_030.0)
+        })
+        caches["throttle"].set("throttle:auth:ip:10.0.2.1:99999", 8)
+        results = [throttle_class().allow_request(self._request("10.0.2.1"), ThrottledView()) for _ in range(7)]
+        # 8 hits in the previous window count as 4 halfway through this one
+        self.assertEqual(results, [True] * 6 + [False])
+
+    def test_rejection_survives_a_window_expiring_mid_request(self):
+        class ExpiringThrottle(FixedClockThrottle):
+            def _incr(self, key, timeout):
+                count = super()._incr(key, timeout)
+                # The counter expires between the hit and the undo
+                self.cache.delete(key)
+                return count
+
+        for _ in range(10):
+            FixedClockThrottle().allow_request(self._request("10.0.3.1"), ThrottledView())
+        self.assertFalse(ExpiringThrottle().allow_request(self._request("10.0.3.1"), ThrottledView()))
+
+class RateLimitResponseTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_rate_limited_error_shape(self):
+        client = APIClient()
+        for _ in range(10):
+            client.post("/api/v1/auth/login", {"email": "nobody@example.com", "password": "x"})
+        response = client.post("/api/v1/auth/login", {"email": "nobody@example.com", "password": "x"})
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.data["code"], "RATE_LIMITED")
+        self.assertIn("Retry-After", response)
@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     SignupStartView, SignupResendCodeView, SignupVerifyView, SignupCompleteView,
-    LoginView, MeView, LogoutView, ForgotPasswordView, ResetPasswordView
+    LoginView, MeView, AccountView, LogoutView, ForgotPasswordView, ResetPasswordView
 )
 
 urlpatterns = [
@@ -11,6 +11,7 @@ urlpatterns = [
     path("signup/complete-profile", SignupCompleteView.as_view(), name="signup-complete-profile"),
     path("login", LoginView.as_view(), name="login"),
     path("me", MeView.as_view(), name="me"),
+    path("account", AccountView.as_view(), name="account"),
     path("logout", LogoutView.as_view(), name="logout"),
     path("forgot-password", ForgotPasswordView.as_view(), name="forgot-password"),
     path("reset-password", ResetPasswordView.as_view(), name="reset-password"),
@@ -1,171 +1,189 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status, permissions, throttling
+from rest_framework import status, permissions
 from django.contrib.auth import authenticate, login, logout
-from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
-from .models import SignupAttempt
+from core.throttling import SlidingWindowRateThrottle
 from .serializers import (
     SignupStartSerializer, SignupVerifySerializer, SignupCompleteSerializer,
     LoginSerializer, UserSerializer, ForgotPasswordSerializer, PasswordResetSerializer
 )
 from .services import AuthService
 from django.core.exceptions import ValidationError as DjangoValidationError
-from rest_framework.exceptions import ValidationError, APIException
+from rest_framework.exceptions import ValidationError, APIException, Throttled
 
 class UnderageException(APIException):
     status_code = 422
     default_detail = "You must be at least 18 years old to use Navid AI."
     default_code = "UNDERAGE"
 
+def validated_data(serializer_class, data):
+    serializer = serializer_class(data=data)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+def error_body(message, code):
+    return {
+        "message": message,
+        "code": code,
+        "details": {}
+    }
+
+def signup_started_data(attempt):
+    return {
+        "signupToken": attempt.signup_token,
+        "email": attempt.email,
+        "verification": {
+            "channel": "email",
+            "codeLength": 6,
+            "expiresAt": attempt.expires_at.isoformat().replace("+00:00", "Z"),
+            "resendAvailableAt": attempt.resend_available_at.isoformat().replace("+00:00", "Z")
+        }
+    }
+
+def signup_verified_data(attempt):
+    return {
+        "signupToken": attempt.signup_token,
+        "emailVerified": True
+    }
+
+def resend_code_error(e):
+    """Maps a resend_code() ValidationError to (response body, status); the cooldown raises Throttled."""
+    if e.message == "RESEND_COOLDOWN":
+        raise Throttled(wait=e.params["wait"])
+    return error_body("Signup token expired or invalid", "SIGNUP_TOKEN_EXPIRED"), status.HTTP_410_GONE
+
+def start_signup_error(e):
+    """Maps a start_signup() ValidationError to (response body, status), re-raising unknown ones."""
+    if e.message == "EMAIL_ALREADY_EXISTS":
+        return error_body("Email already exists", "EMAIL_ALREADY_EXISTS"), status.HTTP_409_CONFLICT
+    raise e
+
+def verify_code_error(e):
+    """Maps a verify_code() ValidationError to (response body, status)."""
+    code = "INVALID_CODE"
+    status_code = status.HTTP_400_BAD_REQUEST
+    if e.message == "CODE_EXPIRED":
+        code = "CODE_EXPIRED"
+        status_code = status.HTTP_410_GONE
+    elif e.message == "INVALID_TOKEN":
+        code = "INVALID_TOKEN"
+        status_code = status.HTTP_400_BAD_REQUEST
+
+    return error_body(e.message, code), status_code
+
+def complete_signup_error(e):
+    """Maps a complete_signup() ValidationError to (response body, status); underage raises UnderageException."""
+    if e.message == "UNDERAGE":
+        raise UnderageException()
+    if e.message == "SIGNUP_TOKEN_EXPIRED":
+        return error_body("Signup token expired", "SIGNUP_TOKEN_EXPIRED"), status.HTTP_410_GONE
+    raise e
+
+def invalid_credentials_error():
+    return error_body("Invalid credentials", "INVALID_CREDENTIALS"), status.HTTP_401_UNAUTHORIZED
+
+def me_data(user):
+    """The signed-in user, or None for anonymous visitors."""
+    return UserSerializer(user).data if user.is_authenticated else None
+
 class SignupResendCodeView(APIView):
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [throttling.ScopedRateThrottle]
+    throttle_classes = [SlidingWindowRateThrottle]
     throttle_scope = "auth"
 
     def post(self, request):
-        # Mock implementation: validate token exists at least
-        signup_token = request.data.get("signupToken")
-        if not signup_token or not SignupAttempt.objects.filter(signup_token=signup_token).exists():
-            return Response({
-                "message": "Signup token expired or invalid",
-                "code": "SIGNUP_TOKEN_EXPIRED",
-                "details": {}
-            }, status=status.HTTP_410_GONE)
+        try:
+            AuthService.resend_code(request.data.get("signupToken") or "")
+        except DjangoValidationError as e:
+            data, status_code = resend_code_error(e)
+            return Response(data, status=status_code)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class SignupStartView(APIView):
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [throttling.ScopedRateThrottle]
+    throttle_classes = [SlidingWindowRateThrottle]
     throttle_scope = "auth"
 
     def post(self, request):
-        serializer = SignupStartSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        data = validated_data(SignupStartSerializer, request.data)
 
         try:
-            attempt = AuthService.start_signup(
-                email=serializer.validated_data["email"],
-                password=serializer.validated_data["password"]
-            )
+            attempt = AuthService.start_signup(email=data["email"], password=data["password"])
         except DjangoValidationError as e:
-            if e.message == "EMAIL_ALREADY_EXISTS":
-                return Response({
-                    "message": "Email already exists",
-                    "code": "EMAIL_ALREADY_EXISTS",
-                    "details": {}
-                }, status=status.HTTP_409_CONFLICT)
-            raise e
-
-        return Response({
-            "signupToken": attempt.signup_token,
-            "email": attempt.email,
-            "verification": {
-                "channel": "email",
-                "codeLength": 6,
-                "expiresAt": attempt.expires_at.isoformat().replace("+00:00", "Z"),
-                "resendAvailableAt": (attempt.created_at + timezone.timedelta(minutes=1)).isoformat().replace("+00:00", "Z")
-            }
-        }, status=status.HTTP_201_CREATED)
+            body, status_code = start_signup_error(e)
+            return Response(body, status=status_code)
+
+        return Response(signup_started_data(attempt), status=status.HTTP_201_CREATED)
 
 class SignupVerifyView(APIView):
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [throttling.ScopedRateThrottle]
+    throttle_classes = [SlidingWindowRateThrottle]
     throttle_scope = "auth"
 
     def post(self, request):
-        serializer = SignupVerifySerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        data = validated_data(SignupVerifySerializer, request.data)
 
         try:
-            attempt = AuthService.verify_code(
-                signup_token=serializer.validated_data["signup_token"],
-                code=serializer.validated_data["code"]
-            )
+            attempt = AuthService.verify_code(signup_token=data["signup_token"], code=data["code"])
         except DjangoValidationError as e:
-            code = "INVALID_CODE"
-            status_code = status.HTTP_400_BAD_REQUEST
-            if e.message == "CODE_EXPIRED":
-                code = "CODE_EXPIRED"
-                status_code = status.HTTP_410_GONE
-            elif e.message == "INVALID_TOKEN":
-                code = "INVALID_TOKEN"
-                status_code = status.HTTP_400_BAD_REQUEST
-
-            return Response({
-                "message": e.message,
-                "code": code,
-                "details": {}
-            }, status=status_code)
-
-        return Response({
-            "signupToken": attempt.signup_token,
-            "emailVerified": True
-        }, status=status.HTTP_200_OK)
+            body, status_code = verify_code_error(e)
+            return Response(body, status=status_code)
+
+        return Response(signup_verified_data(attempt), status=status.HTTP_200_OK)
 
 class SignupCompleteView(APIView):
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [throttling.ScopedRateThrottle]
+    throttle_classes = [SlidingWindowRateThrottle]
     throttle_scope = "auth"
 
     def post(self, request):
-        serializer = SignupCompleteSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        data = validated_data(SignupCompleteSerializer, request.data)
 
         try:
             user = AuthService.complete_signup(
-                signup_token=serializer.validated_data["signup_token"],
-                full_name=serializer.validated_data["full_name"],
-                birth_date=serializer.validated_data["birth_date"]
+                signup_token=data["signup_token"],
+                full_name=data["full_name"],
+                birth_date=data["birth_date"]
             )
         except DjangoValidationError as e:
-            if e.message == "UNDERAGE":
-                raise UnderageException()
-            if e.message == "SIGNUP_TOKEN_EXPIRED":
-                return Response({
-                    "message": "Signup token expired",
-                    "code": "SIGNUP_TOKEN_EXPIRED",
-                    "details": {}
-                }, status=status.HTTP_410_GONE)
-            raise e
+            body, status_code = complete_signup_error(e)
+            return Response(body, status=status_code)
 
         login(request, user)
         return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
 
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [throttling.ScopedRateThrottle]
+    throttle_classes = [SlidingWindowRateThrottle]
     throttle_scope = "auth"
 
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        user = authenticate(
-            request,
-            email=serializer.validated_data["email"],
-            password=serializer.validated_data["password"]
-        )
+        data = validated_data(LoginSerializer, request.data)
 
+        user = authenticate(request, email=data["email"], password=data["password"])
         if not user:
-            return Response({
-                "message": "Invalid credentials",
-                "code": "INVALID_CREDENTIALS",
-                "details": {}
-            }, status=status.HTTP_401_UNAUTHORIZED)
+            body, status_code = invalid_credentials_error()
+            return Response(body, status=status_code)
 
         login(request, user)
         return Response(UserSerializer(user).data, status=status.HTTP_200_OK)
 
 class MeView(APIView):
     permission_classes = [permissions.AllowAny]
+    read_from_replica = True
 
     @method_decorator(ensure_csrf_cookie)
     def get(self, request):
-        if not request.user.is_authenticated:
-            return Response(None, status=status.HTTP_200_OK)
-        return Response(UserSerializer(request.user).data, status=status.HTTP_200_OK)
+        return Response(me_data(request.user), status=status.HTTP_200_OK)
+
+class AccountView(APIView):
+    def delete(self, request):
+        # Signs the user out at once; the data goes in the background
+        AuthService.delete_account(request.user)
+        logout(request)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 class LogoutView(APIView):
     def post(self, request):
@@ -174,7 +192,7 @@ class LogoutView(APIView):
 
 class ForgotPasswordView(APIView):
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [throttling.ScopedRateThrottle]
+    throttle_classes = [SlidingWindowRateThrottle]
     throttle_scope = "auth"
 
     def post(self, request):
@@ -183,7 +201,7 @@ class ForgotPasswordView(APIView):
 
 class ResetPasswordView(APIView):
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [throttling.ScopedRateThrottle]
+    throttle_classes = [SlidingWindowRateThrottle]
     throttle_scope = "auth"
 
     def post(self, request):
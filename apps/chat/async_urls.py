@@ -0,0 +1,9 @@
+from django.urls import path
+from .async_views import MessageStreamView
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path("conversations/<conv:conversation_id>/messages/stream", MessageStreamView.as_view(), name="chat-messages-stream"),
+    # The rest of the chat API has no async twin yet; Django runs it in a thread under ASGI
+    *sync_urlpatterns,
+]
@@ -0,0 +1,61 @@
+import json
+from contextlib import aclosing
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound, PermissionDenied
+from core.async_views import AsyncAPIView
+from .models import Conversation, Message
+from .providers import ProviderUnavailable, get_provider
+from .serializers import MessageCreateSerializer
+from .services import ChatService
+
+async def aget_owned_conversation(user, conversation_id):
+    """See views.get_owned_conversation()."""
+    conversation = await Conversation.objects.filter(pk=conversation_id).only("user_id").afirst()
+    if conversation is None:
+        raise NotFound("Conversation not found.")
+    if conversation.user_id != user.id:
+        raise PermissionDenied("You do not have access to this conversation.")
+    return conversation
+
+def sse_event(payload):
+    return f"data: {json.dumps(payload)}\n\n"
+
+async def relay_reply(conversation_id, provider, history):
+    """
+    Relays provider chunks as SSE events and saves the assistant message once
+    the reply is complete.
+
+    The provider is only pulled after the previous event has been handed to
+    the server, so a slow client slows generation down instead of piling up
+    chunks in memory. When the client disconnects, Django cancels this
+    generator; closing the provider stream stops the upstream work and the
+    partial reply is not saved.
+    """
+    chunks = []
+    try:
+        async with aclosing(provider.stream(history)) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield sse_event({"chunk": chunk})
+    except ProviderUnavailable as exc:
+        yield sse_event({"status": "error", "code": exc.default_code, "message": str(exc.detail)})
+        return
+    message = await ChatService.aadd_reply(conversation_id, "".join(chunks))
+    yield sse_event({"status": "done", "fullMessageId": f"msg_{message.id.hex}"})
+
+class MessageStreamView(AsyncAPIView):
+    async def post(self, request, conversation_id):
+        serializer = MessageCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        conversation = await aget_owned_conversation(request.user, conversation_id)
+        await ChatService.aadd_message(conversation.pk, Message.Role.USER, serializer.validated_data["content"])
+        history = await ChatService.ahistory(conversation.pk)
+        # Nothing touches the database again until the reply is complete
+        await ChatService.arelease_connection()
+
+        response = StreamingHttpResponse(relay_reply(conversation.pk, get_provider(), history), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx and similar proxies from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
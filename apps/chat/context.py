@@ -0,0 +1,107 @@
+"""
+Provider prompt assembly. The context for a turn is the newest run of
+messages that fits the token budget. Token counts are stored per message, so
+building it never re-tokenizes history, and the last window is cached so the
+next turn only reads the messages added since.
+"""
+from typing import Dict, List, Optional
+from uuid import UUID
+from django.conf import settings
+from django.core.cache import cache
+from .models import Message
+from .pagination import KeysetPagination
+from .providers import get_provider
+
+WINDOW_FIELDS = ("id", "role", "content", "token_count", "created_at")
+WINDOW_CACHE_TIMEOUT = 60 * 60
+
+def count_tokens(text: str) -> int:
+    return get_provider().count_tokens(text)
+
+class ContextBuilder:
+    # Rows fetched per query while walking back through history
+    chunk_size = 50
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget or settings.CHAT_CONTEXT_TOKENS
+
+    def cache_key(self, conversation_id: UUID) -> str:
+        return f"chat:context:{self.budget}:{conversation_id.hex}"
+
+    def build(self, conversation_id: UUID) -> List[Dict[str, str]]:
+        """Provider messages for the next turn, oldest first."""
+        key = self.cache_key(conversation_id)
+        window = cache.get(key)
+        if window:
+            newer = self._newer_than(conversation_id, window)
+            window = self._walk_back(conversation_id) if newer is None else self._trim(window + newer)
+        else:
+            window = self._walk_back(conversation_id)
+        if window:
+            cache.set(key, window, WINDOW_CACHE_TIMEOUT)
+        return [{"role": row["role"], "content": row["content"]} for row in window]
+
+    def _messages(self, conversation_id):
+        return Message.objects.filter(conversation_id=conversation_id).values(*WINDOW_FIELDS)
+
+    def _newer_than(self, conversation_id, window) -> Optional[List[dict]]:
+        """
+        Messages saved since the cached window, or None if there are too many
+        to append. Ids are uuid4, so (created_at, id) is not insertion order: a
+        message saved in the same clock tick as the window's last one can sort
+        before it. The read starts at that timestamp and skips the window's rows.
+        """
+        last_created_at = window[-1]["created_at"]
+        seen = [row["id"] for row in window if row["created_at"] == last_created_at]
+        rows = list(
+            self._messages(conversation_id)
+            .filter(created_at__gte=last_created_at)
+            .exclude(id__in=seen)
+            .order_by("created_at", "id")[:self.chunk_size + 1]
+        )
+        if len(rows) > self.chunk_size:
+            return None
+        return self._with_token_counts(rows)
+
+    def _walk_back(self, conversation_id) -> List[dict]:
+        """Newest-first, a chunk at a time, until the budget is full."""
+        ordering = ["-created_at", "-id"]
+        window, total = [], 0
+        queryset = self._messages(conversation_id).order_by(*ordering)
+        page = queryset
+        while True:
+            rows = self._with_token_counts(list(page[:self.chunk_size]))
+            for row in rows:
+                # The newest message always goes in, even if it alone is over budget
+                if window and total + row["token_count"] > self.budget:
+                    return window[::-1]
+                window.append(row)
+                total += row["token_count"]
+            if len(rows) < self.chunk_size:
+                return window[::-1]
+            last = rows[-1]
+            page = queryset.filter(KeysetPagination._seek(ordering, [last["created_at"], last["id"]]))
+
+    def _trim(self, window: List[dict]) -> List[dict]:
+        total = sum(row["token_count"] for row in window)
+        start = 0
+        while total > self.budget and start < len(window) - 1:
+            total -= window[start]["token_count"]
+            start += 1
+        return window[start:]
+
+    def _with_token_counts(self, rows: List[dict]) -> List[dict]:
+        """
+        Decompresses content and fills in counts for messages saved before
+        token_count existed, storing them.
+        """
+        for row in rows:
+            row["content"] = str(row["content"])
+        missing = [row for row in rows if row["token_count"] is None]
+        for row in missing:
+            row["token_count"] = count_tokens(row["content"])
+        if missing:
+            Message.objects.bulk_update(
+                [Message(id=row["id"], token_count=row["token_count"]) for row in missing], ["token_count"]
+            )
+        return rows
@@ -0,0 +1,11 @@
+import uuid
+
+class ConversationIdConverter:
+    """Public conversation ids are the UUID hex with a `conv_` prefix."""
+    regex = "conv_[0-9a-f]{32}"
+
+    def to_python(self, value):
+        return uuid.UUID(value.removeprefix("conv_"))
+
+    def to_url(self, value):
+        return f"conv_{value.hex}"
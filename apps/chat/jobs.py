@@ -0,0 +1,57 @@
+import asyncio
+from collections import defaultdict
+from uuid import UUID
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from apps.jobs.queue import enqueue, register
+from .models import DEFAULT_TITLE, Conversation, Message
+from .providers import get_provider
+from .purge import purge_conversation
+
+AUTO_TITLE = "chat.auto_title"
+PURGE_CONVERSATION = "chat.purge_conversation"
+
+@register(AUTO_TITLE, batch_size=20)
+def auto_title(payloads):
+    """
+    Titles conversations from their opening exchange. Conversations the user
+    renamed in the meantime keep their title.
+    """
+    ids = {UUID(payload["conversation_id"]) for payload in payloads}
+    untitled = set(Conversation.objects.filter(pk__in=ids, title=DEFAULT_TITLE).values_list("id", flat=True))
+    if not untitled:
+        return
+
+    opening = defaultdict(list)
+    rows = (
+        Message.objects.filter(conversation_id__in=untitled)
+        .annotate(position=Window(RowNumber(), partition_by=F("conversation_id"), order_by=[F("created_at").asc(), F("id").asc()]))
+        .filter(position__lte=2)
+        .order_by("conversation_id", "position")
+        .values_list("conversation_id", "role", "content")
+    )
+    for conversation_id, role, content in rows:
+        opening[conversation_id].append({"role": role, "content": str(content)})
+
+    provider = get_provider()
+    conversation_ids = list(opening)
+
+    async def generate():
+        return await asyncio.gather(*(provider.title(opening[conversation_id]) for conversation_id in conversation_ids))
+
+    for conversation_id, title in zip(conversation_ids, async_to_sync(generate)()):
+        # Title changes do not bump updated_at, so the sidebar order stays put
+        Conversation.objects.filter(pk=conversation_id, title=DEFAULT_TITLE).update(title=title)
+
+@register(PURGE_CONVERSATION)
+def purge_deleted_conversation(payloads):
+    """
+    Purges a deleted conversation in batches. A long history is spread over
+    several jobs, so other work gets the worker in between.
+    """
+    config = settings.CHAT_PURGE
+    for payload in payloads:
+        if not purge_conversation(UUID(payload["conversation_id"]), config["BATCH_SIZE"], config["MAX_BATCHES"]):
+            enqueue(PURGE_CONVERSATION, payload)
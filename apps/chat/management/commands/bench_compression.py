@@ -0,0 +1,99 @@
+import random
+import time
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.authentication.models import User
+from apps.chat.models import Conversation, Message
+from core.benchmarks import Recorder, test_database
+
+def code_reply(rng, lines):
+    """An assistant reply with a code block, roughly what a coding answer looks like."""
+    names = ["items", "result", "payload", "user", "session", "config", "value", "index", "response", "queue"]
+    body = []
+    for i in range(lines):
+        a, b = rng.choice(names), rng.choice(names)
+        body.append(f"    {a}_{i % 7} = process({b}, limit={rng.randint(1, 500)})  # handle {b} before {a}")
+    return "Here is how you can do it:\n\n```python\ndef handler(request):\n" + "\n".join(body) + "\n    return result\n```\n"
+
+class Command(BaseCommand):
+    help = (
+        "Reports the storage saved by compressing message bodies and the read-latency cost on "
+        "the message list endpoint, before and after running compress_messages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=400, help="Messages in the benchmark conversation.")
+        parser.add_argument("--code-lines", type=int, default=400, help="Lines in each assistant code block (~30 KB at 400).")
+        parser.add_argument("--size", type=int, default=50, help="Page size requested from the endpoint.")
+        parser.add_argument("--repeat", type=int, default=30, help="Requests per measurement.")
+
+    def handle(self, *args, **options):
+        with test_database():
+            user = User.objects.create_user(email="bench-compress@example.com", password="Bench-Password-2026!", full_name="Bench")
+            conversation = self._seed(user, options)
+            client = APIClient()
+            client.force_authenticate(user)
+            url = f"/api/v1/chat/conversations/conv_{conversation.id.hex}/messages?size={options['size']}"
+
+            recorder = Recorder()
+            plain_bytes = self._stored_bytes()
+            self._measure(recorder, "plain", client, url, options["repeat"])
+            out = StringIO()
+            call_command("compress_messages", stdout=out)
+            compressed_bytes = self._stored_bytes()
+            self._measure(recorder, "compressed", client, url, options["repeat"])
+            recorder.stop()
+
+        self.stdout.write(out.getvalue().strip())
+        self.stdout.write(
+            f"content column: {plain_bytes / 1024:.0f} KiB -> {compressed_bytes / 1024:.0f} KiB "
+            f"({100 * (plain_bytes - compressed_bytes) / plain_bytes:.1f}% smaller)"
+        )
+        summary = recorder.summary()
+        self.stdout.write(f"GET messages (size={options['size']}): {'p50 ms':>8}{'p95 ms':>8}")
+        for name in ("plain", "compressed"):
+            self.stdout.write(f"  {name:<26}{summary[name]['p50_ms']:>8.2f}{summary[name]['p95_ms']:>8.2f}")
+        cost = summary["compressed"]["p50_ms"] - summary["plain"]["p50_ms"]
+        self.stdout.write(f"read cost of decompression: {cost:+.2f} ms p50 per page")
+
+    def _seed(self, user, options):
+        rng = random.Random(2026)
+        conversation = Conversation.objects.create(user=user)
+        start = timezone.now() - timedelta(days=1)
+        messages = [
+            Message(
+                conversation=conversation,
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"Question {i}: how do I handle this case?" if i % 2 == 0 else code_reply(rng, options["code_lines"]),
+            )
+            for i in range(options["messages"])
+        ]
+        Message.objects.bulk_create(messages, batch_size=200)
+        for i, message in enumerate(messages):
+            message.created_at = start + timedelta(seconds=i)
+        Message.objects.bulk_update(messages, ["created_at"], batch_size=200)
+        # Rewrite the bodies as plain text, like rows saved before compression existed
+        table, pk = Message._meta.db_table, Message._meta.pk
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET content = %s WHERE id = %s",
+                [(str(message.content), pk.get_db_prep_value(message.pk, connection)) for message in messages],
+            )
+        return conversation
+
+    def _stored_bytes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT content FROM chat_message")
+            return sum(len(row[0].encode("utf-8")) for row in cursor.fetchall())
+
+    def _measure(self, recorder, name, client, url, repeat):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(url)
+            recorder.add(name, time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
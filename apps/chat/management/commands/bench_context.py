@@ -0,0 +1,91 @@
+import time
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from apps.authentication.models import User
+from apps.chat.context import ContextBuilder, count_tokens
+from apps.chat.models import Conversation, Message
+from apps.chat.services import ChatService
+from core.benchmarks import Recorder, test_database
+
+class Command(BaseCommand):
+    help = (
+        "Measures prompt build cost against conversation length: reloading and re-tokenizing the "
+        "whole thread versus the token-budgeted context builder, cold and incrementally warm."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lengths", default="100,1000,10000", help="Comma-separated message counts per conversation.")
+        parser.add_argument("--budget", type=int, default=4000, help="Context token budget.")
+        parser.add_argument("--words", type=int, default=60, help="Words per seeded message.")
+        parser.add_argument("--repeat", type=int, default=10, help="Builds per measurement.")
+
+    def handle(self, *args, **options):
+        try:
+            lengths = [int(value) for value in options["lengths"].split(",")]
+        except ValueError:
+            raise CommandError(f"Invalid --lengths value {options['lengths']!r}")
+
+        with test_database(), override_settings(CHAT_PROVIDER="apps.chat.providers.FakeProvider"):
+            user = User.objects.create_user(email="bench-context@example.com", password="Bench-Password-2026!", full_name="Bench")
+            recorder = Recorder()
+            for length in lengths:
+                conversation = self._seed(user, length, options["words"])
+                self._measure(recorder, conversation, length, options)
+            recorder.stop()
+
+        self.stdout.write(f"budget={options['budget']} tokens, {options['words']} words/message, repeat={options['repeat']}")
+        self.stdout.write(f"{'messages':>9}{'full reload ms':>16}{'cold ms':>10}{'warm ms':>10}{'cold q':>8}{'warm q':>8}")
+        summary = recorder.summary()
+        for length in lengths:
+            full, cold, warm = (summary[f"{name} {length}"] for name in ("full", "cold", "warm"))
+            self.stdout.write(
+                f"{length:>9}{full['p50_ms']:>16.2f}{cold['p50_ms']:>10.2f}{warm['p50_ms']:>10.2f}"
+                f"{cold['queries']:>8.1f}{warm['queries']:>8.1f}"
+            )
+
+    def _seed(self, user, length, words):
+        conversation = Conversation.objects.create(user=user)
+        start = timezone.now() - timedelta(days=30)
+        content = " ".join(f"word{i}" for i in range(words))
+        messages = [
+            Message(conversation=conversation, role="user" if i % 2 == 0 else "assistant", content=content, token_count=words)
+            for i in range(length)
+        ]
+        Message.objects.bulk_create(messages, batch_size=1000)
+        for i, message in enumerate(messages):
+            message.created_at = start + timedelta(seconds=i)
+        Message.objects.bulk_update(messages, ["created_at"], batch_size=1000)
+        return conversation
+
+    def _timed(self, recorder, name, func):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            recorder.add(name, time.perf_counter() - start, len(queries))
+
+    def _measure(self, recorder, conversation, length, options):
+        budget = options["budget"]
+
+        def full_reload():
+            # What a naive send does: every message, re-tokenized, then trimmed to the budget
+            rows = [
+                {"role": role, "content": str(content)}
+                for role, content in Message.objects.filter(conversation=conversation).order_by("created_at", "id").values_list("role", "content")
+            ]
+            total, start = 0, len(rows)
+            while start > 0 and total + count_tokens(rows[start - 1]["content"]) <= budget:
+                start -= 1
+                total += count_tokens(rows[start]["content"])
+            return rows[start:]
+
+        builder = ContextBuilder(budget=budget)
+        for _ in range(options["repeat"]):
+            self._timed(recorder, f"full {length}", full_reload)
+            cache.delete(builder.cache_key(conversation.pk))
+            self._timed(recorder, f"cold {length}", lambda: builder.build(conversation.pk))
+            ChatService.add_message(conversation.pk, "user", "one more turn")
+            self._timed(recorder, f"warm {length}", lambda: builder.build(conversation.pk))
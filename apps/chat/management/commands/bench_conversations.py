@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from apps.authentication.models import User
+from apps.chat.models import Conversation, Message
+from apps.chat.pagination import KeysetPagination
+from apps.chat.views import SIDEBAR_FIELDS
+from core.benchmarks import Recorder, test_database
+
+class Command(BaseCommand):
+    help = (
+        "Measures sidebar latency at increasing page depth: keyset pagination through the real "
+        "endpoint versus the OFFSET + COUNT(*) query a page-number paginator would issue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--conversations", type=int, default=10000, help="Conversations owned by the benchmark user.")
+        parser.add_argument("--size", type=int, default=20, help="Page size.")
+        parser.add_argument("--pages", default="1,10,100,250,500", help="Comma-separated page numbers to sample.")
+        parser.add_argument("--repeat", type=int, default=30, help="Requests per sampled page.")
+        parser.add_argument("--messages", type=int, default=2, help="Messages seeded per conversation (never read by the sidebar).")
+
+    def handle(self, *args, **options):
+        try:
+            pages = sorted({int(page) for page in options["pages"].split(",")})
+        except ValueError:
+            raise CommandError(f"Invalid --pages value {options['pages']!r}")
+        size = options["size"]
+        if pages[0] < 1 or pages[-1] * size > options["conversations"]:
+            raise CommandError(f"--pages must lie within 1..{options['conversations'] // size} for {options['conversations']} conversations")
+
+        with test_database():
+            user = self._seed(options["conversations"], options["messages"])
+            client = APIClient()
+            client.force_authenticate(user)
+            cursors = self._collect_cursors(client, size, pages[-1])
+
+            factory = APIRequestFactory()
+            recorder = Recorder()
+            paginator = KeysetPagination()
+            paginator.model = Conversation
+            queryset = Conversation.objects.filter(user=user).only(*SIDEBAR_FIELDS)
+            for page in pages:
+                url = f"/api/v1/chat/conversations?size={size}" + (f"&cursor={cursors[page]}" if cursors[page] else "")
+                for _ in range(options["repeat"]):
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        response = client.get(url)
+                        recorder.add(f"endpoint p{page}", time.perf_counter() - start, len(queries))
+                    if response.status_code != 200:
+                        raise CommandError(f"Page {page} returned {response.status_code}")
+
+                ordered = queryset.order_by(*KeysetPagination.ordering)
+                if cursors[page]:
+                    position = paginator.decode_cursor(Request(factory.get("/", {"cursor": cursors[page]})))["position"]
+                    ordered = ordered.filter(KeysetPagination._seek(KeysetPagination.ordering, position))
+                self._time(recorder, f"keyset p{page}", options["repeat"], lambda: list(ordered[:size + 1]))
+
+                offset = (page - 1) * size
+                page_query = queryset.order_by(*KeysetPagination.ordering)
+                self._time(recorder, f"offset p{page}", options["repeat"], lambda: (page_query.count(), list(page_query[offset:offset + size])))
+            recorder.stop()
+
+        self.stdout.write(f"conversations={options['conversations']} size={size} repeat={options['repeat']} vendor={connection.vendor}")
+        self.stdout.write("endpoint = full request through the sidebar view; keyset/offset = the page query alone (offset adds the COUNT)")
+        self.stdout.write(f"{'page':>6}{'endpoint p50':>14}{'endpoint p95':>14}{'keyset p50':>12}{'offset p50':>12}{'queries':>9}")
+        summary = recorder.summary()
+        for page in pages:
+            endpoint = summary[f"endpoint p{page}"]
+            self.stdout.write(
+                f"{page:>6}{endpoint['p50_ms']:>14.2f}{endpoint['p95_ms']:>14.2f}"
+                f"{summary[f'keyset p{page}']['p50_ms']:>12.2f}{summary[f'offset p{page}']['p50_ms']:>12.2f}{endpoint['queries']:>9.1f}"
+            )
+
+    def _time(self, recorder, name, repeat, query):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            recorder.add(name, time.perf_counter() - start)
+
+    def _seed(self, count, messages):
+        user = User.objects.create_user(email="bench-chat@example.com", password="Bench-Password-2026!", full_name="Bench")
+        start = timezone.now() - timedelta(days=365)
+        conversations = [
+            Conversation(user=user, title=f"Chat {i}", updated_at=start + timedelta(minutes=i))
+            for i in range(count)
+        ]
+        Conversation.objects.bulk_create(conversations, batch_size=1000)
+        # bulk_create applies auto_now; put the spread-out timestamps back
+        Conversation.objects.bulk_update(conversations, ["updated_at"], batch_size=1000)
+        Message.objects.bulk_create(
+            (
+                Message(conversation=conversation, role=Message.Role.USER, content="lorem ipsum " * 200)
+                for conversation in conversations
+                for _ in range(messages)
+            ),
+            batch_size=1000,
+        )
+        return user
+
+    def _collect_cursors(self, client, size, last_page):
+        """Walks the sidebar once, remembering the cursor that opens each page."""
+        cursors = {1: None}
+        url = f"/api/v1/chat/conversations?size={size}"
+        for page in range(2, last_page + 1):
+            url = client.get(url).data["next"]
+            cursors[page] = url.split("cursor=", 1)[1].split("&", 1)[0]
+        return cursors
@@ -0,0 +1,68 @@
+import asyncio
+import resource
+import time
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from apps.authentication.models import User
+from apps.chat.models import Conversation
+from core.benchmarks import Recorder, test_database
+
+class Command(BaseCommand):
+    help = (
+        "Opens many concurrent SSE reply streams in one process against the local fake "
+        "provider and reports time-to-first-chunk, stream duration and chunk throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--streams", type=int, default=1000, help="Concurrent streams.")
+        parser.add_argument("--tokens-per-second", type=float, default=20, help="Fake provider pacing per stream.")
+        parser.add_argument("--words", type=int, default=40, help="Words in each user message; the fake reply echoes them.")
+
+    def handle(self, *args, **options):
+        with test_database(), override_settings(
+            ROOT_URLCONF="config.async_urls",
+            CHAT_PROVIDER="apps.chat.providers.FakeProvider",
+            FAKE_PROVIDER_TOKENS_PER_SECOND=options["tokens_per_second"],
+        ):
+            user = User.objects.create_user(email="bench-stream@example.com", password="Bench-Password-2026!", full_name="Bench")
+            conversations = Conversation.objects.bulk_create(Conversation(user=user) for _ in range(options["streams"]))
+            login_client = Client()
+            login_client.force_login(user)
+            recorder, chunks = asyncio.run(self._run(login_client.cookies, conversations, options))
+
+        summary = recorder.summary()
+        elapsed = recorder.finished - recorder.started
+        self.stdout.write(
+            f"streams={options['streams']} tokens/s/stream={options['tokens_per_second']} words={options['words']} "
+            f"wall={elapsed:.2f}s chunks/s={chunks / elapsed:.0f} max_rss={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f}MiB"
+        )
+        self.stdout.write(f"{'metric':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name in ("first chunk", "stream"):
+            row = summary[name]
+            self.stdout.write(f"{name:<22}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+
+    async def _run(self, cookies, conversations, options):
+        recorder = Recorder()
+        content = " ".join(f"word{i}" for i in range(options["words"]))
+        totals = {"chunks": 0}
+
+        async def stream(conversation):
+            client = AsyncClient()
+            client.cookies = cookies
+            start = time.perf_counter()
+            response = await client.post(
+                f"/api/v1/chat/conversations/conv_{conversation.id.hex}/messages/stream",
+                {"content": content}, content_type="application/json",
+            )
+            first = None
+            async for chunk in response.streaming_content:
+                if first is None:
+                    first = time.perf_counter() - start
+                totals["chunks"] += 1
+            recorder.add("first chunk", first)
+            recorder.add("stream", time.perf_counter() - start)
+
+        await asyncio.gather(*(stream(conversation) for conversation in conversations))
+        recorder.stop()
+        return recorder, totals["chunks"]
@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.functions import Length
+from apps.chat.models import Message
+from core.fields import MARKER
+
+class Command(BaseCommand):
+    help = "Compresses existing message bodies above the field's size threshold, in batches, and reports the storage saved."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Messages rewritten per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Report the savings without writing.")
+
+    def handle(self, *args, **options):
+        field = Message._meta.get_field("content")
+        # A UTF-8 character is at most 4 bytes, so shorter rows can never reach the threshold
+        candidates = (
+            Message.objects.exclude(content__startswith=MARKER)
+            .annotate(length=Length("content"))
+            .filter(length__gte=field.min_length // 4)
+            .order_by("id")
+            .only("id", "content")
+        )
+        start = time.perf_counter()
+        scanned = compressed = before = after = 0
+        last_id = None
+        while True:
+            batch = list((candidates.filter(id__gt=last_id) if last_id else candidates)[:options["batch_size"]])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+            changed = []
+            for message in batch:
+                stored = field.get_prep_value(message.content)
+                if stored != message.content:
+                    changed.append(message)
+                    before += len(message.content.encode("utf-8"))
+                    after += len(stored)
+            if changed and not options["dry_run"]:
+                with transaction.atomic():
+                    Message.objects.bulk_update(changed, ["content"])
+            compressed += len(changed)
+
+        elapsed = time.perf_counter() - start
+        saved = 100 * (before - after) / before if before else 0.0
+        verb = "Would compress" if options["dry_run"] else "Compressed"
+        self.stdout.write(
+            f"{verb} {compressed} of {scanned} candidate messages: {before} -> {after} bytes "
+            f"({saved:.1f}% saved) in {elapsed:.2f}s"
+        )
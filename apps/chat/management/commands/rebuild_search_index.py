@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.chat import search
+from apps.chat.models import Message
+
+class Command(BaseCommand):
+    help = "Rebuilds the chat search index from Message rows, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Messages indexed per transaction.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        indexed = 0
+        last_id = None
+        queryset = Message.objects.order_by("id").only("id", "conversation_id", "content")
+        while True:
+            batch = list((queryset.filter(id__gt=last_id) if last_id else queryset)[:options["batch_size"]])
+            if not batch:
+                break
+            # Replace each batch's documents in place rather than clearing the
+            # table first, so search keeps working during the rebuild.
+            with transaction.atomic():
+                search.reindex_messages(batch)
+            indexed += len(batch)
+            last_id = batch[-1].id
+        removed = search.remove_orphans(options["batch_size"])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"Indexed {indexed} messages and removed {removed} stale documents in {elapsed:.2f}s")
@@ -0,0 +1,59 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from apps.chat.models import Conversation, Message, message_preview
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes each conversation's message count and last-message preview from its messages, "
+        "in batches. Run after bulk imports, or if the denormalized summary ever drifts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Conversations recomputed per transaction.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        scanned = repaired = 0
+        last_id = None
+        queryset = Conversation.objects.order_by("id").values_list("id", flat=True)
+        while True:
+            ids = list((queryset.filter(id__gt=last_id) if last_id else queryset)[:options["batch_size"]])
+            if not ids:
+                break
+            last_id = ids[-1]
+            scanned += len(ids)
+            with transaction.atomic():
+                repaired += self._repair(ids)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"Repaired {repaired} of {scanned} conversations in {elapsed:.2f}s")
+
+    def _repair(self, ids):
+        # Locking the rows makes concurrent message writes wait, so their increment lands
+        # on top of the recomputed count instead of being overwritten by it
+        conversations = list(
+            Conversation.objects.select_for_update().filter(pk__in=ids).only("id", "message_count", "last_message_preview")
+        )
+        counts = dict(
+            Message.objects.filter(conversation_id__in=ids).order_by()
+            .values("conversation_id").annotate(count=Count("id")).values_list("conversation_id", "count")
+        )
+        # The newest message per conversation, in one windowed query
+        latest = dict(
+            Message.objects.filter(conversation_id__in=ids)
+            .annotate(position=Window(RowNumber(), partition_by=F("conversation_id"), order_by=[F("created_at").desc(), F("id").desc()]))
+            .filter(position=1)
+            .values_list("conversation_id", "content")
+        )
+        changed = []
+        for conversation in conversations:
+            count = counts.get(conversation.id, 0)
+            preview = message_preview(str(latest[conversation.id])) if conversation.id in latest else ""
+            if (conversation.message_count, conversation.last_message_preview) != (count, preview):
+                conversation.message_count, conversation.last_message_preview = count, preview
+                changed.append(conversation)
+        # bulk_update leaves updated_at alone, so the sidebar order is unchanged
+        Conversation.objects.bulk_update(changed, ["message_count", "last_message_preview"])
+        return len(changed)
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Side table holding the search documents; see apps/chat/search.py
+CREATE_SQL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE chat_message_search USING fts5("
+        "document, message_id UNINDEXED, conversation_id UNINDEXED, tokenize='unicode61 remove_diacritics 2')",
+    ],
+    "postgresql": [
+        "CREATE TABLE chat_message_search ("
+        "message_id uuid PRIMARY KEY, conversation_id uuid NOT NULL, document tsvector NOT NULL)",
+        "CREATE INDEX chat_message_search_document_idx ON chat_message_search USING GIN (document)",
+        "CREATE INDEX chat_message_search_conversation_idx ON chat_message_search (conversation_id)",
+    ],
+}
+
+
+def create_search_table(apps, schema_editor):
+    for sql in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        schema_editor.execute("DROP TABLE IF EXISTS chat_message_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0002_message_token_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:51
+
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0003_message_search"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="message",
+            name="content",
+            field=core.fields.CompressedTextField(),
+        ),
+    ]
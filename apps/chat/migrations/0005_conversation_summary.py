@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0004_message_content_compressed"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="conversation",
+            name="chat_conv_sidebar_idx",
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="last_message_preview",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="message_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="conversation",
+            index=models.Index(
+                fields=[
+                    "user",
+                    "-updated_at",
+                    "-id",
+                    "title",
+                    "created_at",
+                    "message_count",
+                    "last_message_preview",
+                ],
+                name="chat_conv_sidebar_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0005_conversation_summary"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="conversation",
+            name="chat_conv_sidebar_idx",
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="conversation",
+            index=models.Index(
+                fields=[
+                    "user",
+                    "-updated_at",
+                    "-id",
+                    "title",
+                    "created_at",
+                    "message_count",
+                    "last_message_preview",
+                    "deleted_at",
+                ],
+                name="chat_conv_sidebar_idx",
+            ),
+        ),
+    ]
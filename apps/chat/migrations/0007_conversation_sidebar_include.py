@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0006_conversation_soft_delete"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="conversation",
+            name="chat_conv_sidebar_idx",
+        ),
+        migrations.AddIndex(
+            model_name="conversation",
+            index=models.Index(
+                fields=["user", "-updated_at", "-id"],
+                include=(
+                    "title",
+                    "created_at",
+                    "message_count",
+                    "last_message_preview",
+                    "deleted_at",
+                ),
+                name="chat_conv_sidebar_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+ROWID_MASK = (1 << 63) - 1
+
+
+def key_rows_on_message_id(apps, schema_editor):
+    # SQLite only: FTS5 rows get their rowid from the message UUID (see
+    # apps/chat/search.py), so removals no longer scan the table
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT rowid, message_id FROM chat_message_search")
+        rows = cursor.fetchall()
+        cursor.executemany(
+            "UPDATE chat_message_search SET rowid = %s WHERE rowid = %s",
+            [(int(message_id, 16) & ROWID_MASK, rowid) for rowid, message_id in rows],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0007_conversation_sidebar_include"),
+    ]
+
+    operations = [
+        migrations.RunPython(key_rows_on_message_id, migrations.RunPython.noop),
+    ]
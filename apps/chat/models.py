@@ -0,0 +1,78 @@
+import uuid
+from django.db import models
+from django.conf import settings
+from core.fields import CompressedTextField
+
+DEFAULT_TITLE = "New Chat"
+PREVIEW_LENGTH = 120
+
+def message_preview(content: str) -> str:
+    """The sidebar preview of a message: whitespace collapsed, cut to PREVIEW_LENGTH."""
+    text = " ".join(content.split())
+    if len(text) > PREVIEW_LENGTH:
+        text = text[:PREVIEW_LENGTH - 1].rstrip() + "…"
+    return text
+
+class ConversationManager(models.Manager):
+    """Hides deleted conversations; their purge is pending (see purge.py)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+class Conversation(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Covered by the sidebar index below, which leads with user
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="conversations", db_index=False)
+    title = models.CharField(max_length=100, default=DEFAULT_TITLE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized summary, kept current in the message-write transaction (ChatService)
+    # and recomputed by `manage.py repair_conversation_summaries`
+    message_count = models.PositiveIntegerField(default=0)
+    last_message_preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True, default="")
+    # Set by DELETE; the row and its messages are removed later by the purge job
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ConversationManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Sidebar: seek on (user, updated_at, id). On PostgreSQL the rest of the row is
+            # carried as non-key INCLUDE columns, so listing never visits the table (or the
+            # message rows) while the key, and every comparison on it, stays three columns
+            # wide; SQLite ignores include. deleted_at is carried rather than used as a
+            # partial-index condition, so the index still finds all of a user's rows when
+            # the account is deleted.
+            models.Index(
+                fields=["user", "-updated_at", "-id"],
+                include=["title", "created_at", "message_count", "last_message_preview", "deleted_at"],
+                name="chat_conv_sidebar_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.title}"
+
+class Message(models.Model):
+    class Role(models.TextChoices):
+        USER = "user"
+        ASSISTANT = "assistant"
+        SYSTEM = "system"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="messages", db_index=False)
+    role = models.CharField(max_length=16, choices=Role.choices)
+    # Bodies of 1 KB and more are stored zlib-compressed; see core/fields.py
+    content = CompressedTextField(min_length=1024)
+    # Provider tokens in `content`; filled on save, or lazily by the context builder
+    token_count = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["conversation", "created_at", "id"], name="chat_msg_timeline_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.conversation_id} - {self.role}"
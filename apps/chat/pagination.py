@@ -0,0 +1,141 @@
+"""
+Keyset ("seek") pagination. Each page is a single index range scan starting
+right after the cursor row, so deep pages cost the same as the first one and
+no COUNT(*) is ever issued.
+"""
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+class KeysetPagination(BasePagination):
+    # Unique in combination; the last field must be unique on its own (the pk)
+    ordering = ("-updated_at", "-id")
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    # Without a cursor, serve the last page of `ordering` instead of the first
+    start_from_end = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor["reverse"] if cursor is not None else self.start_from_end
+
+        ordering = [self._flip(order) for order in self.ordering] if reverse else list(self.ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._seek(ordering, cursor["position"]))
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        del rows[self.page_size:]
+        if reverse:
+            rows.reverse()
+
+        # Walking backwards, there is more before the page if we over-fetched and
+        # more after it if we came from a cursor; forwards it is the mirror image.
+        more_before, more_after = (has_more, cursor is not None) if reverse else (cursor is not None, has_more)
+        self.next_position = self._position(rows[-1]) if rows and more_after else None
+        self.previous_position = self._position(rows[0]) if rows and more_before else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_next_link(self):
+        return self._link(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        return self._link(self.previous_position, reverse=True)
+
+    def get_next_cursor(self):
+        return self.encode_cursor(self.next_position, reverse=False) if self.next_position is not None else None
+
+    def get_previous_cursor(self):
+        return self.encode_cursor(self.previous_position, reverse=True) if self.previous_position is not None else None
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, position, reverse):
+        payload = {"p": position, "r": 1} if reverse else {"p": position}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values = payload["p"]
+            if len(values) != len(self.ordering):
+                raise ValueError(encoded)
+            position = [
+                self.model._meta.get_field(order.lstrip("-")).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+            if None in position:
+                raise ValueError(encoded)
+            return {"position": position, "reverse": bool(payload.get("r"))}
+        except (ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position(self, row):
+        return [self.model._meta.get_field(order.lstrip("-")).value_to_string(row) for order in self.ordering]
+
+    def _link(self, position, reverse):
+        if position is None:
+            return None
+        return replace_query_param(self.request.get_full_path(), self.cursor_query_param, self.encode_cursor(position, reverse))
+
+    @staticmethod
+    def _flip(order):
+        return order[1:] if order.startswith("-") else f"-{order}"
+
+    @staticmethod
+    def _seek(ordering, position):
+        """
+        Rows strictly after `position` in `ordering`:
+        a < x OR (a = x AND b < y) ..., plus a bound on the leading column
+        so the planner can turn it into an index range.
+        """
+        condition = Q()
+        equal = Q()
+        for order, value in zip(ordering, position):
+            name = order.lstrip("-")
+            condition |= equal & Q(**{f"{name}__{'lt' if order.startswith('-') else 'gt'}": value})
+            equal &= Q(**{name: value})
+        leading = ordering[0].lstrip("-")
+        bound = Q(**{f"{leading}__{'lte' if ordering[0].startswith('-') else 'gte'}": position[0]})
+        return bound & condition
+
+class MessagePagination(KeysetPagination):
+    """
+    Chat window history, oldest to newest. The first page is the latest
+    messages; `previousCursor` scrolls up to older ones.
+    """
+    ordering = ("created_at", "id")
+    page_size = 50
+    start_from_end = True
+
+    def get_paginated_response(self, data):
+        return Response({
+            "nextCursor": self.get_next_cursor(),
+            "previousCursor": self.get_previous_cursor(),
+            "results": data,
+        })
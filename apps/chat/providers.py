@@ -0,0 +1,86 @@
+"""
+LLM providers. A provider turns the conversation history into a stream of
+reply text chunks; the chat views never talk to a model SDK directly.
+"""
+import asyncio
+import math
+import re
+from contextlib import aclosing
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import APIException
+
+TITLE_PROMPT = "Summarize this conversation in 3-5 words. Reply with the title only."
+
+class ProviderUnavailable(APIException):
+    status_code = 503
+    default_detail = "The AI provider is unavailable. Please retry shortly."
+    default_code = "SERVICE_UNAVAILABLE"
+
+class BaseProvider:
+    """
+    Interface for LLM backends. `messages` is the history as
+    [{"role": ..., "content": ...}], oldest first. Implementations raise
+    ProviderUnavailable when the upstream model cannot be reached.
+    """
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """
+        Yields reply chunks. The caller may stop iterating at any time (client
+        disconnect); the generator is then closed and must stop upstream work.
+        """
+        raise NotImplementedError("subclasses of BaseProvider must provide a stream() method")
+        yield
+
+    def count_tokens(self, text: str) -> int:
+        """Approximate prompt tokens in `text` (about four characters per token)."""
+        return max(1, math.ceil(len(text) / 4))
+
+    async def complete(self, messages: List[Dict[str, str]]) -> str:
+        """Returns the whole reply."""
+        async with aclosing(self.stream(messages)) as chunks:
+            return "".join([chunk async for chunk in chunks])
+
+    async def title(self, messages: List[Dict[str, str]]) -> str:
+        """A 3-5 word title for a conversation, given its opening messages."""
+        reply = await self.complete([*messages, {"role": "system", "content": TITLE_PROMPT}])
+        return reply.strip().strip('"')[:100]
+
+class FakeProvider(BaseProvider):
+    """
+    Deterministic local provider for development, tests and load tests: echoes
+    the last user message back one word at a time, pacing tokens at
+    settings.FAKE_PROVIDER_TOKENS_PER_SECOND (0 = as fast as possible).
+    """
+
+    @property
+    def tokens_per_second(self) -> float:
+        return settings.FAKE_PROVIDER_TOKENS_PER_SECOND
+
+    def reply(self, messages: List[Dict[str, str]]) -> str:
+        last = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        return f"You said: {last}"
+
+    def count_tokens(self, text):
+        # One token per word, matching what stream() emits
+        return max(1, len(text.split()))
+
+    async def title(self, messages):
+        first = next((m["content"] for m in messages if m["role"] == "user"), "")
+        return " ".join(first.split()[:5])[:100] or "New Chat"
+
+    async def stream(self, messages):
+        delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for token in re.findall(r"\s*\S+", self.reply(messages)):
+            await asyncio.sleep(delay)
+            yield token
+
+@lru_cache(maxsize=None)
+def _load_provider(path: str) -> BaseProvider:
+    return import_string(path)()
+
+def get_provider() -> BaseProvider:
+    """Returns the provider configured by settings.CHAT_PROVIDER."""
+    return _load_provider(settings.CHAT_PROVIDER)
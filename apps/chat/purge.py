@@ -0,0 +1,46 @@
+"""
+Deleting conversations without long transactions.
+
+DELETE only marks a conversation deleted (hidden by Conversation.objects)
+and queues a purge job. The job removes its messages and their search
+documents a bounded batch at a time, each batch in its own short
+transaction, and the conversation row last. Account deletion
+(AuthService.delete_account) soft-deletes every conversation of the user
+the same way and removes the user once they are all purged.
+"""
+from typing import Optional, Tuple
+from uuid import UUID
+from django.db import transaction
+from . import search
+from .models import Conversation, Message
+
+def purge_messages(conversation_id: UUID, batch_size: int, max_batches: Optional[int] = None) -> Tuple[int, bool]:
+    """
+    Deletes a conversation's messages, oldest first, batch_size per transaction.
+    Returns (messages deleted, whether none are left).
+    """
+    deleted = batches = 0
+    queryset = Message.objects.filter(conversation_id=conversation_id).order_by("created_at", "id").values_list("id", flat=True)
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            ids = list(queryset[:batch_size])
+            if not ids:
+                return deleted, True
+            search.remove_messages(ids)
+            Message.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+        batches += 1
+    return deleted, False
+
+def purge_conversation(conversation_id: UUID, batch_size: int, max_batches: Optional[int] = None) -> bool:
+    """
+    Purges a deleted conversation: its messages in batches, then the row.
+    Returns False when max_batches ran out first. Conversations that are not
+    marked deleted are left alone.
+    """
+    if not Conversation.all_objects.filter(pk=conversation_id, deleted_at__isnull=False).exists():
+        return True
+    _, finished = purge_messages(conversation_id, batch_size, max_batches)
+    if finished:
+        Conversation.all_objects.filter(pk=conversation_id).delete()
+    return finished
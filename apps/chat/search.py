@@ -0,0 +1,180 @@
+"""
+Full-text search over message content.
+
+The search documents live in a side table created by migration 0003:
+an FTS5 virtual table on SQLite (local and tests) and a tsvector column with
+a GIN index on PostgreSQL. Documents are written from the plain text when a
+message is saved, so the index stays incremental whatever Message.content
+looks like on disk; `manage.py rebuild_search_index` rewrites it in bulk
+while searches keep running.
+"""
+import re
+from typing import Iterable, List, Tuple
+from uuid import UUID
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from .models import Message
+
+TABLE = "chat_message_search"
+ROWID_MASK = (1 << 63) - 1
+
+def search_terms(query: str) -> List[str]:
+    """Words in the query; every one of them must match. Search syntax is not passed through."""
+    return re.findall(r"\w+", query.lower())
+
+def _uuid(value: UUID):
+    return Message._meta.pk.get_db_prep_value(value, connection)
+
+def _rowid(message_id: UUID) -> int:
+    return message_id.int & ROWID_MASK
+
+def _placeholders(values: list) -> str:
+    return ", ".join(["%s"] * len(values))
+
+class SQLiteSearchBackend:
+    """
+    FTS5 table: (document, message_id UNINDEXED, conversation_id UNINDEXED),
+    ranked by bm25. UNINDEXED columns can only be scanned, so each row's rowid
+    is 63 bits of its message's UUID and lookups by message go through it.
+    """
+    key = "rowid"
+
+    def add(self, rows: Iterable[Tuple[UUID, UUID, str]]) -> None:
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, message_id, conversation_id, document) VALUES (%s, %s, %s, %s)",
+                [
+                    (_rowid(message_id), _uuid(message_id), _uuid(conversation_id), content)
+                    for message_id, conversation_id, content in rows
+                ],
+            )
+
+    def remove(self, message_ids: List[UUID]) -> None:
+        # The message_id condition only filters the rowid hits, in case two ids share 63 bits
+        rowids = [_rowid(message_id) for message_id in message_ids]
+        ids = [_uuid(message_id) for message_id in message_ids]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN ({_placeholders(rowids)}) AND message_id IN ({_placeholders(ids)})",
+                rowids + ids,
+            )
+
+    def search(self, user_id: int, terms: List[str], limit: int) -> List[UUID]:
+        match = " ".join(f'"{term}"' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {TABLE}.message_id FROM {TABLE} "
+                f"JOIN chat_conversation c ON c.id = {TABLE}.conversation_id "
+                f"WHERE {TABLE} MATCH %s AND c.user_id = %s AND c.deleted_at IS NULL "
+                f"ORDER BY bm25({TABLE}) LIMIT %s",
+                [match, user_id, limit],
+            )
+            return [UUID(row[0]) for row in cursor.fetchall()]
+
+class PostgresSearchBackend:
+    """Table of tsvector documents with a GIN index, ranked by ts_rank."""
+    key = "message_id"
+
+    def add(self, rows: Iterable[Tuple[UUID, UUID, str]]) -> None:
+        config = settings.CHAT_SEARCH_CONFIG
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (message_id, conversation_id, document) VALUES (%s, %s, to_tsvector(%s::regconfig, %s)) "
+                f"ON CONFLICT (message_id) DO UPDATE SET document = EXCLUDED.document",
+                [(_uuid(message_id), _uuid(conversation_id), config, content) for message_id, conversation_id, content in rows],
+            )
+
+    def search(self, user_id: int, terms: List[str], limit: int) -> List[UUID]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT s.message_id FROM {TABLE} s "
+                f"JOIN chat_conversation c ON c.id = s.conversation_id "
+                f"CROSS JOIN plainto_tsquery(%s::regconfig, %s) q "
+                f"WHERE s.document @@ q AND c.user_id = %s AND c.deleted_at IS NULL "
+                f"ORDER BY ts_rank(s.document, q) DESC LIMIT %s",
+                [settings.CHAT_SEARCH_CONFIG, " ".join(terms), user_id, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def remove(self, message_ids: List[UUID]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE message_id IN ({_placeholders(message_ids)})",
+                [_uuid(message_id) for message_id in message_ids],
+            )
+
+BACKENDS = {"sqlite": SQLiteSearchBackend, "postgresql": PostgresSearchBackend}
+
+def get_backend():
+    if connection.vendor not in BACKENDS:
+        raise ImproperlyConfigured(f"Chat search does not support the {connection.vendor!r} database backend")
+    return BACKENDS[connection.vendor]()
+
+def index_messages(messages: Iterable[Message]) -> None:
+    """Adds search documents for freshly saved messages."""
+    rows = [(message.pk, message.conversation_id, message.content) for message in messages]
+    if rows:
+        get_backend().add(rows)
+
+def remove_messages(message_ids: List[UUID]) -> None:
+    """Removes the documents of messages about to be deleted (one purge batch)."""
+    if message_ids:
+        get_backend().remove(message_ids)
+
+def reindex_messages(messages: List[Message]) -> None:
+    """
+    Replaces the documents of `messages`. Run it in one transaction so search
+    never sees a message missing, and a message indexed concurrently by its own
+    save still ends up with exactly one document.
+    """
+    if messages:
+        remove_messages([message.pk for message in messages])
+        index_messages(messages)
+
+def remove_orphans(batch_size: int = 1000) -> int:
+    """
+    Removes documents whose message no longer exists. Walks the table in key
+    order, batch_size documents per transaction, probing the message primary
+    key for each. Returns how many were removed.
+    """
+    key = get_backend().key
+    messages = connection.ops.quote_name(Message._meta.db_table)
+    removed, last = 0, None
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            after = f"WHERE {key} > %s " if last is not None else ""
+            cursor.execute(
+                f"SELECT {key} FROM {TABLE} {after}ORDER BY {key} LIMIT %s",
+                ([last] if last is not None else []) + [batch_size],
+            )
+            keys = [row[0] for row in cursor.fetchall()]
+            if not keys:
+                return removed
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE {key} IN ({_placeholders(keys)}) "
+                f"AND NOT EXISTS (SELECT 1 FROM {messages} m WHERE m.id = {TABLE}.message_id)",
+                keys,
+            )
+            removed += cursor.rowcount
+        last = keys[-1]
+
+def search_messages(user_id: int, query: str, limit: int) -> List[Message]:
+    """The user's best-matching messages, best first."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    ids = get_backend().search(user_id, terms, limit)
+    messages = Message.objects.filter(pk__in=ids).select_related("conversation").only(
+        "id", "role", "content", "created_at", "conversation__id", "conversation__title"
+    ).in_bulk()
+    # Skip hits whose message was deleted after it was indexed
+    return [messages[message_id] for message_id in ids if message_id in messages]
+
+def snippet(content: str, terms: List[str], width: int = 80) -> str:
+    """About `width` characters of `content` around the first matching term."""
+    lowered = content.lower()
+    positions = [position for position in (lowered.find(term) for term in terms) if position >= 0]
+    start = max(min(positions, default=0) - width // 4, 0)
+    text = content[start:start + width].strip()
+    return ("…" if start else "") + text + ("…" if start + width < len(content) else "")
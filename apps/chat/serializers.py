@@ -0,0 +1,67 @@
+from rest_framework import serializers
+from core.timing import TimedSerializerMixin
+from .models import Conversation, Message
+from .search import search_terms, snippet
+
+class ConversationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    id = serializers.SerializerMethodField()
+    createdAt = serializers.DateTimeField(source="created_at", read_only=True)
+    updatedAt = serializers.DateTimeField(source="updated_at", read_only=True)
+    messageCount = serializers.IntegerField(source="message_count", read_only=True)
+    lastMessagePreview = serializers.CharField(source="last_message_preview", read_only=True)
+
+    class Meta:
+        model = Conversation
+        fields = ["id", "title", "createdAt", "updatedAt", "messageCount", "lastMessagePreview"]
+
+    def get_id(self, obj):
+        return f"conv_{obj.id.hex}"
+
+class ConversationTitleSerializer(ConversationSerializer):
+    title = serializers.CharField(max_length=100)
+
+    class Meta(ConversationSerializer.Meta):
+        fields = ["id", "title", "updatedAt"]
+
+class MessageSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    id = serializers.SerializerMethodField()
+    createdAt = serializers.DateTimeField(source="created_at", read_only=True)
+
+    class Meta:
+        model = Message
+        fields = ["id", "role", "content", "createdAt"]
+
+    def get_id(self, obj):
+        return f"msg_{obj.id.hex}"
+
+class MessageCreateSerializer(TimedSerializerMixin, serializers.Serializer):
+    content = serializers.CharField()
+
+class SearchQuerySerializer(TimedSerializerMixin, serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    size = serializers.IntegerField(min_value=1, max_value=50, default=20)
+
+    def validate_q(self, value):
+        if not search_terms(value):
+            raise serializers.ValidationError("Enter at least one word to search for.")
+        return value
+
+class SearchResultSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    messageId = serializers.SerializerMethodField()
+    conversationId = serializers.SerializerMethodField()
+    conversationTitle = serializers.CharField(source="conversation.title", read_only=True)
+    snippet = serializers.SerializerMethodField()
+    createdAt = serializers.DateTimeField(source="created_at", read_only=True)
+
+    class Meta:
+        model = Message
+        fields = ["messageId", "conversationId", "conversationTitle", "role", "snippet", "createdAt"]
+
+    def get_messageId(self, obj):
+        return f"msg_{obj.id.hex}"
+
+    def get_conversationId(self, obj):
+        return f"conv_{obj.conversation_id.hex}"
+
+    def get_snippet(self, obj):
+        return snippet(obj.content, self.context["terms"])
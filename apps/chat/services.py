@@ -0,0 +1,115 @@
+from typing import Dict, List
+from uuid import UUID
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.jobs.queue import enqueue, enqueue_many
+from . import search
+from .context import ContextBuilder, count_tokens
+from .jobs import AUTO_TITLE, PURGE_CONVERSATION
+from .models import Conversation, Message, message_preview
+from .providers import BaseProvider
+
+def release_connection() -> None:
+    """
+    Gives this thread's database connection back (to the pool, or closes it)
+    before a long wait on the provider. Django reconnects on the next query.
+    Inside a transaction (ATOMIC_REQUESTS, tests) the connection is kept.
+    """
+    if not connection.in_atomic_block:
+        connection.close()
+
+def record_message(message: Message) -> None:
+    """
+    Bumps updated_at and the denormalized summary of the message's conversation.
+    Call inside the transaction that saved the message; the count is an
+    in-database increment, so concurrent writes do not lose updates.
+    """
+    Conversation.objects.filter(pk=message.conversation_id).update(
+        updated_at=message.created_at,
+        message_count=F("message_count") + 1,
+        last_message_preview=message_preview(message.content),
+    )
+    search.index_messages([message])
+
+class ChatService:
+    @staticmethod
+    def add_message(conversation_id: UUID, role: str, content: str) -> Message:
+        """Saves a message and updates its conversation's updated_at and summary in one transaction."""
+        with transaction.atomic():
+            message = Message.objects.create(conversation_id=conversation_id, role=role, content=content, token_count=count_tokens(content))
+            record_message(message)
+        return message
+
+    @staticmethod
+    def add_reply(conversation_id: UUID, content: str) -> Message:
+        """
+        Saves an assistant message like add_message. The first reply in a
+        conversation also queues auto-titling, committed in the same transaction.
+        """
+        with transaction.atomic():
+            first_reply = not Message.objects.filter(conversation_id=conversation_id, role=Message.Role.ASSISTANT).exists()
+            message = Message.objects.create(
+                conversation_id=conversation_id, role=Message.Role.ASSISTANT, content=content, token_count=count_tokens(content)
+            )
+            record_message(message)
+            if first_reply:
+                enqueue(AUTO_TITLE, {"conversation_id": str(conversation_id)})
+        return message
+
+    @staticmethod
+    def delete_conversation(conversation: Conversation) -> None:
+        """
+        Hides the conversation at once and queues the purge of its messages,
+        search documents and row (see purge.py), in one short transaction.
+        """
+        with transaction.atomic():
+            Conversation.objects.filter(pk=conversation.pk).update(deleted_at=timezone.now())
+            enqueue(PURGE_CONVERSATION, {"conversation_id": str(conversation.pk)})
+
+    @staticmethod
+    def delete_user_conversations(user_id: int) -> None:
+        """
+        delete_conversation() for every conversation of the user: one UPDATE and
+        one bulk INSERT of purge jobs, however many conversations there are.
+        """
+        with transaction.atomic():
+            ids = list(Conversation.objects.filter(user_id=user_id).values_list("id", flat=True))
+            Conversation.objects.filter(pk__in=ids).update(deleted_at=timezone.now())
+            enqueue_many(PURGE_CONVERSATION, [{"conversation_id": str(conversation_id)} for conversation_id in ids])
+
+    @staticmethod
+    def history(conversation_id: UUID) -> List[Dict[str, str]]:
+        """Provider input for the next turn: the newest messages within the token budget, oldest first."""
+        return ContextBuilder().build(conversation_id)
+
+    @staticmethod
+    def send_message(conversation_id: UUID, content: str, provider: BaseProvider) -> Message:
+        """
+        Blocking send: commits the user message, releases the connection while
+        the provider answers, then saves the reply and bumps updated_at in one
+        short transaction. Returns the assistant message.
+        """
+        ChatService.add_message(conversation_id, Message.Role.USER, content)
+        history = ChatService.history(conversation_id)
+        release_connection()
+        reply = async_to_sync(provider.complete)(history)
+        return ChatService.add_reply(conversation_id, reply)
+
+    @staticmethod
+    async def aadd_message(conversation_id: UUID, role: str, content: str) -> Message:
+        return await sync_to_async(ChatService.add_message)(conversation_id, role, content)
+
+    @staticmethod
+    async def aadd_reply(conversation_id: UUID, content: str) -> Message:
+        return await sync_to_async(ChatService.add_reply)(conversation_id, content)
+
+    @staticmethod
+    async def ahistory(conversation_id: UUID) -> List[Dict[str, str]]:
+        return await sync_to_async(ChatService.history)(conversation_id)
+
+    @staticmethod
+    async def arelease_connection() -> None:
+        # Runs on the request's sync thread, which owns the connection
+        await sync_to_async(release_connection)()
@@ -0,0 +1,1043 @@
+import asyncio
+import json
+import threading
+import unittest
+import uuid
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from unittest import mock
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.admin.utils import NestedObjects
+from apps.authentication.models import User
+from apps.authentication.services import AuthService
+from apps.jobs import queue
+from apps.jobs.models import Job
+from .async_views import relay_reply
+from .context import ContextBuilder
+from .jobs import PURGE_CONVERSATION
+from .models import Conversation, Message
+from .providers import BaseProvider, FakeProvider, ProviderUnavailable
+from . import search, services
+from .services import ChatService
+from core.fields import MARKER, CompressedText
+
+def create_conversations(user, count, start=None):
+    """Bulk-creates `count` conversations, one minute apart, newest last."""
+    start = start or timezone.now() - timedelta(days=30)
+    conversations = Conversation.objects.bulk_create(
+        Conversation(user=user, title=f"Chat {i}") for i in range(count)
+    )
+    for i, conversation in enumerate(conversations):
+        conversation.updated_at = start + timedelta(minutes=i)
+    Conversation.objects.bulk_update(conversations, ["updated_at"])
+    return conversations
+
+class ConversationListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _walk(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        return seen
+
+    def test_pages_cover_every_conversation_newest_first(self):
+        conversations = create_conversations(self.user, 45)
+        create_conversations(User.objects.create_user(email="other@example.com", password="x"), 5)
+
+        seen = self._walk("/api/v1/chat/conversations?size=20")
+
+        expected = [f"conv_{c.id.hex}" for c in sorted(conversations, key=lambda c: c.updated_at, reverse=True)]
+        self.assertEqual(seen, expected)
+
+    def test_ties_on_updated_at_are_broken_by_id(self):
+        conversations = create_conversations(self.user, 7)
+        Conversation.objects.filter(user=self.user).update(updated_at=timezone.now())
+
+        seen = self._walk("/api/v1/chat/conversations?size=3")
+
+        self.assertEqual(sorted(seen), sorted(f"conv_{c.id.hex}" for c in conversations))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_previous_link_returns_the_prior_page(self):
+        create_conversations(self.user, 10)
+        first = self.client.get("/api/v1/chat/conversations?size=4").data
+        self.assertIsNone(first["previous"])
+        second = self.client.get(first["next"]).data
+
+        back = self.client.get(second["previous"]).data
+
+        self.assertEqual(back["results"], first["results"])
+        self.assertEqual(back["next"], first["next"])
+
+    def test_response_shape_has_no_count(self):
+        conversation = create_conversations(self.user, 1)[0]
+
+        response = self.client.get("/api/v1/chat/conversations")
+
+        self.assertEqual(set(response.data), {"next", "previous", "results"})
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(response.data["results"][0]["id"], f"conv_{conversation.id.hex}")
+        self.assertEqual(
+            set(response.data["results"][0]), {"id", "title", "createdAt", "updatedAt", "messageCount", "lastMessagePreview"}
+        )
+
+    def test_listing_is_one_query_that_never_reads_messages(self):
+        conversations = create_conversations(self.user, 30)
+        Message.objects.create(conversation=conversations[0], role="user", content="x" * 10000)
+        next_url = self.client.get("/api/v1/chat/conversations").data["next"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(next_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"].upper()
+        self.assertNotIn("CHAT_MESSAGE", sql)
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        for conversation in create_conversations(self.user, 60):
+            ChatService.add_message(conversation.pk, "user", "hello")
+            ChatService.add_reply(conversation.pk, "hi there")
+        counts = []
+        for size in (5, 20, 60):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f"/api/v1/chat/conversations?size={size}")
+            self.assertEqual(len(response.data["results"]), size)
+            self.assertEqual(response.data["results"][0]["messageCount"], 2)
+            counts.append(len(queries))
+
+        self.assertEqual(counts, [1, 1, 1])
+
+    def test_summary_is_updated_with_each_message(self):
+        conversation = Conversation.objects.create(user=self.user)
+        ChatService.add_message(conversation.pk, "user", "How do I\n\ncenter a div?")
+        ChatService.add_reply(conversation.pk, "Use flexbox. " * 20)
+
+        result = self.client.get("/api/v1/chat/conversations").data["results"][0]
+
+        self.assertEqual(result["messageCount"], 2)
+        self.assertEqual(len(result["lastMessagePreview"]), 120)
+        self.assertTrue(result["lastMessagePreview"].startswith("Use flexbox. Use flexbox."))
+        self.assertTrue(result["lastMessagePreview"].endswith("…"))
+
+    def test_repair_recomputes_summaries_without_reordering(self):
+        stale, empty = create_conversations(self.user, 2)
+        create_messages(stale, 3)
+        Conversation.objects.filter(pk=empty.pk).update(message_count=4, last_message_preview="gone")
+        before = self._walk("/api/v1/chat/conversations")
+        out = StringIO()
+
+        call_command("repair_conversation_summaries", "--batch-size", "1", stdout=out)
+
+        self.assertIn("Repaired 2 of 2 conversations", out.getvalue())
+        results = {r["id"]: r for r in self.client.get("/api/v1/chat/conversations").data["results"]}
+        self.assertEqual((results[f"conv_{stale.id.hex}"]["messageCount"], results[f"conv_{stale.id.hex}"]["lastMessagePreview"]), (3, "Message 2"))
+        self.assertEqual((results[f"conv_{empty.id.hex}"]["messageCount"], results[f"conv_{empty.id.hex}"]["lastMessagePreview"]), (0, ""))
+        self.assertEqual(self._walk("/api/v1/chat/conversations"), before)
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN output is SQLite-specific")
+    def test_sidebar_query_seeks_the_sidebar_index(self):
+        from .pagination import KeysetPagination
+        from .views import SIDEBAR_FIELDS
+        queryset = Conversation.objects.filter(user=self.user).only(*SIDEBAR_FIELDS)
+        seek = KeysetPagination._seek(["-updated_at", "-id"], [timezone.now(), Conversation().id])
+        plan = queryset.filter(seek).order_by("-updated_at", "-id")[:21].explain()
+
+        # SQLite drops the INCLUDE columns, so rows come from the table; the
+        # range scan and the ordering still come from the index
+        self.assertIn("USING INDEX chat_conv_sidebar_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get("/api/v1/chat/conversations?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["code"], "NOT_FOUND")
+
+    def test_requires_authentication(self):
+        response = APIClient().get("/api/v1/chat/conversations")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+class ConversationDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_conversation(self):
+        response = self.client.post("/api/v1/chat/conversations", {}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["title"], "New Chat")
+        self.assertTrue(response.data["id"].startswith("conv_"))
+        self.assertTrue(Conversation.objects.filter(user=self.user).exists())
+
+    def test_rename_bumps_updated_at(self):
+        conversation = create_conversations(self.user, 1)[0]
+        previous_update = conversation.updated_at
+
+        response = self.client.patch(f"/api/v1/chat/conversations/conv_{conversation.id.hex}", {"title": "Renamed"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"id", "title", "updatedAt"})
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.title, "Renamed")
+        self.assertGreater(conversation.updated_at, previous_update)
+
+    def test_delete_hides_the_conversation_and_queues_the_purge(self):
+        conversation = create_conversations(self.user, 1)[0]
+        Message.objects.create(conversation=conversation, role="user", content="hello")
+        url = f"/api/v1/chat/conversations/conv_{conversation.id.hex}"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(any(query["sql"].startswith("DELETE") for query in queries))
+        self.assertEqual(self.client.get("/api/v1/chat/conversations").data["results"], [])
+        self.assertEqual(self.client.get(f"{url}/messages").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Message.objects.exists())
+
+        queue.run_once()
+
+        self.assertFalse(Conversation.all_objects.exists())
+        self.assertFalse(Message.objects.exists())
+
+    def test_other_users_conversation_is_forbidden(self):
+        other = User.objects.create_user(email="other@example.com", password="x")
+        conversation = create_conversations(other, 1)[0]
+
+        response = self.client.patch(f"/api/v1/chat/conversations/conv_{conversation.id.hex}", {"title": "Mine"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data["code"], "PERMISSION_DENIED")
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.title, "Chat 0")
+
+    def test_unknown_conversation_is_not_found(self):
+        response = self.client.delete(f"/api/v1/chat/conversations/conv_{'0' * 32}")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+def create_messages(conversation, count, start=None):
+    """Bulk-creates `count` alternating user/assistant messages, one second apart."""
+    start = start or timezone.now() - timedelta(days=1)
+    messages = Message.objects.bulk_create(
+        Message(conversation=conversation, role="user" if i % 2 == 0 else "assistant", content=f"Message {i}")
+        for i in range(count)
+    )
+    for i, message in enumerate(messages):
+        message.created_at = start + timedelta(seconds=i)
+    Message.objects.bulk_update(messages, ["created_at"])
+    return messages
+
+class MessageHistoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.conversation = create_conversations(self.user, 1)[0]
+        self.url = f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}/messages"
+
+    def _contents(self, response):
+        return [item["content"] for item in response.data["results"]]
+
+    def test_first_page_is_latest_messages_oldest_first(self):
+        create_messages(self.conversation, 12)
+
+        response = self.client.get(self.url, {"size": 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"nextCursor", "previousCursor", "results"})
+        self.assertEqual(self._contents(response), [f"Message {i}" for i in range(7, 12)])
+        self.assertIsNone(response.data["nextCursor"])
+        self.assertIsNotNone(response.data["previousCursor"])
+        self.assertEqual(set(response.data["results"][0]), {"id", "role", "content", "createdAt"})
+
+    def test_cursors_walk_history_both_ways(self):
+        create_messages(self.conversation, 12)
+        latest = self.client.get(self.url, {"size": 5})
+
+        older = self.client.get(self.url, {"size": 5, "cursor": latest.data["previousCursor"]})
+        oldest = self.client.get(self.url, {"size": 5, "cursor": older.data["previousCursor"]})
+        newer = self.client.get(self.url, {"size": 5, "cursor": oldest.data["nextCursor"]})
+
+        self.assertEqual(self._contents(older), [f"Message {i}" for i in range(2, 7)])
+        self.assertEqual(self._contents(oldest), ["Message 0", "Message 1"])
+        self.assertIsNone(oldest.data["previousCursor"])
+        self.assertEqual(self._contents(newer), self._contents(older))
+
+    def test_unchanged_conversation_is_not_modified_without_reading_messages(self):
+        create_messages(self.conversation, 3)
+        response = self.client.get(self.url)
+        self.assertIn("private", response["Cache-Control"])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("CHAT_MESSAGE", queries[0]["sql"].upper())
+
+    def test_if_modified_since_is_honoured(self):
+        response = self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_activity_changes_the_etag(self):
+        first = self.client.get(self.url)
+        Conversation.objects.filter(pk=self.conversation.pk).update(updated_at=timezone.now())
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_etag_differs_per_page(self):
+        create_messages(self.conversation, 4)
+        latest = self.client.get(self.url, {"size": 2})
+
+        older = self.client.get(self.url, {"size": 2, "cursor": latest.data["previousCursor"]})
+
+        self.assertNotEqual(older["ETag"], latest["ETag"])
+
+    def test_full_page_costs_two_queries(self):
+        create_messages(self.conversation, 3)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_other_users_history_is_forbidden_in_one_query(self):
+        other = User.objects.create_user(email="other@example.com", password="x")
+        conversation = create_conversations(other, 1)[0]
+        create_messages(conversation, 2)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/v1/chat/conversations/conv_{conversation.id.hex}/messages")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn("ETag", response)
+
+    def test_unknown_conversation_is_not_found(self):
+        response = self.client.get(f"/api/v1/chat/conversations/conv_{'0' * 32}/messages")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class RecordingProvider(BaseProvider):
+    """Emits `count` chunks, pausing between them, and records whether it was stopped early."""
+
+    def __init__(self, count=5, delay=0.0, fail_after=None):
+        self.count = count
+        self.delay = delay
+        self.fail_after = fail_after
+        self.emitted = 0
+        self.stopped_early = False
+
+    async def stream(self, messages):
+        completed = False
+        try:
+            for i in range(self.count):
+                if i == self.fail_after:
+                    raise ProviderUnavailable()
+                await asyncio.sleep(self.delay)
+                self.emitted += 1
+                yield f"tok{i} "
+            completed = True
+        finally:
+            # Cancellation and aclose() both unwind through here
+            self.stopped_early = not completed
+
+def parse_events(body):
+    return [json.loads(line[len("data: "):]) for line in body.decode().split("\n\n") if line]
+
+@override_settings(ROOT_URLCONF="config.async_urls", FAKE_PROVIDER_TOKENS_PER_SECOND=0)
+class MessageStreamTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.conversation = create_conversations(self.user, 1)[0]
+        self.url = f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}/messages/stream"
+
+    async def _stream(self, content="Hello there friend"):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        return await client.post(self.url, {"content": content}, content_type="application/json", HTTP_ACCEPT="text/event-stream")
+
+    async def test_streams_chunks_and_saves_reply_once(self):
+        response = await self._stream()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = parse_events(b"".join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual("".join(event.get("chunk", "") for event in events), "You said: Hello there friend")
+        self.assertEqual(len(events), 6)
+
+        messages = [message async for message in Message.objects.order_by("created_at")]
+        self.assertEqual([(m.role, m.content) for m in messages], [("user", "Hello there friend"), ("assistant", "You said: Hello there friend")])
+        self.assertEqual(events[-1], {"status": "done", "fullMessageId": f"msg_{messages[1].id.hex}"})
+        conversation = await Conversation.objects.aget(pk=self.conversation.pk)
+        self.assertEqual(conversation.updated_at, messages[1].created_at)
+
+    async def test_disconnect_stops_provider_and_discards_partial_reply(self):
+        provider = RecordingProvider(count=100, delay=0.01)
+        received = []
+
+        async def client():
+            async for event in relay_reply(self.conversation.pk, provider, []):
+                received.append(event)
+
+        task = asyncio.ensure_future(client())
+        while len(received) < 3:
+            await asyncio.sleep(0.005)
+        # What ASGIHandler does when it sees http.disconnect
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertTrue(provider.stopped_early)
+        self.assertLess(provider.emitted, 10)
+        self.assertFalse(await Message.objects.filter(role="assistant").aexists())
+
+    async def test_closing_between_events_stops_provider(self):
+        provider = RecordingProvider(count=100)
+        events = relay_reply(self.conversation.pk, provider, [])
+        for _ in range(3):
+            await events.__anext__()
+
+        # Django drops the iterator when the disconnect lands while a chunk is being sent
+        await events.aclose()
+
+        self.assertTrue(provider.stopped_early)
+        self.assertEqual(provider.emitted, 3)
+        self.assertFalse(await Message.objects.filter(role="assistant").aexists())
+
+    async def test_provider_failure_ends_stream_with_error_event(self):
+        provider = RecordingProvider(count=5, fail_after=2)
+
+        events = parse_events("".join([event async for event in relay_reply(self.conversation.pk, provider, [])]).encode())
+
+        self.assertEqual(events[-1]["status"], "error")
+        self.assertEqual(events[-1]["code"], "SERVICE_UNAVAILABLE")
+        self.assertFalse(await Message.objects.filter(role="assistant").aexists())
+
+    async def test_empty_message_is_rejected(self):
+        response = await self._stream(content="")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["code"], "VALIDATION_ERROR")
+        self.assertFalse(await Message.objects.aexists())
+
+    async def test_other_users_conversation_is_forbidden(self):
+        other = await User.objects.acreate(email="other@example.com")
+        self.conversation = await Conversation.objects.acreate(user=other)
+        self.url = f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}/messages/stream"
+
+        response = await self._stream()
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(await Message.objects.aexists())
+
+    async def test_fake_provider_paces_tokens(self):
+        with self.settings(FAKE_PROVIDER_TOKENS_PER_SECOND=200):
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            reply = await FakeProvider().complete([{"role": "user", "content": "one two three four"}])
+
+        self.assertEqual(reply, "You said: one two three four")
+        self.assertGreaterEqual(loop.time() - start, 6 / 200 * 0.9)
+
+@override_settings(FAKE_PROVIDER_TOKENS_PER_SECOND=0)
+class SendMessageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.conversation = create_conversations(self.user, 1)[0]
+        self.url = f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}/messages"
+
+    def test_send_returns_reply_and_bumps_updated_at(self):
+        response = self.client.post(self.url, {"content": "Hi"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["role"], "assistant")
+        self.assertEqual(response.data["content"], "You said: Hi")
+        reply = Message.objects.get(role="assistant")
+        self.assertEqual(response.data["id"], f"msg_{reply.id.hex}")
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.updated_at, reply.created_at)
+        self.assertTrue(Message.objects.filter(role="user", content="Hi").exists())
+
+    @override_settings(CHAT_PROVIDER="apps.chat.tests.FailingProvider")
+    def test_provider_outage_is_service_unavailable(self):
+        response = self.client.post(self.url, {"content": "Hi"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["code"], "SERVICE_UNAVAILABLE")
+        self.assertFalse(Message.objects.filter(role="assistant").exists())
+
+    def test_other_users_conversation_is_forbidden(self):
+        conversation = create_conversations(User.objects.create_user(email="other@example.com", password="x"), 1)[0]
+
+        response = self.client.post(f"/api/v1/chat/conversations/conv_{conversation.id.hex}/messages", {"content": "Hi"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Message.objects.exists())
+
+class FailingProvider(BaseProvider):
+    async def stream(self, messages):
+        raise ProviderUnavailable()
+        yield
+
+class BarrierProvider(BaseProvider):
+    """Holds every caller until `barrier` is full, then records how many DB connections are open."""
+    barrier = None
+    snapshots = []
+    gauge = None
+
+    async def stream(self, messages):
+        await asyncio.to_thread(self.barrier.wait, 10)
+        BarrierProvider.snapshots.append(self.gauge.open)
+        await asyncio.to_thread(self.barrier.wait, 10)
+        yield "ok"
+
+class ConnectionGauge:
+    """Counts database connections opened and not yet closed, across all threads."""
+
+    def __init__(self):
+        self.open = 0
+        self.lock = threading.Lock()
+        connect, close = BaseDatabaseWrapper.connect, BaseDatabaseWrapper.close
+
+        def counting_connect(wrapper):
+            connect(wrapper)
+            with self.lock:
+                self.open += 1
+
+        def counting_close(wrapper):
+            was_open = wrapper.connection is not None
+            close(wrapper)
+            if was_open and wrapper.connection is None:
+                with self.lock:
+                    self.open -= 1
+
+        self.patches = [
+            mock.patch.object(BaseDatabaseWrapper, "connect", counting_connect),
+            mock.patch.object(BaseDatabaseWrapper, "close", counting_close),
+        ]
+
+    def __enter__(self):
+        for patch in self.patches:
+            patch.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        for patch in self.patches:
+            patch.stop()
+
+@override_settings(CHAT_PROVIDER="apps.chat.tests.BarrierProvider")
+class SendMessageConnectionTests(TransactionTestCase):
+    senders = 6
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.conversations = create_conversations(self.user, self.senders)
+        BarrierProvider.barrier = threading.Barrier(self.senders)
+        BarrierProvider.snapshots = []
+
+    def _send_concurrently(self):
+        statuses = []
+
+        def send(conversation):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            try:
+                response = client.post(f"/api/v1/chat/conversations/conv_{conversation.id.hex}/messages", {"content": "Hi"}, format="json")
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        with ConnectionGauge() as gauge:
+            BarrierProvider.gauge = gauge
+            threads = [threading.Thread(target=send, args=(conversation,)) for conversation in self.conversations]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(statuses, [status.HTTP_200_OK] * self.senders)
+        return BarrierProvider.snapshots
+
+    def test_no_connection_is_held_while_waiting_on_the_provider(self):
+        snapshots = self._send_concurrently()
+
+        self.assertEqual(snapshots, [0] * self.senders)
+        self.assertEqual(Message.objects.filter(role="assistant").count(), self.senders)
+
+    def test_gauge_sees_connections_held_without_release(self):
+        with mock.patch.object(services, "release_connection", lambda: None):
+            snapshots = self._send_concurrently()
+
+        self.assertEqual(snapshots, [self.senders] * self.senders)
+
+@override_settings(FAKE_PROVIDER_TOKENS_PER_SECOND=0)
+class AutoTitleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _send(self, conversation, content):
+        url = f"/api/v1/chat/conversations/conv_{conversation.id.hex}/messages"
+        self.assertEqual(self.client.post(url, {"content": content}, format="json").status_code, status.HTTP_200_OK)
+
+    def test_first_reply_queues_one_title_job(self):
+        conversation = create_conversations(self.user, 1)[0]
+
+        self._send(conversation, "How do I center a div in CSS?")
+        self._send(conversation, "And vertically?")
+
+        jobs = Job.objects.filter(kind="chat.auto_title")
+        self.assertEqual([job.payload for job in jobs], [{"conversation_id": str(conversation.id)}])
+
+    def test_title_job_names_conversations_in_one_batch(self):
+        first, second, renamed = [Conversation.objects.create(user=self.user) for _ in range(3)]
+        for i, conversation in enumerate((first, second, renamed)):
+            self._send(conversation, f"Tell me about topic {i} and more things")
+        Conversation.objects.filter(pk=renamed.pk).update(title="My own title")
+        updated_at = dict(Conversation.objects.values_list("id", "updated_at"))
+
+        self.assertEqual(queue.run_once(), 3)
+
+        titles = dict(Conversation.objects.values_list("id", "title"))
+        self.assertEqual(titles[first.id], "Tell me about topic 0")
+        self.assertEqual(titles[second.id], "Tell me about topic 1")
+        self.assertEqual(titles[renamed.id], "My own title")
+        self.assertEqual(dict(Conversation.objects.values_list("id", "updated_at")), updated_at)
+        self.assertFalse(Job.objects.exists())
+
+@override_settings(CHAT_PROVIDER="apps.chat.providers.FakeProvider")
+class ContextBuilderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.conversation = create_conversations(self.user, 1)[0]
+
+    def test_window_is_the_newest_messages_within_budget(self):
+        create_messages(self.conversation, 30)
+
+        window = ContextBuilder(budget=10).build(self.conversation.pk)
+
+        # FakeProvider counts words: two tokens per "Message N"
+        self.assertEqual([m["content"] for m in window], [f"Message {i}" for i in range(25, 30)])
+        self.assertEqual(window[0], {"role": "assistant", "content": "Message 25"})
+        # Counts missing from older rows are stored as they are read
+        self.assertFalse(Message.objects.filter(token_count__isnull=True).exists())
+
+    def test_newest_message_is_kept_even_over_budget(self):
+        ChatService.add_message(self.conversation.pk, "user", "word " * 50)
+
+        window = ContextBuilder(budget=10).build(self.conversation.pk)
+
+        self.assertEqual(len(window), 1)
+
+    def test_cold_build_reads_only_the_window(self):
+        create_messages(self.conversation, 500)
+        Message.objects.update(token_count=2)
+
+        with CaptureQueriesContext(connection) as queries:
+            window = ContextBuilder(budget=20).build(self.conversation.pk)
+
+        self.assertEqual(len(window), 10)
+        self.assertEqual(len(queries), 1)
+
+    def test_walk_back_spans_several_chunks(self):
+        create_messages(self.conversation, 12)
+        builder = ContextBuilder(budget=1000)
+        builder.chunk_size = 5
+
+        window = builder.build(self.conversation.pk)
+
+        self.assertEqual([m["content"] for m in window], [f"Message {i}" for i in range(12)])
+
+    def test_warm_build_reads_only_new_messages_and_slides(self):
+        create_messages(self.conversation, 40)
+        builder = ContextBuilder(budget=10)
+        builder.build(self.conversation.pk)
+        ChatService.add_message(self.conversation.pk, "user", "Brand new")
+
+        with CaptureQueriesContext(connection) as queries:
+            warm = builder.build(self.conversation.pk)
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([m["content"] for m in warm], [f"Message {i}" for i in range(36, 40)] + ["Brand new"])
+        cache.clear()
+        self.assertEqual(ContextBuilder(budget=10).build(self.conversation.pk), warm)
+
+    def test_warm_build_picks_up_a_message_from_the_same_instant(self):
+        last = ChatService.add_message(self.conversation.pk, "user", "First")
+        builder = ContextBuilder(budget=1000)
+        builder.build(self.conversation.pk)
+        # Saved in the same clock tick, with a random id that sorts before the cached last row
+        Message.objects.create(
+            id=uuid.UUID(int=last.id.int - 1), conversation=self.conversation, role="assistant", content="Second", token_count=1
+        )
+        Message.objects.filter(content="Second").update(created_at=last.created_at)
+
+        warm = builder.build(self.conversation.pk)
+
+        self.assertEqual(sorted(m["content"] for m in warm), ["First", "Second"])
+
+    def test_send_stores_token_counts(self):
+        ChatService.send_message(self.conversation.pk, "one two three", FakeProvider())
+
+        counts = dict(Message.objects.values_list("role", "token_count"))
+        self.assertEqual(counts, {"user": 3, "assistant": 5})
+
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.conversation = Conversation.objects.create(user=self.user, title="CSS help")
+
+    def _search(self, q, **params):
+        return self.client.get("/api/v1/chat/search", {"q": q, **params})
+
+    def test_results_are_ranked_and_scoped_to_the_user(self):
+        once = ChatService.add_message(self.conversation.pk, "user", "How do I center a div with flexbox?")
+        thrice = ChatService.add_message(self.conversation.pk, "assistant", "Flexbox: flexbox containers center flexbox items.")
+        ChatService.add_message(self.conversation.pk, "user", "Thanks, that grid tip worked")
+        other = Conversation.objects.create(user=User.objects.create_user(email="other@example.com", password="x"))
+        ChatService.add_message(other.pk, "user", "flexbox flexbox flexbox flexbox")
+
+        response = self._search("FLEXBOX")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["messageId"] for r in response.data["results"]], [f"msg_{thrice.id.hex}", f"msg_{once.id.hex}"])
+        self.assertEqual(response.data["results"][1]["conversationId"], f"conv_{self.conversation.id.hex}")
+        self.assertEqual(response.data["results"][1]["conversationTitle"], "CSS help")
+        self.assertIn("flexbox", response.data["results"][1]["snippet"])
+
+    def test_every_word_must_match(self):
+        ChatService.add_message(self.conversation.pk, "user", "center a div")
+        both = ChatService.add_message(self.conversation.pk, "user", "center it with flexbox")
+
+        response = self._search("flexbox center")
+
+        self.assertEqual([r["messageId"] for r in response.data["results"]], [f"msg_{both.id.hex}"])
+
+    def test_search_syntax_in_the_query_is_treated_as_words(self):
+        ChatService.add_message(self.conversation.pk, "user", "center OR div, near the top")
+
+        response = self._search('"center" OR -div* NEAR(')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_query_without_words_is_rejected(self):
+        response = self._search("  !!  ")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["code"], "VALIDATION_ERROR")
+
+    def test_deleting_a_conversation_removes_its_documents(self):
+        ChatService.add_message(self.conversation.pk, "user", "ephemeral words")
+
+        self.client.delete(f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}")
+
+        self.assertEqual(self._search("ephemeral").data["results"], [])
+        queue.run_once()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM chat_message_search")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN output is SQLite-specific")
+    def test_removing_documents_looks_them_up_by_rowid(self):
+        kept = ChatService.add_message(self.conversation.pk, "user", "kept words")
+        removed = ChatService.add_message(self.conversation.pk, "user", "removed words")
+
+        with CaptureQueriesContext(connection) as queries:
+            search.remove_messages([removed.pk])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+            plan = " ".join(str(row) for row in cursor.fetchall())
+            cursor.execute("SELECT rowid, message_id FROM chat_message_search")
+            remaining = cursor.fetchall()
+        # FTS5 answers rowid equality through its index (idxStr "=") instead of a full scan
+        self.assertIn("INDEX 0:=", plan)
+        self.assertEqual(remaining, [(kept.pk.int & search.ROWID_MASK, kept.pk.hex)])
+
+    def test_rebuild_indexes_existing_messages(self):
+        create_messages(self.conversation, 5)
+        self.assertEqual(self._search("message").data["results"], [])
+        out = StringIO()
+
+        call_command("rebuild_search_index", "--batch-size", "2", stdout=out)
+
+        self.assertIn("Indexed 5 messages", out.getvalue())
+        self.assertEqual(len(self._search("message").data["results"]), 5)
+
+    def test_rebuild_replaces_documents_in_place(self):
+        for i in range(3):
+            ChatService.add_message(self.conversation.pk, "user", f"indexed {i}")
+        orphan = uuid.uuid4()
+        search.index_messages([Message(id=orphan, conversation=self.conversation, content="indexed orphan")])
+
+        call_command("rebuild_search_index", "--batch-size", "2", stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM chat_message_search")
+            self.assertEqual(cursor.fetchone()[0], 3)
+        self.assertEqual(len(self._search("indexed").data["results"]), 3)
+
+@override_settings(CHAT_PURGE={"BATCH_SIZE": 2, "MAX_BATCHES": 2})
+class PurgeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.conversation = Conversation.objects.create(user=self.user)
+        for i in range(5):
+            ChatService.add_message(self.conversation.pk, "user", f"message {i}")
+
+    def _message_deletes(self, queries):
+        # Batch deletes by id; the final cascade from the conversation row finds nothing left
+        return [query for query in queries if query["sql"].startswith('DELETE FROM "chat_message" WHERE "chat_message"."id" IN')]
+
+    def test_purge_job_deletes_in_batches_and_continues_in_a_new_job(self):
+        ChatService.delete_conversation(self.conversation)
+
+        with CaptureQueriesContext(connection) as queries:
+            queue.run_once()
+
+        self.assertEqual(len(self._message_deletes(queries)), 2)
+        self.assertEqual(Message.objects.count(), 1)
+        self.assertEqual(Job.objects.filter(kind="chat.purge_conversation").count(), 1)
+
+        queue.run_once()
+
+        self.assertFalse(Message.objects.exists())
+        self.assertFalse(Conversation.all_objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_purge_leaves_conversations_that_are_not_deleted(self):
+        from .purge import purge_conversation
+
+        self.assertTrue(purge_conversation(self.conversation.pk, batch_size=2))
+
+        self.assertEqual(Message.objects.count(), 5)
+
+    def test_account_deletion_purges_messages_in_batches(self):
+        other = Conversation.objects.create(user=self.user)
+        ChatService.add_message(other.pk, "user", "one more")
+        ChatService.delete_conversation(other)
+
+        AuthService.delete_account(self.user)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(Conversation.objects.exists())
+        with CaptureQueriesContext(connection) as queries:
+            while Job.objects.filter(run_at__lte=timezone.now()).exists():
+                queue.run_once()
+
+        # 5 messages in batches of 2, plus the soft-deleted conversation's 1
+        self.assertEqual(len(self._message_deletes(queries)), 4)
+        self.assertFalse(Message.objects.exists())
+        self.assertFalse(Conversation.all_objects.exists())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM chat_message_search")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+        # The account job ran before the purges finished and checks back later
+        Job.objects.update(run_at=timezone.now())
+        queue.run_once()
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_account_deletion_queues_all_purges_in_one_insert(self):
+        for _ in range(3):
+            Conversation.objects.create(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            ChatService.delete_user_conversations(self.user.pk)
+
+        inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "jobs_job"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Job.objects.filter(kind=PURGE_CONVERSATION).count(), 4)
+
+    def test_collecting_a_user_deletes_nothing(self):
+        # The admin delete confirmation page collects related objects without deleting them
+        NestedObjects(using="default").collect([self.user])
+
+        self.assertEqual(Message.objects.count(), 5)
+
+def replicate(*objects):
+    """Copies rows to the stand-in replica, as replication would."""
+    for obj in objects:
+        obj.save(using="replica", force_insert=True)
+
+@override_settings(DATABASE_REPLICAS=["replica"], REPLICA_READ_YOUR_WRITES_SECONDS=5)
+class ReplicaRoutingTests(TransactionTestCase):
+    # Not TestCase: reads inside a transaction on the primary stay on the primary
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.conversation = Conversation.objects.create(user=self.user, title="Primary title")
+        replicate(self.user, self.conversation)
+        Conversation.objects.using("replica").filter(pk=self.conversation.pk).update(title="Replica title")
+        self.client = APIClient()
+        self.client.force_login(self.user)
+
+    def _titles(self):
+        return [c["title"] for c in self.client.get("/api/v1/chat/conversations").data["results"]]
+
+    def test_designated_views_read_from_the_replica(self):
+        self.assertEqual(self._titles(), ["Replica title"])
+        response = self.client.get(f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}/messages")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_a_session_reads_its_own_writes_from_the_primary(self):
+        response = self.client.patch(f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}", {"title": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._titles(), ["Renamed"])
+        self.assertEqual(Conversation.objects.using("replica").get().title, "Replica title")
+
+        other = APIClient()
+        other.force_login(self.user)
+        self.assertEqual([c["title"] for c in other.get("/api/v1/chat/conversations").data["results"]], ["Replica title"])
+
+    def test_the_marker_expires(self):
+        self.client.patch(f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}", {"title": "Renamed"}, format="json")
+
+        with mock.patch("core.middleware.time.time", return_value=timezone.now().timestamp() + 6):
+            self.assertEqual(self._titles(), ["Replica title"])
+
+    def test_writes_go_to_the_primary(self):
+        response = self.client.post("/api/v1/chat/conversations", {}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Conversation.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(Conversation.objects.using("replica").count(), 1)
+
+    def test_other_views_read_from_the_primary(self):
+        ChatService.add_message(self.conversation.pk, "user", "only on the primary")
+
+        response = self.client.get("/api/v1/chat/search", {"q": "primary"})
+
+        self.assertEqual(len(response.data["results"]), 1)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_the_primary(self):
+        client = APIClient()
+        client.force_login(self.user)
+
+        self.assertEqual([c["title"] for c in client.get("/api/v1/chat/conversations").data["results"]], ["Primary title"])
+
+def stored_content(message):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT content FROM chat_message WHERE id = %s", [Message._meta.pk.get_db_prep_value(message.pk, connection)])
+        return cursor.fetchone()[0]
+
+class CompressedContentTests(TestCase):
+    LONG = "def handler(request):\n    return process(request)\n" * 100
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="chat@example.com", password="password123", full_name="Chat User")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.conversation = Conversation.objects.create(user=self.user)
+
+    def test_long_content_is_stored_compressed_and_reads_back(self):
+        message = ChatService.add_message(self.conversation.pk, "assistant", self.LONG)
+
+        stored = stored_content(message)
+        self.assertTrue(stored.startswith(MARKER + "z:"))
+        self.assertLess(len(stored), len(self.LONG) / 4)
+        self.assertEqual(Message.objects.get(pk=message.pk).content, self.LONG)
+
+    def test_short_content_is_stored_plain(self):
+        message = ChatService.add_message(self.conversation.pk, "user", "hello")
+
+        self.assertEqual(stored_content(message), "hello")
+
+    def test_text_starting_with_the_marker_round_trips(self):
+        message = ChatService.add_message(self.conversation.pk, "user", MARKER + "z:not compressed")
+
+        self.assertEqual(Message.objects.get(pk=message.pk).content, MARKER + "z:not compressed")
+
+    def test_content_is_decompressed_only_when_read(self):
+        message = ChatService.add_message(self.conversation.pk, "assistant", self.LONG)
+
+        loaded = Message.objects.get(pk=message.pk)
+        self.assertIsInstance(loaded.__dict__["content"], CompressedText)
+        loaded.role = "user"
+        loaded.save()
+        self.assertIsInstance(loaded.__dict__["content"], CompressedText)
+        self.assertEqual(loaded.content, self.LONG)
+        self.assertEqual(str(Message.objects.values_list("content", flat=True).get(pk=message.pk)), self.LONG)
+
+    def test_pre_save_loads_a_deferred_value(self):
+        message = ChatService.add_message(self.conversation.pk, "assistant", "short reply")
+        field = Message._meta.get_field("content")
+
+        deferred = Message.objects.defer("content").get(pk=message.pk)
+
+        self.assertEqual(field.pre_save(deferred, add=False), "short reply")
+
+    def test_history_returns_plain_content(self):
+        ChatService.add_message(self.conversation.pk, "assistant", self.LONG)
+
+        response = self.client.get(f"/api/v1/chat/conversations/conv_{self.conversation.id.hex}/messages")
+
+        self.assertEqual(response.data["results"][0]["content"], self.LONG)
+
+    def test_command_compresses_existing_rows(self):
+        long, short = create_messages(self.conversation, 2)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE chat_message SET content = %s WHERE id = %s",
+                [self.LONG, Message._meta.pk.get_db_prep_value(long.pk, connection)],
+            )
+        out = StringIO()
+
+        call_command("compress_messages", "--dry-run", stdout=out)
+        self.assertIn("Would compress 1 of 1", out.getvalue())
+        self.assertEqual(stored_content(long), self.LONG)
+
+        call_command("compress_messages", "--batch-size", "1", stdout=out)
+        self.assertIn("Compressed 1 of 1", out.getvalue())
+        self.assertTrue(stored_content(long).startswith(MARKER))
+        self.assertEqual(stored_content(short), "Message 1")
+        self.assertEqual(Message.objects.get(pk=long.pk).content, self.LONG)
@@ -0,0 +1,12 @@
+from django.urls import path, register_converter
+from .converters import ConversationIdConverter
+from .views import ConversationListView, ConversationDetailView, MessageListView, SearchView
+
+register_converter(ConversationIdConverter, "conv")
+
+urlpatterns = [
+    path("conversations", ConversationListView.as_view(), name="chat-conversations"),
+    path("conversations/<conv:conversation_id>", ConversationDetailView.as_view(), name="chat-conversation"),
+    path("conversations/<conv:conversation_id>/messages", MessageListView.as_view(), name="chat-messages"),
+    path("search", SearchView.as_view(), name="chat-search"),
+]
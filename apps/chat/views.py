@@ -0,0 +1,104 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework import status, permissions
+from .models import Conversation, Message
+from .pagination import KeysetPagination, MessagePagination
+from .providers import get_provider
+from .search import search_messages, search_terms
+from .serializers import (
+    ConversationSerializer, ConversationTitleSerializer, MessageCreateSerializer, MessageSerializer,
+    SearchQuerySerializer, SearchResultSerializer,
+)
+from .services import ChatService
+
+# Everything the sidebar shows; all of it is in chat_conv_sidebar_idx
+SIDEBAR_FIELDS = ("id", "title", "created_at", "updated_at", "message_count", "last_message_preview")
+MESSAGE_FIELDS = ("id", "role", "content", "created_at")
+
+def get_owned_conversation(user, conversation_id, fields=SIDEBAR_FIELDS):
+    """404 when the conversation does not exist, 403 when it belongs to someone else."""
+    conversation = Conversation.objects.filter(pk=conversation_id).only("user_id", *fields).first()
+    if conversation is None:
+        raise NotFound("Conversation not found.")
+    if conversation.user_id != user.id:
+        raise PermissionDenied("You do not have access to this conversation.")
+    return conversation
+
+class ConversationListView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    read_from_replica = True
+
+    def get(self, request):
+        paginator = KeysetPagination()
+        queryset = Conversation.objects.filter(user=request.user).only(*SIDEBAR_FIELDS)
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(ConversationSerializer(page, many=True).data)
+
+    def post(self, request):
+        conversation = Conversation.objects.create(user=request.user)
+        return Response(ConversationSerializer(conversation).data, status=status.HTTP_201_CREATED)
+
+class ConversationDetailView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def patch(self, request, conversation_id):
+        conversation = get_owned_conversation(request.user, conversation_id)
+        serializer = ConversationTitleSerializer(conversation, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def delete(self, request, conversation_id):
+        conversation = get_owned_conversation(request.user, conversation_id, fields=())
+        ChatService.delete_conversation(conversation)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+def history_validators(conversation, request):
+    """
+    ETag and Last-Modified for one page of history. Every message write bumps
+    Conversation.updated_at, so it alone decides whether any page changed.
+    """
+    version = f"{conversation.pk.hex}:{conversation.updated_at.isoformat()}:{request.GET.urlencode()}"
+    etag = quote_etag(hashlib.md5(version.encode(), usedforsecurity=False).hexdigest())
+    return etag, conversation.updated_at.timestamp()
+
+class MessageListView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    read_from_replica = True
+
+    def get(self, request, conversation_id):
+        # One query answers ownership (403/404) and freshness (304)
+        conversation = get_owned_conversation(request.user, conversation_id, fields=("updated_at",))
+        etag, last_modified = history_validators(conversation, request)
+        response = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+        if response is None:
+            paginator = MessagePagination()
+            queryset = Message.objects.filter(conversation_id=conversation.pk).only(*MESSAGE_FIELDS)
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            response = paginator.get_paginated_response(MessageSerializer(page, many=True).data)
+
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def post(self, request, conversation_id):
+        serializer = MessageCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        conversation = get_owned_conversation(request.user, conversation_id, fields=())
+        message = ChatService.send_message(conversation.pk, serializer.validated_data["content"], get_provider())
+        return Response(MessageSerializer(message).data, status=status.HTTP_200_OK)
+
+class SearchView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        messages = search_messages(request.user.id, query.validated_data["q"], query.validated_data["size"])
+        context = {"terms": search_terms(query.validated_data["q"])}
+        return Response({"results": SearchResultSerializer(messages, many=True, context=context).data}, status=status.HTTP_200_OK)
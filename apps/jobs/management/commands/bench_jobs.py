@@ -0,0 +1,60 @@
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from apps.jobs import queue
+from apps.jobs.models import Job
+from core.benchmarks import test_database
+
+class Command(BaseCommand):
+    help = "Measures job queue throughput (jobs/sec) for several worker counts and batch sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=2000, help="Jobs enqueued per run.")
+        parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts.")
+        parser.add_argument("--batch-sizes", default="1,20", help="Comma-separated handler batch sizes.")
+        parser.add_argument("--work-ms", type=float, default=0.0, help="Simulated I/O per batch (e.g. a provider call).")
+
+    def handle(self, *args, **options):
+        try:
+            worker_counts = [int(value) for value in options["workers"].split(",")]
+            batch_sizes = [int(value) for value in options["batch_sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--workers and --batch-sizes take comma-separated integers")
+
+        with test_database():
+            self.stdout.write(f"jobs={options['jobs']} work/batch={options['work_ms']}ms vendor={connection.vendor}")
+            self.stdout.write(f"{'workers':>8}{'batch':>8}{'seconds':>10}{'jobs/s':>10}")
+            for batch_size in batch_sizes:
+                for workers in worker_counts:
+                    elapsed = self._run(options["jobs"], workers, batch_size, options["work_ms"] / 1000)
+                    self.stdout.write(f"{workers:>8}{batch_size:>8}{elapsed:>10.2f}{options['jobs'] / elapsed:>10.0f}")
+
+    def _run(self, jobs, workers, batch_size, work):
+        done = []
+
+        @queue.register("bench.noop", batch_size=batch_size)
+        def noop(payloads):
+            if work:
+                time.sleep(work)
+            done.append(len(payloads))
+
+        Job.objects.bulk_create((Job(kind="bench.noop", payload={"n": n}) for n in range(jobs)), batch_size=1000)
+
+        def work_loop():
+            try:
+                while queue.run_once():
+                    pass
+            finally:
+                connection.close()
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=work_loop) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        if sum(done) != jobs:
+            raise CommandError(f"Processed {sum(done)} of {jobs} jobs")
+        return elapsed
@@ -0,0 +1,43 @@
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from apps.jobs.queue import run_once
+
+class Command(BaseCommand):
+    help = "Runs queued jobs with a pool of worker threads until interrupted (or until the queue is empty with --once)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=settings.JOB_QUEUE["WORKERS"], help="Worker threads.")
+        parser.add_argument("--poll-interval", type=float, default=settings.JOB_QUEUE["POLL_INTERVAL"], help="Seconds an idle worker waits before polling again.")
+        parser.add_argument("--once", action="store_true", help="Exit once no job is ready instead of polling.")
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        processed = [0] * options["workers"]
+
+        def work(index):
+            try:
+                while not stop.is_set():
+                    count = run_once()
+                    processed[index] += count
+                    if not count:
+                        if options["once"]:
+                            return
+                        stop.wait(options["poll_interval"])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work, args=(i,), daemon=True) for i in range(options["workers"])]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            # Let running batches finish; unfinished claims reappear after their lease
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.stdout.write(f"Processed {sum(processed)} jobs with {options['workers']} workers")
@@ -0,0 +1,28 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        FAILED = "failed"
+
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    # When the job next becomes visible to workers. Claiming pushes it out by
+    # the lease, so a job whose worker died is picked up again afterwards.
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    claim_token = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["run_at", "id"], condition=Q(status="pending"), name="jobs_ready_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
@@ -0,0 +1,134 @@
+"""
+Durable job queue on top of the Job table; no broker to operate.
+
+Delivery is at-least-once: a job is deleted only after its handler returns,
+and a worker that dies mid-job leaves it to reappear once its lease expires.
+Handlers take a list of payloads so same-kind jobs can be processed together.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+class Handler(NamedTuple):
+    func: Callable[[List[dict]], None]
+    batch_size: int
+
+_handlers: Dict[str, Handler] = {}
+
+def register(kind: str, batch_size: int = 1):
+    """Registers `func(payloads)` as the handler for jobs of `kind`, fed up to `batch_size` at a time."""
+    def decorator(func):
+        _handlers[kind] = Handler(func, batch_size)
+        return func
+    return decorator
+
+def enqueue(kind: str, payload: Optional[dict] = None, delay: float = 0) -> Job:
+    """
+    Adds a job. Called inside a transaction, the job is committed (or rolled
+    back) together with the data it refers to.
+    """
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=settings.JOB_QUEUE["MAX_ATTEMPTS"],
+    )
+
+def skip_locked(queryset: QuerySet) -> QuerySet:
+    """Locks the rows `queryset` reads, skipping rows other workers hold, where the database can."""
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True)
+    return queryset
+
+def claim_rows(ready: QuerySet, limit: int, lease: float, now: datetime) -> list:
+    """
+    Claims up to `limit` rows of the ordered queryset `ready` and hides them
+    for `lease` seconds. The model needs run_at, attempts and claim_token
+    fields, and `ready` must only match rows with run_at <= now. Shared by the
+    job queue and other outbox tables drained the same way.
+    """
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        ids = list(skip_locked(ready).values_list("id", flat=True)[:limit])
+        if not ids:
+            return []
+        # Without SKIP LOCKED (SQLite) two workers can pick the same ids.
+        # Re-applying the `ready` conditions, run_at included, makes this a
+        # compare-and-swap: each row goes to whichever worker updates it
+        # first, identified by its token.
+        ready.order_by().filter(id__in=ids).update(
+            run_at=now + timedelta(seconds=lease),
+            attempts=F("attempts") + 1,
+            claim_token=token,
+        )
+    return list(ready.model.objects.filter(id__in=ids, claim_token=token).order_by(*ready.query.order_by))
+
+def backoff(attempts: int, config: dict) -> float:
+    """Exponential backoff: RETRY_BACKOFF, 2x, 4x, ... capped at MAX_BACKOFF seconds of `config`."""
+    return min(config["RETRY_BACKOFF"] * 2 ** (attempts - 1), config["MAX_BACKOFF"])
+
+def enqueue_many(kind: str, payloads: List[dict], delay: float = 0) -> List[Job]:
+    """enqueue() for many jobs of one kind in a single bulk INSERT."""
+    run_at = timezone.now() + timedelta(seconds=delay)
+    max_attempts = settings.JOB_QUEUE["MAX_ATTEMPTS"]
+    return Job.objects.bulk_create(
+        Job(kind=kind, payload=payload, run_at=run_at, max_attempts=max_attempts) for payload in payloads
+    )
+
+def claim(now: Optional[datetime] = None) -> List[Job]:
+    """
+    Claims the oldest ready job plus further ready jobs of the same kind, up
+    to the handler's batch size, and hides them from other workers for the
+    lease period.
+    """
+    now = now or timezone.now()
+    ready = Job.objects.filter(status=Job.Status.PENDING, run_at__lte=now).order_by("run_at", "id")
+    with transaction.atomic():
+        kind = skip_locked(ready).values_list("kind", flat=True).first()
+        if kind is None:
+            return []
+        batch_size = _handlers[kind].batch_size if kind in _handlers else 1
+        return claim_rows(ready.filter(kind=kind), batch_size, settings.JOB_QUEUE["LEASE"], now)
+
+def retry_delay(attempts: int) -> float:
+    return backoff(attempts, settings.JOB_QUEUE)
+
+def fail(jobs: List[Job], error: str, now: Optional[datetime] = None) -> None:
+    """Schedules a retry for each job, or marks it failed once it is out of attempts."""
+    now = now or timezone.now()
+    for job in jobs:
+        job.last_error = error
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+        else:
+            job.run_at = now + timedelta(seconds=retry_delay(job.attempts))
+        # The claim token guards against a worker that claimed the job after our lease ran out
+        Job.objects.filter(id=job.id, claim_token=job.claim_token).update(
+            status=job.status, run_at=job.run_at, last_error=error
+        )
+
+def run_once() -> int:
+    """Claims and runs one batch. Returns the number of jobs claimed (0 when idle)."""
+    jobs = claim()
+    if not jobs:
+        return 0
+    kind = jobs[0].kind
+    try:
+        if kind not in _handlers:
+            raise LookupError(f"No handler registered for job kind {kind!r}")
+        _handlers[kind].func([job.payload for job in jobs])
+    except Exception as exc:
+        logger.exception("Job batch %s failed (%d jobs)", kind, len(jobs))
+        fail(jobs, f"{type(exc).__name__}: {exc}")
+    else:
+        # Jobs re-claimed by another worker after the lease ran out are theirs now
+        Job.objects.filter(id__in=[job.id for job in jobs], claim_token=jobs[0].claim_token).delete()
+    return len(jobs)
@@ -0,0 +1,148 @@
+import threading
+from contextlib import nullcontext
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from . import queue
+from .models import Job
+
+calls = []
+
+@queue.register("tests.record", batch_size=3)
+def record(payloads):
+    calls.append([payload["n"] for payload in payloads])
+
+@queue.register("tests.other")
+def other(payloads):
+    calls.append(("other", [payload["n"] for payload in payloads]))
+
+@queue.register("tests.broken")
+def broken(payloads):
+    raise RuntimeError("boom")
+
+@queue.register("tests.slow")
+def slow(payloads):
+    # Outlives its lease: another worker claims the job before this one finishes
+    queue.claim(timezone.now() + timedelta(seconds=301))
+    if payloads[0].get("fail"):
+        raise RuntimeError("late failure")
+
+processed = []
+processed_lock = threading.Lock()
+
+@queue.register("tests.collect", batch_size=4)
+def collect(payloads):
+    with processed_lock:
+        processed.extend(payload["n"] for payload in payloads)
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_batches_jobs_of_the_same_kind_in_order(self):
+        for n in range(5):
+            queue.enqueue("tests.record", {"n": n})
+        queue.enqueue("tests.other", {"n": 99})
+
+        while queue.run_once():
+            pass
+
+        self.assertEqual(calls, [[0, 1, 2], [3, 4], ("other", [99])])
+        self.assertFalse(Job.objects.exists())
+
+    def test_delayed_jobs_wait_for_run_at(self):
+        queue.enqueue("tests.record", {"n": 1}, delay=60)
+
+        self.assertEqual(queue.run_once(), 0)
+        self.assertEqual(calls, [])
+
+    @override_settings(JOB_QUEUE={"LEASE": 300, "MAX_ATTEMPTS": 3, "RETRY_BACKOFF": 10, "MAX_BACKOFF": 15})
+    def test_failures_back_off_then_give_up(self):
+        job = queue.enqueue("tests.broken")
+        delays = []
+
+        with self.assertLogs("apps.jobs", "ERROR"):
+            for _ in range(3):
+                before = timezone.now()
+                Job.objects.filter(pk=job.pk).update(run_at=before)
+                self.assertEqual(queue.run_once(), 1)
+                job.refresh_from_db()
+                delays.append(round((job.run_at - before).total_seconds()))
+
+        self.assertEqual(delays[:2], [10, 15])
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(job.last_error, "RuntimeError: boom")
+        self.assertEqual(queue.run_once(), 0)
+
+    def test_unknown_kind_is_retried_not_lost(self):
+        job = queue.enqueue("tests.unregistered")
+
+        with self.assertLogs("apps.jobs", "ERROR"):
+            queue.run_once()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertIn("No handler registered", job.last_error)
+
+    def test_claimed_jobs_reappear_after_the_lease(self):
+        job = queue.enqueue("tests.record", {"n": 1})
+        now = timezone.now()
+
+        self.assertEqual([claimed.pk for claimed in queue.claim(now)], [job.pk])
+        self.assertEqual(queue.claim(now + timedelta(seconds=60)), [])
+        reclaimed = queue.claim(now + timedelta(seconds=301))
+
+        self.assertEqual([claimed.pk for claimed in reclaimed], [job.pk])
+        self.assertEqual(reclaimed[0].attempts, 2)
+
+    def test_late_finish_leaves_a_reclaimed_job_alone(self):
+        for fail in (False, True):
+            with self.subTest(fail=fail):
+                job = queue.enqueue("tests.slow", {"fail": fail})
+
+                with self.assertLogs("apps.jobs", "ERROR") if fail else nullcontext():
+                    queue.run_once()
+
+                job.refresh_from_db()
+                self.assertEqual(job.attempts, 2)
+                self.assertEqual(job.status, Job.Status.PENDING)
+                self.assertEqual(job.last_error, "")
+                self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=300))
+                job.delete()
+
+class JobWorkerTests(TransactionTestCase):
+    # Workers run on their own threads and connections, so the jobs must be committed
+    def test_concurrent_workers_run_each_job_exactly_once(self):
+        processed.clear()
+        Job.objects.bulk_create(Job(kind="tests.collect", payload={"n": n}) for n in range(60))
+
+        def work():
+            try:
+                while queue.run_once():
+                    pass
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(processed), list(range(60)))
+        self.assertFalse(Job.objects.exists())
+
+    def test_run_jobs_command_drains_the_queue(self):
+        calls.clear()
+        for n in range(4):
+            queue.enqueue("tests.record", {"n": n})
+        out = StringIO()
+
+        call_command("run_jobs", "--workers", "1", "--once", stdout=out)
+
+        self.assertIn("Processed 4 jobs", out.getvalue())
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,41 @@
+from django.http import JsonResponse
+from rest_framework import status, permissions
+from core.async_views import AsyncAPIView
+from .models import OnboardingProgress
+from .views import mark_complete, validated_progress
+from apps.authentication.serializers import UserSerializer
+
+async def aget_progress(user):
+    progress, created = await OnboardingProgress.objects.aget_or_create(user=user)
+    # Reuse the authenticated user so serializing user.onboarding_complete needs no query
+    progress.user = user
+    return progress
+
+async def asave_progress(serializer):
+    """Async equivalent of serializer.save() for an existing instance."""
+    progress = serializer.instance
+    for field, value in serializer.validated_data.items():
+        setattr(progress, field, value)
+    await progress.asave()
+    return progress
+
+class OnboardingProgressView(AsyncAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def patch(self, request):
+        progress = await aget_progress(request.user)
+        serializer = validated_progress(progress, request.data, partial=True)
+        await asave_progress(serializer)
+        return JsonResponse(serializer.data, status=status.HTTP_200_OK)
+
+class OnboardingCompleteView(AsyncAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def post(self, request):
+        progress = await aget_progress(request.user)
+        await asave_progress(validated_progress(progress, request.data))
+
+        user = request.user
+        await user.asave(update_fields=mark_complete(user))
+
+        return JsonResponse(UserSerializer(user).data, status=status.HTTP_200_OK)
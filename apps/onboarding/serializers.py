@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from core.timing import TimedSerializerMixin
 from .models import OnboardingProgress
 
-class OnboardingProgressSerializer(serializers.ModelSerializer):
+class OnboardingProgressSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     onboardingComplete = serializers.BooleanField(source="user.onboarding_complete", read_only=True)
 
     class Meta:
@@ -5,13 +5,23 @@ from .models import OnboardingProgress
 from .serializers import OnboardingProgressSerializer
 from apps.authentication.serializers import UserSerializer
 
+def validated_progress(progress, data, partial=False):
+    serializer = OnboardingProgressSerializer(progress, data=data, partial=partial)
+    serializer.is_valid(raise_exception=True)
+    return serializer
+
+def mark_complete(user):
+    """Flags the user as onboarded; returns the update_fields to save it with."""
+    user.onboarding_complete = True
+    # Only the flag: request.user may be a cached snapshot with stale fields
+    return ["onboarding_complete"]
+
 class OnboardingProgressView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def patch(self, request):
         progress, created = OnboardingProgress.objects.get_or_create(user=request.user)
-        serializer = OnboardingProgressSerializer(progress, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
+        serializer = validated_progress(progress, request.data, partial=True)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -20,12 +30,9 @@ class OnboardingCompleteView(APIView):
 
     def post(self, request):
         progress, created = OnboardingProgress.objects.get_or_create(user=request.user)
-        serializer = OnboardingProgressSerializer(progress, data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        validated_progress(progress, request.data).save()
 
         user = request.user
-        user.onboarding_complete = True
-        user.save()
+        user.save(update_fields=mark_complete(user))
 
         return Response(UserSerializer(user).data, status=status.HTTP_200_OK)
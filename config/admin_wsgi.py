@@ -0,0 +1,14 @@
+"""
+WSGI entry point for the admin site. API workers run the lean
+config.settings.api profile, which has no admin, so the admin is served by
+its own process with the full profile (ADMIN_SETTINGS_MODULE, default
+config.settings.prod), e.g. `gunicorn config.admin_wsgi`.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ["DJANGO_SETTINGS_MODULE"] = os.getenv("ADMIN_SETTINGS_MODULE", "config.settings.prod")
+
+application = get_wsgi_application()
@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+# Serve the async-native API views (config.async_urls) unless told otherwise
+os.environ.setdefault("ASYNC_API_VIEWS", "True")
+# Persistent connections are not reused reliably across async requests; use
+# DB_POOL_MAX_SIZE (psycopg pool) under ASGI instead
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
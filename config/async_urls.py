@@ -0,0 +1,18 @@
+"""
+URLconf serving the async-native API views. Selected with ASYNC_API_VIEWS,
+which config/asgi.py turns on by default.
+"""
+from django.apps import apps
+from django.urls import path, include
+
+urlpatterns = [
+    path("api/v1/auth/", include("apps.authentication.async_urls")),
+    path("api/v1/onboarding/", include("apps.onboarding.async_urls")),
+    path("api/v1/chat/", include("apps.chat.async_urls")),
+]
+
+# The API-only profile (config.settings.api) leaves the admin out entirely
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
@@ -0,0 +1,39 @@
+"""
+Settings for API request workers (gunicorn/uvicorn on config.wsgi or
+config.asgi). The API only serves JSON, so this profile drops the admin,
+messages, staticfiles, the template engine and django_extensions, and the
+middleware that only matters for HTML pages. Less is imported per worker,
+and nothing is set up that no request will use.
+
+Everything else runs with config.settings.prod: the admin (its own process,
+config/admin_wsgi.py), migrate, collectstatic and the job workers.
+`manage.py import_report` and `manage.py bench_startup` show the difference.
+"""
+from .prod import *
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in {
+        "django.contrib.admin",
+        "django.contrib.messages",
+        "django.contrib.staticfiles",
+        "django_extensions",
+    }
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in {
+        "django.contrib.messages.middleware.MessageMiddleware",
+        # X-Frame-Options only protects HTML pages
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    }
+]
+
+# No HTML is rendered: Django's error pages fall back to plain text, and
+# DRF renders JSON only (the browsable API needs templates).
+TEMPLATES = []
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
@@ -1,5 +1,7 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -38,21 +40,29 @@ INSTALLED_APPS = [
     # Local apps
     "apps.authentication",
     "apps.onboarding",
+    "apps.chat",
+    "apps.jobs",
     "core",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.ServerTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "config.urls"
+# Async-native API views (config.async_urls) avoid sync_to_async thread hops
+# under an ASGI server; config/asgi.py enables them by default.
+ASYNC_API_VIEWS = os.getenv("ASYNC_API_VIEWS", "False") == "True"
+
+ROOT_URLCONF = "config.async_urls" if ASYNC_API_VIEWS else "config.urls"
 
 TEMPLATES = [
     {
@@ -75,10 +85,88 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# PostgreSQL when DB_NAME is set, SQLite otherwise.
+if os.getenv("DB_NAME"):
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "0"))
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME"),
+            "USER": os.getenv("DB_USER", ""),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            # Keep each worker's connection open across requests instead of
+            # reconnecting (TCP + auth + backend fork) on every one. Django
+            # pings it before reuse, so a connection the server dropped is
+            # replaced instead of failing the request.
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
+            "OPTIONS": {
+                "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+                # Milliseconds; 0 disables. Raise it for long migrations.
+                "options": f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT', '30000'))}",
+            },
+        }
+    }
+    if DB_POOL_MAX_SIZE:
+        # A per-process psycopg pool (psycopg 3, the optional requirement in
+        # requirements.txt). Connections go back to the pool after each request,
+        # and while a send waits on the LLM provider. Django does not combine it
+        # with CONN_MAX_AGE.
+        if not (find_spec("psycopg") and find_spec("psycopg_pool")):
+            raise ImproperlyConfigured(
+                'DB_POOL_MAX_SIZE needs psycopg 3 with its pool: pip install "psycopg[binary,pool]", '
+                "or unset DB_POOL_MAX_SIZE to use psycopg2 with persistent connections."
+            )
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    # Read replicas: one alias per host, same database and credentials. Tests
+    # read the primary through them (MIRROR).
+    for number, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+        DATABASES[f"replica_{number}"] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            # Take the write lock at BEGIN and wait for it, so concurrent writers
+            # queue up instead of failing with "database is locked".
+            "OPTIONS": {
+                "transaction_mode": "IMMEDIATE",
+                "timeout": 20,
+            },
+            # A file-backed test database lets concurrency tests use real
+            # connections per thread (in-memory shared cache fails fast on locks).
+            "TEST": {
+                "NAME": BASE_DIR / "test_db.sqlite3",
+            },
+        }
+    }
+    # SQLite builds covering indexes (chat_conv_sidebar_idx) without their
+    # INCLUDE columns; that is expected here.
+    SILENCED_SYSTEM_CHECKS = ["models.W040"]
+
+# Views marked read_from_replica serve safe requests from these aliases; writes
+# and everything else use "default" (core/routers.py). A session that wrote in
+# the last REPLICA_READ_YOUR_WRITES_SECONDS reads from the primary, so keep this
+# above the usual replication lag.
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica")]
+REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/ref/settings/#caches
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
 }
 
@@ -103,6 +191,101 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "authentication.User"
 
+PASSWORD_HASHERS = [
+    "apps.authentication.hashers.ConfigurableArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Argon2 cost parameters (argon2-cffi defaults: t=2, m=100 MiB, p=8)
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+
+# Password hashing runs on a bounded thread pool so a login storm cannot pin
+# every request worker. Requests beyond MAX_WORKERS + MAX_QUEUE get a 503.
+# MAX_WORKERS=0 hashes inline on the request thread.
+PASSWORD_HASHING_POOL = {
+    "MAX_WORKERS": int(os.getenv("PASSWORD_HASHING_WORKERS", str(os.cpu_count() or 1))),
+    "MAX_QUEUE": int(os.getenv("PASSWORD_HASHING_QUEUE", "16")),
+}
+
+AUTHENTICATION_BACKENDS = [
+    "apps.authentication.backends.CachedModelBackend",
+]
+
+# Where pending signups live: DatabaseAttemptStore (SignupAttempt rows) or
+# CacheAttemptStore (TTL entries in SIGNUP_ATTEMPT_CACHE; needs a shared cache).
+SIGNUP_ATTEMPT_STORE = os.getenv("SIGNUP_ATTEMPT_STORE", "apps.authentication.attempts.DatabaseAttemptStore")
+SIGNUP_ATTEMPT_CACHE = os.getenv("SIGNUP_ATTEMPT_CACHE", "default")
+
+# LLM backend for chat replies (a subclass of apps.chat.providers.BaseProvider).
+# FakeProvider echoes the user's message locally at FAKE_PROVIDER_TOKENS_PER_SECOND.
+CHAT_PROVIDER = os.getenv("CHAT_PROVIDER", "apps.chat.providers.FakeProvider")
+FAKE_PROVIDER_TOKENS_PER_SECOND = float(os.getenv("FAKE_PROVIDER_TOKENS_PER_SECOND", "20"))
+
+# Token budget for the conversation history sent to the provider on each turn.
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "4000"))
+
+# PostgreSQL text search configuration for chat search ("simple" does no
+# stemming, so it works across languages). SQLite uses FTS5's unicode61 tokenizer.
+CHAT_SEARCH_CONFIG = os.getenv("CHAT_SEARCH_CONFIG", "simple")
+
+# Deleted conversations are hidden at once and their messages purged by a
+# background job, BATCH_SIZE rows per transaction. A job stops after
+# MAX_BATCHES and queues its continuation, so it never holds a worker for long.
+CHAT_PURGE = {
+    "BATCH_SIZE": int(os.getenv("CHAT_PURGE_BATCH_SIZE", "1000")),
+    "MAX_BATCHES": int(os.getenv("CHAT_PURGE_MAX_BATCHES", "50")),
+}
+
+# DB-backed job queue (apps.jobs), run by `manage.py run_jobs`. Claimed jobs stay
+# hidden for LEASE seconds; a failed job is retried after RETRY_BACKOFF * 2**(n-1)
+# seconds (capped at MAX_BACKOFF) until MAX_ATTEMPTS, then kept as "failed".
+JOB_QUEUE = {
+    "WORKERS": int(os.getenv("JOB_WORKERS", "2")),
+    "POLL_INTERVAL": float(os.getenv("JOB_POLL_INTERVAL", "1.0")),
+    "LEASE": int(os.getenv("JOB_LEASE_SECONDS", "300")),
+    "MAX_ATTEMPTS": int(os.getenv("JOB_MAX_ATTEMPTS", "5")),
+    "RETRY_BACKOFF": float(os.getenv("JOB_RETRY_BACKOFF", "10")),
+    "MAX_BACKOFF": float(os.getenv("JOB_MAX_BACKOFF", "3600")),
+}
+
+# Outgoing mail. Requests never talk to SMTP: verification codes go through the
+# apps.authentication outbox and are sent by `manage.py send_verification_emails`.
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False") == "True"
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "10"))
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "Navid AI <no-reply@localhost>")
+
+# Verification email outbox. A code can be queued for an address once per
+# COOLDOWN seconds. The sender claims BATCH_SIZE rows at a time for LEASE
+# seconds and retries failures after RETRY_BACKOFF * 2**(n-1) seconds (capped
+# at MAX_BACKOFF) until MAX_ATTEMPTS.
+VERIFICATION_EMAIL = {
+    "COOLDOWN": int(os.getenv("VERIFICATION_EMAIL_COOLDOWN", "60")),
+    "BATCH_SIZE": int(os.getenv("VERIFICATION_EMAIL_BATCH_SIZE", "100")),
+    "POLL_INTERVAL": float(os.getenv("VERIFICATION_EMAIL_POLL_INTERVAL", "1.0")),
+    "LEASE": int(os.getenv("VERIFICATION_EMAIL_LEASE_SECONDS", "60")),
+    "MAX_ATTEMPTS": int(os.getenv("VERIFICATION_EMAIL_MAX_ATTEMPTS", "5")),
+    "RETRY_BACKOFF": float(os.getenv("VERIFICATION_EMAIL_RETRY_BACKOFF", "5")),
+    "MAX_BACKOFF": float(os.getenv("VERIFICATION_EMAIL_MAX_BACKOFF", "120")),
+}
+
+# Seconds a User snapshot stays in the cache for session authentication.
+# Snapshots are invalidated whenever the user is saved or deleted, which only
+# reaches every worker through a shared cache, so they are off (0) unless
+# CACHE_BACKEND is one. core.checks rejects snapshots on LocMemCache in prod.
+USER_CACHE_TIMEOUT = int(os.getenv(
+    "USER_CACHE_TIMEOUT",
+    "0" if CACHES["default"]["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache" else "300",
+))
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -135,16 +318,54 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_THROTTLE_CLASSES": [],
     "DEFAULT_THROTTLE_RATES": {
-        "auth": "10/minute",  # Strict limit for authentication attempts
+        "auth": os.getenv("AUTH_THROTTLE_RATE", "10/minute"),  # Strict limit for authentication attempts
     },
     "EXCEPTION_HANDLER": "core.exceptions.custom_exception_handler",
 }
 
+# Per-request instrumentation: Server-Timing header and a "core.timing" log
+# line with query count, DB, hash, serializer and view time.
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "False") == "True"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core": {
+            "handlers": ["console"],
+            "level": os.getenv("CORE_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+        "apps.jobs": {
+            "handlers": ["console"],
+            "level": os.getenv("JOBS_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# Cache alias holding rate-limit counters. Must be shared by all workers
+# (e.g. Redis) for limits to hold across processes; core.checks rejects a
+# LocMemCache alias in prod.
+THROTTLE_CACHE = os.getenv("THROTTLE_CACHE", "default")
+
 # CORS Settings
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(",")
 
 # Session/Cookie Settings
+# SESSION_BACKEND selects where sessions live: "db" (default), "cached_db" (cache
+# first, database as the source of truth) or "cache". The cached engines need a
+# shared cache such as Redis, or a logout only reaches the worker that served it.
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "db")
+SESSION_ENGINE = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+}[SESSION_BACKEND]
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = "Lax"
 SESSION_COOKIE_SECURE = not DEBUG
@@ -3,3 +3,21 @@ from .base import *
 DEBUG = True
 ALLOWED_HOSTS = ["*"]
 CORS_ALLOW_ALL_ORIGINS = True
+
+# base.py derives these from DEBUG before it is overridden above
+SESSION_COOKIE_SECURE = False
+CSRF_COOKIE_SECURE = False
+
+# Print outgoing mail (verification codes) to the sender's console
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+
+# A second SQLite database standing in for a read replica, so the replica
+# router can be tested against two real databases. Nothing copies data into
+# it, so routing to it stays off here (DATABASE_REPLICAS is empty); tests
+# enable it with override_settings(DATABASE_REPLICAS=["replica"]).
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_db_replica.sqlite3"},
+    }
@@ -2,3 +2,7 @@ from .base import *
 
 DEBUG = False
 # Add production specific settings here
+
+# Every worker must see the same cache for sessions, user snapshots and rate
+# limits; core.checks fails the startup checks otherwise.
+REQUIRE_SHARED_CACHE = True
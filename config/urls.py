@@ -1,8 +1,14 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/v1/auth/", include("apps.authentication.urls")),
     path("api/v1/onboarding/", include("apps.onboarding.urls")),
+    path("api/v1/chat/", include("apps.chat.urls")),
 ]
+
+# The API-only profile (config.settings.api) leaves the admin out entirely
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+class CoreConfig(AppConfig):
+    name = "core"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from . import checks, timing  # noqa: F401
+        # Per-connection, so every thread's connections report to the request
+        # that is active in its context (see timing.record_query)
+        connection_created.connect(timing.install_query_recorder, dispatch_uid="core.timing.install_query_recorder")
@@ -0,0 +1,66 @@
+"""Shared helpers for the bench_* management commands."""
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+class Recorder:
+    """Collects latency (seconds) and query-count samples per named operation."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.queries: Dict[str, List[int]] = defaultdict(list)
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def add(self, name: str, seconds: float, queries: Optional[int] = None) -> None:
+        self.latencies[name].append(seconds)
+        if queries is not None:
+            self.queries[name].append(queries)
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    def summary(self) -> Dict[str, dict]:
+        """Per-operation p50/p95/p99 (ms), requests/sec and mean queries per request."""
+        rows = {}
+        for name, samples in self.latencies.items():
+            queries = self.queries.get(name)
+            rows[name] = {
+                "count": len(samples),
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "rps": len(samples) / sum(samples) if sum(samples) else 0.0,
+                "queries": sum(queries) / len(queries) if queries else None,
+            }
+        return rows
+
+    def total_rps(self) -> float:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        total = sum(len(samples) for samples in self.latencies.values())
+        return total / elapsed if elapsed else 0.0
+
+@contextmanager
+def test_database(verbosity: int = 0):
+    """
+    Runs the block against freshly created test databases (the TEST settings
+    of each alias), so benchmarks never touch development or production data.
+    """
+    setup_test_environment(debug=False)
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+        teardown_test_environment()
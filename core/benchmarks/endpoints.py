@@ -0,0 +1,124 @@
+"""Drives the auth and onboarding endpoints through the real URLconf."""
+import json
+import time
+import uuid
+from http.cookiejar import CookieJar
+from typing import Optional
+from urllib import error, request as urlrequest
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from apps.authentication.attempts import get_attempt_store
+from . import Recorder
+
+PASSWORD = "Bench-Password-2026!"
+
+class BenchmarkError(Exception):
+    pass
+
+class InProcessClient:
+    """Calls the WSGI handler directly and counts the SQL queries of each request."""
+
+    def __init__(self, recorder: Recorder):
+        self.recorder = recorder
+        self.client = Client()
+
+    def call(self, name: str, method: str, path: str, data: Optional[dict] = None):
+        kwargs = {"content_type": "application/json"} if data is not None else {}
+        with CaptureQueriesContext(connections["default"]) as queries:
+            start = time.perf_counter()
+            response = getattr(self.client, method.lower())(path, json.dumps(data) if data is not None else None, **kwargs)
+            elapsed = time.perf_counter() - start
+        self.recorder.add(name, elapsed, len(queries))
+        return response.status_code, (response.json() if response.content else None)
+
+class HttpClient:
+    """Calls a running server over HTTP, keeping cookies and sending the CSRF header."""
+
+    def __init__(self, recorder: Recorder, base_url: str):
+        self.recorder = recorder
+        self.base_url = base_url.rstrip("/")
+        self.cookies = CookieJar()
+        self.opener = urlrequest.build_opener(urlrequest.HTTPCookieProcessor(self.cookies))
+
+    def call(self, name: str, method: str, path: str, data: Optional[dict] = None):
+        headers = {"Accept": "application/json"}
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+        csrf_token = next((cookie.value for cookie in self.cookies if cookie.name == "csrftoken"), None)
+        if csrf_token:
+            headers["X-CSRFToken"] = csrf_token
+
+        req = urlrequest.Request(self.base_url + path, data=body, headers=headers, method=method)
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req) as response:
+                status_code, content = response.status, response.read()
+        except error.HTTPError as exc:
+            status_code, content = exc.code, exc.read()
+        self.recorder.add(name, time.perf_counter() - start)
+        return status_code, (json.loads(content) if content else None)
+
+def expect(result, expected_status: int, name: str):
+    status_code, payload = result
+    if status_code != expected_status:
+        raise BenchmarkError(f"{name}: expected HTTP {expected_status}, got {status_code}: {payload}")
+    return payload
+
+def run_user_journey(client, run_id: str, iteration: int) -> None:
+    """signup/start -> verify-code -> complete-profile -> me -> onboarding -> logout -> login -> me -> logout."""
+    email = f"bench-{run_id}-{iteration}@example.com"
+
+    # Also primes the CSRF cookie for HTTP clients
+    expect(client.call("me_anonymous", "GET", "/api/v1/auth/me"), 200, "me_anonymous")
+
+    started = expect(client.call("signup_start", "POST", "/api/v1/auth/signup/start", {
+        "email": email, "password": PASSWORD,
+    }), 201, "signup_start")
+    signup_token = started["signupToken"]
+    code = get_attempt_store().get_by_token(signup_token).verification_code
+
+    expect(client.call("signup_verify", "POST", "/api/v1/auth/signup/verify-code", {
+        "signupToken": signup_token, "code": code,
+    }), 200, "signup_verify")
+    expect(client.call("signup_complete", "POST", "/api/v1/auth/signup/complete-profile", {
+        "signupToken": signup_token, "fullName": "Bench User", "birthDate": "1990-01-01",
+    }), 201, "signup_complete")
+
+    if not expect(client.call("me", "GET", "/api/v1/auth/me"), 200, "me"):
+        raise BenchmarkError("me: session was not established after signup")
+    expect(client.call("onboarding_progress", "PATCH", "/api/v1/onboarding/progress", {
+        "intent": "work", "goals": ["code"],
+    }), 200, "onboarding_progress")
+    expect(client.call("onboarding_complete", "POST", "/api/v1/onboarding/complete", {
+        "intent": "work", "goals": ["code", "data"],
+    }), 200, "onboarding_complete")
+    expect(client.call("logout", "POST", "/api/v1/auth/logout"), 204, "logout")
+
+    expect(client.call("login", "POST", "/api/v1/auth/login", {
+        "email": email, "password": PASSWORD,
+    }), 200, "login")
+    expect(client.call("me", "GET", "/api/v1/auth/me"), 200, "me")
+    expect(client.call("logout", "POST", "/api/v1/auth/logout"), 204, "logout")
+
+def run(recorder: Recorder, iterations: int, base_url: Optional[str] = None) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    for iteration in range(iterations):
+        client = HttpClient(recorder, base_url) if base_url else InProcessClient(recorder)
+        run_user_journey(client, run_id, iteration)
+    recorder.stop()
+
+def check_budget(summary: dict, budget: dict) -> list:
+    """Returns a list of human-readable budget violations."""
+    violations = []
+    for name, limits in budget.get("endpoints", {}).items():
+        row = summary.get(name)
+        if row is None:
+            continue
+        for metric, limit in limits.items():
+            value = row.get(metric)
+            if value is not None and value > limit:
+                violations.append(f"{name}: {metric} {value:.2f} > budget {limit}")
+    return violations
@@ -0,0 +1,88 @@
+"""Fresh-process worker startup probes for bench_startup and import_report."""
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+from django.conf import settings
+
+# Runs in a clean interpreter: load the WSGI application the way a server
+# worker does, serve one request, report timings and resident memory.
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+from config.wsgi import application
+loaded = time.perf_counter()
+environ = {"PATH_INFO": sys.argv[1], "REQUEST_METHOD": "GET"}
+setup_testing_defaults(environ)
+statuses = []
+b"".join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+served = time.perf_counter()
+try:
+    with open("/proc/self/status") as status_file:
+        rss = next(int(line.split()[1]) for line in status_file if line.startswith("VmRSS:"))
+except OSError:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1)
+print(json.dumps({
+    "status": statuses[0], "setup_ms": (loaded - start) * 1000, "first_request_ms": (served - loaded) * 1000,
+    "rss_kib": rss, "modules": len(sys.modules),
+}))
+"""
+
+class ImportTime(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    module: str
+
+def probe(settings_module: str, path: str, importtime: bool = False) -> dict:
+    """
+    Starts a worker in a new interpreter. Adds `wall_ms` (spawn to exit) and,
+    with importtime, the `imports` it made (python -X importtime).
+    """
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings_module,
+        # setup_testing_defaults() sends Host: 127.0.0.1
+        "ALLOWED_HOSTS": "127.0.0.1",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", PROBE, path]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode:
+        raise RuntimeError(f"{settings_module} worker failed:\n{result.stderr[-2000:]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["wall_ms"] = wall_ms
+    if importtime:
+        report["imports"] = parse_importtime(result.stderr)
+    return report
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append(ImportTime(int(self_us), int(cumulative_us), module))
+    return rows
+
+def group_of(module: str) -> str:
+    """Reporting bucket: django.contrib.<app>, apps.<app>, or the top-level package."""
+    parts = module.split(".")
+    if parts[:2] == ["django", "contrib"] and len(parts) > 2:
+        return ".".join(parts[:3])
+    if parts[0] == "apps" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+def by_group(imports: List[ImportTime]) -> Dict[str, int]:
+    """Self import time (us) summed per group."""
+    totals = defaultdict(int)
+    for row in imports:
+        totals[group_of(row.module)] += row.self_us
+    return dict(totals)
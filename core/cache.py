@@ -0,0 +1,47 @@
+import os
+import pickle
+import time
+import zlib
+from contextlib import contextmanager
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+
+class LockingFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache whose add(), incr() and decr() are atomic across threads and
+    processes (an exclusive lock on a file in the cache directory), and whose
+    incr() keeps the key's expiry. A stand-in for a shared cache server such as
+    Redis in local multi-worker setups and tests; not meant for production load.
+    """
+
+    @contextmanager
+    def _exclusive(self):
+        self._createdir()
+        with open(os.path.join(self._dir, ".lock"), "a+b") as lock_file:
+            locks.lock(lock_file, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(lock_file)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._exclusive():
+            return super().add(key, value, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        with self._exclusive():
+            fname = self._key_to_file(key, version)
+            try:
+                with open(fname, "rb") as f:
+                    expiry = pickle.load(f)
+                    if expiry is not None and expiry < time.time():
+                        raise ValueError("Key '%s' not found" % key)
+                    value = pickle.loads(zlib.decompress(f.read()))
+            except FileNotFoundError:
+                raise ValueError("Key '%s' not found" % key)
+
+            new_value = value + delta
+            timeout = None if expiry is None else max(expiry - time.time(), 0.001)
+            self.set(key, new_value, timeout, version)
+            return new_value
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core import checks
+
+# Backends whose entries live in one process, so other workers never see them
+PROCESS_LOCAL_CACHES = {"django.core.cache.backends.locmem.LocMemCache"}
+
+def is_process_local(alias: str) -> bool:
+    return settings.CACHES.get(alias, {}).get("BACKEND") in PROCESS_LOCAL_CACHES
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    State that must agree across workers has to live in a shared cache.
+    Only enforced where REQUIRE_SHARED_CACHE is set (prod); a single
+    development process is fine with LocMemCache.
+    """
+    if not getattr(settings, "REQUIRE_SHARED_CACHE", False):
+        return []
+    errors = []
+    if settings.USER_CACHE_TIMEOUT and is_process_local("default"):
+        errors.append(checks.Error(
+            "User snapshots (USER_CACHE_TIMEOUT) are cached in a per-process LocMemCache, so saving or "
+            "deactivating a user does not invalidate them in other workers.",
+            hint="Point CACHE_BACKEND at a shared cache such as Redis, or set USER_CACHE_TIMEOUT=0.",
+            id="core.E001",
+        ))
+    if settings.SESSION_ENGINE.endswith((".cache", ".cached_db")) and is_process_local(settings.SESSION_CACHE_ALIAS):
+        errors.append(checks.Error(
+            "Sessions are cached in a per-process LocMemCache, so a logout does not reach other workers.",
+            hint="Use SESSION_BACKEND=db, or point CACHE_BACKEND at a shared cache such as Redis.",
+            id="core.E002",
+        ))
+    if is_process_local(settings.THROTTLE_CACHE):
+        errors.append(checks.Error(
+            f"Rate-limit counters (THROTTLE_CACHE={settings.THROTTLE_CACHE!r}) are in a per-process "
+            "LocMemCache, so every worker enforces its own limit.",
+            hint="Point THROTTLE_CACHE at a cache alias shared by all workers, such as Redis.",
+            id="core.E003",
+        ))
+    return errors
@@ -0,0 +1,106 @@
+"""
+CompressedTextField: a TextField that stores long values zlib-compressed.
+
+Stored values that start with MARKER are encoded as
+MARKER + codec + ":" + payload; anything else is plain text. Rows loaded
+from the database keep compressed values as CompressedText until the
+attribute is first read, so code that never touches the text (listing,
+304s, counting) never pays for decompression. values()/values_list() hand
+back the CompressedText itself; str() on it gives the text.
+"""
+import base64
+import zlib
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+MARKER = "\x01"
+
+CODECS = {
+    # zlib, base64-encoded so the result is still valid text. base85 is 8% smaller
+    # but its decoder is pure Python and dominated the read path.
+    "z": (lambda data: base64.b64encode(zlib.compress(data, 6)).decode("ascii"),
+          lambda payload: zlib.decompress(base64.b64decode(payload))),
+}
+DEFAULT_CODEC = "z"
+
+def compress(text: str, codec: str = DEFAULT_CODEC) -> str:
+    encode, _ = CODECS[codec]
+    return f"{MARKER}{codec}:{encode(text.encode('utf-8'))}"
+
+def decompress(stored: str) -> str:
+    codec, _, payload = stored[len(MARKER):].partition(":")
+    _, decode = CODECS[codec]
+    return decode(payload).decode("utf-8")
+
+class CompressedText:
+    """A compressed value as loaded from the database; decompressed on str()."""
+    __slots__ = ("stored",)
+
+    def __init__(self, stored: str):
+        self.stored = stored
+
+    def __str__(self):
+        return decompress(self.stored)
+
+    def __repr__(self):
+        return f"<CompressedText {len(self.stored)} chars>"
+
+class CompressedTextDescriptor(DeferredAttribute):
+    # A data descriptor, so reads go through __get__ even once the value is in __dict__
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, CompressedText):
+            value = instance.__dict__[self.field.attname] = str(value)
+        return value
+
+class CompressedTextField(models.TextField):
+    descriptor_class = CompressedTextDescriptor
+
+    def __init__(self, *args, min_length=1024, **kwargs):
+        # Values shorter than this many UTF-8 bytes are stored as-is
+        self.min_length = min_length
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.min_length != 1024:
+            kwargs["min_length"] = self.min_length
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, str) and value.startswith(MARKER):
+            return CompressedText(value)
+        return value
+
+    def to_python(self, value):
+        if isinstance(value, CompressedText):
+            return str(value)
+        return super().to_python(value)
+
+    def pre_save(self, model_instance, add):
+        # Save a value that was never read without decompressing it
+        value = model_instance.__dict__.get(self.attname)
+        if isinstance(value, CompressedText):
+            return value
+        return super().pre_save(model_instance, add)
+
+    def get_prep_value(self, value):
+        if isinstance(value, CompressedText):
+            return value.stored
+        value = super().get_prep_value(value)
+        if value is None:
+            return value
+        size = len(value.encode("utf-8"))
+        # Text that happens to start with the marker is always encoded, so it reads back intact
+        if size < self.min_length and not value.startswith(MARKER):
+            return value
+        stored = compress(value)
+        if len(stored) >= size and not value.startswith(MARKER):
+            return value
+        return stored
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
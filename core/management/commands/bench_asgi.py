@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from apps.authentication.models import User
+from core.benchmarks import Recorder, test_database
+
+class Command(BaseCommand):
+    help = (
+        "Compares throughput of the sync views under WSGI (one thread per in-flight request) "
+        "with the async views under ASGI (one event loop) at high concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=64, help="In-flight requests.")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per mode.")
+        parser.add_argument("--path", default="/api/v1/auth/me", help="Authenticated GET endpoint to drive.")
+
+    def handle(self, *args, **options):
+        with test_database():
+            user = User.objects.create_user(email="bench-asgi@example.com", password="Bench-Password-2026!", full_name="Bench")
+            login_client = Client()
+            login_client.force_login(user)
+            cookies = login_client.cookies
+
+            self.stdout.write(f"concurrency={options['concurrency']} requests={options['requests']} path={options['path']}")
+            self._report("wsgi (threads)", self._run_wsgi(cookies, options))
+            with override_settings(ROOT_URLCONF="config.async_urls"):
+                self._report("asgi (async views)", asyncio.run(self._run_asgi(cookies, options)))
+
+    def _run_wsgi(self, cookies, options):
+        recorder = Recorder()
+        remaining = iter(range(options["requests"]))
+        lock = threading.Lock()
+
+        def worker():
+            client = Client()
+            client.cookies = cookies
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    start = time.perf_counter()
+                    client.get(options["path"])
+                    recorder.add("request", time.perf_counter() - start)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options["concurrency"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        recorder.stop()
+        return recorder
+
+    async def _run_asgi(self, cookies, options):
+        recorder = Recorder()
+        remaining = iter(range(options["requests"]))
+
+        async def worker():
+            client = AsyncClient()
+            client.cookies = cookies
+            while next(remaining, None) is not None:
+                start = time.perf_counter()
+                await client.get(options["path"])
+                recorder.add("request", time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+        recorder.stop()
+        return recorder
+
+    def _report(self, label, recorder):
+        row = recorder.summary()["request"]
+        self.stdout.write(
+            f"{label:<20} {recorder.total_rps():>8.1f} req/s  "
+            f"p50={row['p50_ms']:.1f}ms p95={row['p95_ms']:.1f}ms p99={row['p99_ms']:.1f}ms"
+        )
@@ -0,0 +1,102 @@
+import importlib.util
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+from apps.authentication.models import User
+from core.benchmarks import Recorder, test_database
+
+PASSWORD = "Bench-Password-2026!"
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-request cost of opening PostgreSQL connections on /api/v1/auth/me and "
+        "login: a new connection per request, persistent connections, and a psycopg pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and mode.")
+        parser.add_argument("--max-age", type=int, default=600, help="CONN_MAX_AGE for the persistent mode.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("bench_connections needs PostgreSQL: set DB_NAME (and DB_HOST, DB_USER, DB_PASSWORD).")
+
+        modes = [
+            ("new per request", {"CONN_MAX_AGE": 0}, None),
+            (f"persistent ({options['max_age']}s)", {"CONN_MAX_AGE": options["max_age"], "CONN_HEALTH_CHECKS": True}, None),
+        ]
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+        if is_psycopg3 and importlib.util.find_spec("psycopg_pool"):
+            modes.append(("psycopg pool", {"CONN_MAX_AGE": 0}, {"min_size": 1, "max_size": 4}))
+        else:
+            self.stdout.write("psycopg pool: skipped (needs psycopg 3 with psycopg_pool)")
+
+        # Fresh test database, no throttling, and settings that put the database on
+        # both paths: sessions in the database, and a cheap hasher so login is not
+        # all Argon2.
+        rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"auth": None}}
+        with test_database(), override_settings(
+            REST_FRAMEWORK=rest_framework,
+            SESSION_ENGINE="django.contrib.sessions.backends.db",
+            PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+        ):
+            User.objects.create_user(email="bench-connections@example.com", password=PASSWORD, full_name="Bench")
+            self.stdout.write(f"{options['requests']} requests per endpoint and mode")
+            self.stdout.write(f"{'mode':<22}{'endpoint':<10}{'p50 ms':>9}{'p95 ms':>9}{'connects/req':>14}")
+            for name, overrides, pool in modes:
+                self._measure(name, overrides, pool, options["requests"])
+
+    def _measure(self, name, overrides, pool, requests):
+        settings_dict = connection.settings_dict
+        saved, saved_options = dict(settings_dict), dict(settings_dict["OPTIONS"])
+        connection.close()
+        settings_dict.update(overrides)
+        settings_dict["OPTIONS"] = {key: value for key, value in saved_options.items() if key != "pool"}
+        if pool:
+            settings_dict["OPTIONS"]["pool"] = pool
+
+        opened = []
+
+        def count(sender, connection, **kwargs):
+            opened.append(connection)
+
+        connection_created.connect(count)
+
+        recorder = Recorder()
+        client = Client()
+        try:
+            for _ in range(requests):
+                self._request(recorder, "login", lambda: client.post(
+                    "/api/v1/auth/login", {"email": "bench-connections@example.com", "password": PASSWORD}, content_type="application/json"
+                ))
+                self._request(recorder, "me", lambda: client.get("/api/v1/auth/me"))
+            # With a pool, every checkout sends connection_created; count real connections instead
+            connects = connection.pool.get_stats().get("connections_num", 0) if pool else len(opened)
+        finally:
+            connection_created.disconnect(count)
+            connection.close()
+            if pool:
+                connection.close_pool()
+            settings_dict.clear()
+            settings_dict.update(saved)
+            settings_dict["OPTIONS"] = saved_options
+
+        summary = recorder.summary()
+        for endpoint in ("me", "login"):
+            row = summary[endpoint]
+            self.stdout.write(f"{name:<22}{endpoint:<10}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{connects / (2 * requests):>14.2f}")
+
+    def _request(self, recorder, name, call):
+        # The test client skips Django's request_started/request_finished connection
+        # handling; do what the WSGI/ASGI handler does around every request.
+        close_old_connections()
+        start = time.perf_counter()
+        response = call()
+        close_old_connections()
+        recorder.add(name, time.perf_counter() - start)
+        if response.status_code != 200:
+            raise CommandError(f"{name} returned {response.status_code}")
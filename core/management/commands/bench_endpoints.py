@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from core.benchmarks import Recorder, test_database
+from core.benchmarks import endpoints
+
+DEFAULT_BUDGET = Path(__file__).resolve().parent.parent.parent / "benchmarks" / "budgets.json"
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the auth and onboarding endpoints (p50/p95/p99, requests/sec, queries/request) "
+        "and fails when the committed budget is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="User journeys to run.")
+        parser.add_argument("--warmup", type=int, default=2, help="Journeys to run before measuring.")
+        parser.add_argument(
+            "--base-url",
+            help="Benchmark a running server (e.g. http://127.0.0.1:8000) instead of calling the app in-process. "
+                 "The server must share this process's database and allow the load through AUTH_THROTTLE_RATE."
+        )
+        parser.add_argument("--budget", default=str(DEFAULT_BUDGET), help="Budget JSON file.")
+        parser.add_argument("--no-budget", action="store_true", help="Report only; do not enforce the budget.")
+        parser.add_argument("--json", dest="json_path", help="Also write the summary to this file.")
+
+    def handle(self, *args, **options):
+        if options["base_url"]:
+            summary, total_rps = self._run(options)
+        else:
+            # Fresh test database; throttling would reject a benchmark run
+            rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"auth": None}}
+            with test_database(), override_settings(REST_FRAMEWORK=rest_framework):
+                summary, total_rps = self._run(options)
+
+        self._report(summary, total_rps)
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(json.dumps({"endpoints": summary, "rps": total_rps}, indent=2))
+
+        if not options["no_budget"]:
+            budget = json.loads(Path(options["budget"]).read_text())
+            violations = endpoints.check_budget(summary, budget)
+            if violations:
+                raise CommandError("Performance budget exceeded:\n  " + "\n  ".join(violations))
+            self.stdout.write(self.style.SUCCESS("All endpoints within budget."))
+
+    def _run(self, options):
+        endpoints.run(Recorder(), options["warmup"], options["base_url"])
+        recorder = Recorder()
+        endpoints.run(recorder, options["iterations"], options["base_url"])
+        return recorder.summary(), recorder.total_rps()
+
+    def _report(self, summary, total_rps):
+        engine = settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1]
+        self.stdout.write(f"database={engine} overall={total_rps:.1f} req/s")
+        self.stdout.write(f"{'endpoint':<22}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}")
+        for name, row in summary.items():
+            queries = "-" if row["queries"] is None else f"{row['queries']:.1f}"
+            self.stdout.write(
+                f"{name:<22}{row['count']:>5}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                f"{row['p99_ms']:>10.1f}{row['rps']:>10.1f}{queries:>9}"
+            )
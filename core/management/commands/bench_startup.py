@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from core.benchmarks import percentile
+from core.benchmarks.startup import probe
+
+class Command(BaseCommand):
+    help = (
+        "Measures worker cold start per settings profile: fresh processes that load the WSGI "
+        "application and serve one request. Reports time-to-first-request and RSS per worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", default="config.settings.prod,config.settings.api", help="Comma-separated settings modules.")
+        parser.add_argument("--path", default="/api/v1/chat/conversations", help="First request (GET) the worker serves.")
+        parser.add_argument("--runs", type=int, default=10, help="Fresh processes per profile.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['runs']} cold starts per profile, first request GET {options['path']}")
+        self.stdout.write(
+            f"{'profile':<24}{'spawn→exit ms':>15}{'setup ms':>10}{'1st req ms':>12}{'RSS MiB':>9}{'modules':>9}"
+        )
+        for profile in options["profiles"].split(","):
+            # Interleaving would be fairer on a noisy machine, but one warm-up run per
+            # profile already takes the filesystem cache out of the first sample
+            probe(profile, options["path"])
+            reports = [probe(profile, options["path"]) for _ in range(options["runs"])]
+
+            def p50(key):
+                return percentile([report[key] for report in reports], 50)
+
+            self.stdout.write(
+                f"{profile:<24}{p50('wall_ms'):>15.0f}{p50('setup_ms'):>10.0f}{p50('first_request_ms'):>12.0f}"
+                f"{p50('rss_kib') / 1024:>9.1f}{p50('modules'):>9.0f}"
+            )
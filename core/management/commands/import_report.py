@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from core.benchmarks.startup import by_group, probe
+
+class Command(BaseCommand):
+    help = (
+        "Reports what a fresh API worker imports before it answers its first request "
+        "(python -X importtime), grouped by app/package, for each settings profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", default="config.settings.prod,config.settings.api", help="Comma-separated settings modules.")
+        parser.add_argument("--path", default="/api/v1/chat/conversations", help="First request (GET) the worker serves.")
+        parser.add_argument("--top", type=int, default=15, help="Groups listed per profile.")
+
+    def handle(self, *args, **options):
+        profiles = options["profiles"].split(",")
+        reports = {profile: probe(profile, options["path"], importtime=True) for profile in profiles}
+        groups = {profile: by_group(report["imports"]) for profile, report in reports.items()}
+
+        for profile in profiles:
+            report, totals = reports[profile], groups[profile]
+            self.stdout.write(
+                f"{profile}: {len(report['imports'])} modules, {sum(totals.values()) / 1000:.0f} ms importing "
+                f"(setup {report['setup_ms']:.0f} ms, first request {report['first_request_ms']:.0f} ms)"
+            )
+            for group, us in sorted(totals.items(), key=lambda item: -item[1])[:options["top"]]:
+                self.stdout.write(f"  {group:<40}{us / 1000:>8.1f} ms")
+
+        if len(profiles) > 1:
+            base, *others = profiles
+            for profile in others:
+                dropped = sorted(set(groups[base]) - set(groups[profile]), key=lambda group: -groups[base][group])
+                self.stdout.write(f"Not imported by {profile} (vs {base}):")
+                for group in dropped:
+                    self.stdout.write(f"  {group:<40}{groups[base][group] / 1000:>8.1f} ms")
@@ -0,0 +1,182 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from . import routers, timing
+
+logger = logging.getLogger("core.timing")
+
+class DualModeMiddleware:
+    """
+    Base for middleware that runs natively in sync and async chains. Under
+    ASGI, __call__ hands back the __acall__ coroutine and each hook named in
+    ASYNC_HOOKS is swapped for its `a`-prefixed coroutine, so Django does not
+    wrap the middleware or its hooks in thread hops.
+    """
+    sync_capable = True
+    async_capable = True
+    ASYNC_HOOKS = ()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            for hook in self.ASYNC_HOOKS:
+                setattr(self, hook, getattr(self, f"a{hook}"))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        raise NotImplementedError
+
+class ServerTimingMiddleware(DualModeMiddleware):
+    """
+    Reports query count, DB time, password-hash time, serializer time and view
+    time per request as a Server-Timing header and a structured log line.
+
+    Enabled by settings.SERVER_TIMING_ENABLED; when off the middleware removes
+    itself from the chain at startup, so requests pay nothing for it.
+    """
+    ASYNC_HOOKS = ("process_view", "process_template_response")
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    def handle(self, request):
+        with self._measure() as (timings, start):
+            response = self.get_response(request)
+        return self._report(request, response, timings, start)
+
+    async def __acall__(self, request):
+        with self._measure() as (timings, start):
+            response = await self.get_response(request)
+        return self._report(request, response, timings, start)
+
+    @contextmanager
+    def _measure(self):
+        # Queries are recorded by timing.record_query on whichever thread runs them
+        timings = timing.RequestTimings()
+        token = timing.activate(timings)
+        try:
+            yield timings, time.perf_counter()
+        finally:
+            timing.deactivate(token)
+
+    def _report(self, request, response, timings, start):
+        total = time.perf_counter() - start
+        view_started = getattr(request, "_timing_view_started", None)
+        if view_started is not None:
+            view_ended = getattr(request, "_timing_view_ended", None) or start + total
+            timings.add("view", view_ended - view_started)
+        timings.add("total", total)
+
+        response["Server-Timing"] = self._header(timings)
+        logger.info(json.dumps({
+            "event": "request_timing",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": timings.queries,
+            **{f"{name}_ms": round(seconds * 1000, 3) for name, seconds in timings.durations.items()},
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timing_view_started = time.perf_counter()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        request._timing_view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses pass through here as soon as the view returns, before rendering
+        request._timing_view_ended = time.perf_counter()
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        request._timing_view_ended = time.perf_counter()
+        return response
+
+    def _header(self, timings):
+        metrics = []
+        for name, seconds in timings.durations.items():
+            metric = f"{name};dur={seconds * 1000:.2f}"
+            if name == "db":
+                metric += f';desc="{timings.queries} queries"'
+            metrics.append(metric)
+        if "db" not in timings.durations:
+            metrics.insert(0, 'db;dur=0.00;desc="0 queries"')
+        return ", ".join(metrics)
+
+class ReplicaRoutingMiddleware(DualModeMiddleware):
+    """
+    Sends the reads of GET/HEAD/OPTIONS requests to views marked
+    `read_from_replica = True` to a replica (settings.DATABASE_REPLICAS).
+    Views opt in with the class attribute; nothing else is needed.
+
+    A request that writes stamps its session, and for
+    REPLICA_READ_YOUR_WRITES_SECONDS afterwards that session reads from the
+    primary, so users always see their own changes despite replication lag.
+    Must come after SessionMiddleware. Removes itself when no replicas are
+    configured.
+    """
+    SESSION_KEY = "_db_wrote_at"
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    ASYNC_HOOKS = ("process_view",)
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    def handle(self, request):
+        state = routers.RoutingState()
+        token = routers.activate(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.deactivate(token)
+        # Only stamp existing sessions; anonymous writes (signup steps) don't create one
+        if state.wrote and request.session.session_key is not None:
+            request.session[self.SESSION_KEY] = time.time()
+        return response
+
+    async def __acall__(self, request):
+        state = routers.RoutingState()
+        token = routers.activate(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.deactivate(token)
+        if state.wrote and request.session.session_key is not None:
+            await request.session.aset(self.SESSION_KEY, time.time())
+        return response
+
+    def _opted_in(self, request, view_func):
+        view_class = getattr(view_func, "view_class", None)
+        return request.method in self.SAFE_METHODS and getattr(view_class, "read_from_replica", False)
+
+    def _route(self, wrote_at):
+        if wrote_at is not None and time.time() - wrote_at < settings.REPLICA_READ_YOUR_WRITES_SECONDS:
+            return
+        routers.current().read_alias = routers.pick_replica()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self._opted_in(request, view_func):
+            self._route(request.session.get(self.SESSION_KEY))
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if self._opted_in(request, view_func):
+            self._route(await request.session.aget(self.SESSION_KEY))
+        return None
@@ -0,0 +1,60 @@
+"""
+Read-replica routing.
+
+Reads go to a replica only inside a request that ReplicaRoutingMiddleware
+routed there: a GET/HEAD/OPTIONS request to a view with
+`read_from_replica = True`, from a session that has not written recently.
+Everything else, and every write, uses the primary ("default").
+"""
+import random
+from contextvars import ContextVar
+from typing import Optional
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Sessions hold the "recently wrote" marker, so they are always read from the primary
+PRIMARY_ONLY_APPS = {"sessions"}
+
+class RoutingState:
+    """Per-request routing: where reads go, and whether the request wrote anything."""
+    __slots__ = ("read_alias", "wrote")
+
+    def __init__(self):
+        self.read_alias: Optional[str] = None
+        self.wrote = False
+
+_current: ContextVar[Optional[RoutingState]] = ContextVar("db_routing", default=None)
+
+def current() -> Optional[RoutingState]:
+    return _current.get()
+
+def activate(state: RoutingState):
+    return _current.set(state)
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+def pick_replica() -> Optional[str]:
+    """A replica alias from settings.DATABASE_REPLICAS, or None when there are none."""
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = current()
+        if state is None or state.read_alias is None or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        # A transaction on the primary must see its own writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias
+
+    def db_for_write(self, model, **hints):
+        state = current()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
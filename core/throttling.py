@@ -0,0 +1,94 @@
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+class SlidingWindowRateThrottle(BaseThrottle):
+    """
+    Scoped rate throttle using a sliding-window counter in a shared cache.
+
+    Each identity (client IP, plus the target email when the request body has
+    one) costs two integer counters per scope, the current and the previous
+    fixed window, instead of a list of timestamps. Hits are atomic cache
+    increments, so the limit holds across every worker that shares the cache.
+    The estimate weights the previous window by how much of it still overlaps
+    the sliding window:
+
+        estimate = previous * (1 - elapsed / duration) + current
+
+    Rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"][view.throttle_scope].
+    Rejected hits are not counted. Exceeding the rate raises Throttled, so the
+    response keeps the RATE_LIMITED shape from core.exceptions.
+    """
+
+    timer = time.time
+    cache_format = "throttle:{scope}:{ident}:{window}"
+
+    def __init__(self):
+        self._wait = None
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE]
+
+    def parse_rate(self, rate):
+        num, period = rate.split("/")
+        duration = {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+        return int(num), duration
+
+    def get_idents(self, request):
+        idents = [f"ip:{self.get_ident(request)}"]
+        try:
+            email = request.data.get("email")
+        except AttributeError:
+            email = None
+        if isinstance(email, str) and email.strip():
+            idents.append(f"email:{email.strip().lower()}")
+        return idents
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        if rate is None:
+            return True
+        num_requests, duration = self.parse_rate(rate)
+
+        now = self.timer()
+        window = int(now // duration)
+        overlap = 1 - (now % duration) / duration
+        keys = [
+            (self.cache_format.format(scope=scope, ident=ident, window=window),
+             self.cache_format.format(scope=scope, ident=ident, window=window - 1))
+            for ident in self.get_idents(request)
+        ]
+
+        previous = self.cache.get_many([previous_key for _, previous_key in keys])
+        counted = []
+        for current_key, previous_key in keys:
+            current = self._incr(current_key, timeout=duration * 2)
+            counted.append(current_key)
+            if previous.get(previous_key, 0) * overlap + current > num_requests:
+                for key in counted:
+                    self._decr(key)
+                self._wait = duration * overlap
+                return False
+        return True
+
+    def _incr(self, key, timeout):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, timeout):
+                return 1
+            return self.cache.incr(key)
+
+    def _decr(self, key):
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            # The window expired in between, so there is no hit left to undo
+            pass
+
+    def wait(self):
+        return self._wait
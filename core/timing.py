@@ -0,0 +1,77 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+class RequestTimings:
+    """Accumulates per-request durations (in seconds) and the SQL query count."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.queries = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] += seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.durations["db"] += time.perf_counter() - start
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current() -> Optional[RequestTimings]:
+    """Timings of the request being served, or None when instrumentation is off."""
+    return _current.get()
+
+def activate(timings: RequestTimings):
+    return _current.set(timings)
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper on every connection; times the query into the current
+    request's timings. The lookup goes through the context variable, which
+    sync_to_async carries into its worker threads, so queries an async view
+    runs on those threads' connections are counted too.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings(execute, sql, params, many, context)
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver: adds record_query to each connection once."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+@contextmanager
+def span(name: str):
+    """Adds the wall time of the block to the current request's timings, if any."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+class TimedSerializerMixin:
+    """Records validation and representation time of DRF serializers as "serializer"."""
+
+    def is_valid(self, *args, **kwargs):
+        with span("serializer"):
+            return super().is_valid(*args, **kwargs)
+
+    @property
+    def data(self):
+        with span("serializer"):
+            return super().data